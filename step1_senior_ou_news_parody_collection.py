@@ -10,13 +10,15 @@ import sys
 import os
 from pathlib import Path
 import logging
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Callable, Dict, Optional, Tuple, Union
 import time
 import json
 import re
-from datetime import datetime, timedelta
-from difflib import SequenceMatcher
-import random
+from datetime import datetime
+import argparse
+import hashlib
+import math
+import threading
 
 # 아나콘다 환경 체크 및 설정
 def check_anaconda_environment():
@@ -58,16 +60,17 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+# 기사/Claude 요청마다 남는 httpx 요청 로그는 경고 이상만 출력
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
 # 필수 패키지 import (아나콘다 환경 최적화)
 try:
     import feedparser
-    from anthropic import Anthropic
     from anthropic import APIError
     from dotenv import load_dotenv
     import gspread
     import pandas as pd
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
     from google.oauth2.service_account import Credentials
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
@@ -86,17 +89,8 @@ try:
         print("   또는")
         print("   python utils/check_newspaper.py")
         NEWSPAPER_AVAILABLE = False
-        
-        # 대체 방법: requests와 BeautifulSoup 사용
-        try:
-            import requests
-            from bs4 import BeautifulSoup
-            import urllib.parse
-            print("✅ 대체 스크래핑 라이브러리 (requests + BeautifulSoup) 사용")
-        except ImportError:
-            print("❌ 대체 라이브러리도 설치되지 않았습니다.")
-            print("   pip install requests beautifulsoup4 명령어로 설치하세요.")
-            sys.exit(1)
+        # 기사 본문은 경량 추출기(utils.html_extract)와 공용 httpx 클라이언트로 처리
+        print("✅ 경량 추출기(lxml) 사용")
     
     print("✅ 모든 필수 패키지가 정상적으로 import되었습니다.")
     
@@ -113,6 +107,30 @@ except ImportError as e:
 # 로컬 모듈 import
 try:
     from utils.common_utils import get_gsheet, get_gspread_client, get_kst_now
+    from utils.article_prefetch import ArticlePrefetcher
+    from utils.article_cache import ArticleCache
+    from utils.rss_state import FeedStateStore
+    from utils.seen_filter import SeenFilter
+    from utils.near_duplicate import NearDuplicateIndex
+    from utils.news_ranking import get_keyword_matcher, score_news_batch, select_top_k
+    from utils.claude_batch import (BatchTimeoutError, DEFAULT_BATCH_TIMEOUT, collect_results, run_message_batch,
+                                    wait_for_batch)
+    from utils.llm_usage import UsageTracker
+    from utils.response_cache import ResponseCache, content_key
+    from utils.run_journal import RunJournal
+    from utils.async_fetch import AsyncArticleFetcher, DEFAULT_PER_HOST_CONNECTIONS, DEFAULT_MAX_BYTES, decode_html
+    from utils.html_extract import ArticleExtractor, get_extractor
+    from utils.http_client import SharedHttpClient, DEFAULT_DNS_TTL
+    from utils.extract_rules import ExtractionRuleRegistry
+    from utils.extractive_summary import summarize_article
+    from utils.prompt_budget import PromptBudget, PromptProfiler, PromptSection, OutputTokenBudget
+    from utils.diversity_plan import DiversityPlanner, PATTERN_GUIDES, classify_title_pattern
+    from utils.json_stream import JsonStreamScanner
+    from utils.parody_schema import PARODY_TOOL, PARODY_TOOL_CHOICE, ParodyValidator, tool_input, tool_parodies
+    from utils.rss_summary import SummaryPolicy, DEFAULT_MIN_CHARS as DEFAULT_SUMMARY_MIN_CHARS, \
+        DEFAULT_MIN_SCORE as DEFAULT_SUMMARY_MIN_SCORE
+    from utils.llm_gateway import (LLMGateway, get_gateway, response_text, estimate_tokens,
+                                   DEFAULT_RPM as DEFAULT_CLAUDE_RPM, DEFAULT_TPM as DEFAULT_CLAUDE_TPM)
     print("✅ 로컬 모듈 import 성공")
 except ImportError as e:
     print(f"❌ 로컬 모듈 import 실패: {e}")
@@ -138,14 +156,116 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 print(f"✅ 환경 설정 완료 - 스크립트 디렉토리: {SCRIPT_DIR}")
 print(f"✅ Claude API 키 확인됨: {CLAUDE_API_KEY[:10]}...")
 
+# Claude API 주소 (로컬 배치 서버 등으로 바꿔 테스트할 때만 설정)
+CLAUDE_BASE_URL = os.getenv('CLAUDE_BASE_URL') or None
+
 # 전역 설정
 WRITE_SHEET_NAME = 'senior_ou_news_parody_v3'
 DISCLAIMER = "면책조항 : 패러디/특정기관,개인과 무관/투자조언아님/재미목적"
 
+# 패러디 생성 모델 설정
+PARODY_MODEL = "claude-sonnet-4-6"
+PARODY_MAX_TOKENS = 2000  # 1500에서 2000으로 증가
+PARODY_TEMPERATURE = 0.9  # 0.8에서 0.9로 증가 - 더 다양한 표현 유도
+# 프롬프트 템플릿 버전 (user 메시지 형식이나 응답 형식을 바꾸면 올려서 응답 캐시를 무효화)
+PARODY_PROMPT_VERSION = 3
+# 프롬프트에 넣는 기사 내용 길이: 본문 앞부분을 자르는 대신 추출 요약으로 이 길이 안의 핵심 문장만 사용
+PARODY_TEXT_CHARS = 600
+
+# 패러디 생성 동시 요청 수 기본값 (rawdata.txt의 '패러디_동시요청수'로 변경 가능)
+DEFAULT_GENERATION_CONCURRENCY = 4
+# 기사 프리페치 작업 스레드 수 / 큐 크기 기본값
+DEFAULT_PREFETCH_WORKERS = 6
+DEFAULT_PREFETCH_QUEUE_SIZE = 12
+# 한 요청에 묶어 보낼 기사 수 기본값 (rawdata.txt의 '패러디_묶음크기'로 변경 가능, 1이면 기사별 요청)
+DEFAULT_PARODY_GROUP_SIZE = 1
+# 묶음 요청에서 기사 1건당 추가로 허용할 출력 토큰 / 기사 본문 길이
+PARODY_GROUP_TOKENS_PER_ARTICLE = 600
+PARODY_GROUP_TEXT_LIMIT = 500
+# 요청 하나의 입력 토큰 예산 기본값 (rawdata.txt의 '패러디_입력토큰_상한'으로 변경, 0이면 줄이지 않음)
+# 예산을 넘으면 기사 본문을 더 짧게 다시 요약
+DEFAULT_PARODY_INPUT_TOKEN_BUDGET = 2400
+# 묶음 요청에서 기사 1건당 늘려 주는 입력 토큰 예산
+PARODY_GROUP_INPUT_TOKENS_PER_ARTICLE = 450
+# 예산을 맞출 때도 남기는 기사 본문 길이
+PROMPT_MIN_ARTICLE_CHARS = 200
+# 패러디 JSON 객체의 필수 필드 (스트리밍 응답은 이 필드가 모두 채워진 객체가 완성되면 중단)
+# 필드별 글자 수 제한과 검증은 utils.parody_schema.ParodyValidator가 담당
+PARODY_FIELDS = ('ou_title', 'latte', 'ou_think')
+# 배치(Message Batches) 생성 모드: 필요한 개수 대비 제출할 후보 비율과 최대 제출 횟수
+BATCH_OVERSAMPLE = 1.2
+BATCH_MAX_ROUNDS = 3
+# 실행 제한 시간(step4가 넘겨주는 STEP_TIMEOUT_SECONDS) 중 배치 대기 뒤 결과 저장에 남겨 둘 시간(초)
+BATCH_SAVE_RESERVE = 60
+# 생성된 제목이 배정한 어미 패턴과 다를 때 그 기사만 다시 요청하는 횟수
+# (어미 패턴 판별과 패턴별 할당량은 utils.diversity_plan이 담당)
+PATTERN_RETRIES = 1
+
+# 기사 본문 디스크 캐시 (실행 간 유지)
+ARTICLE_CACHE_PATH = SCRIPT_DIR / 'cache' / 'article_cache.sqlite3'
+ARTICLE_CACHE_TTL = 3 * 24 * 3600          # 정상 기사: 3일
+ARTICLE_CACHE_NEGATIVE_TTL = 6 * 3600      # 본문 없음/실패: 6시간
+ARTICLE_CACHE_MAX_ENTRIES = 2000
+
+# 기사 다운로드 엔진 기본값 (rawdata.txt의 '기사_호스트별_동시연결수' 등으로 변경 가능)
+ARTICLE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+DEFAULT_HOST_INTERVAL_MS = 20          # 같은 호스트에 요청을 시작하는 최소 간격
+DEFAULT_ARTICLE_TIMEOUT_BUDGET = 15    # 기사 하나에 쓸 수 있는 전체 시간(초, 재시도 포함)
+DEFAULT_ARTICLE_MAX_KB = DEFAULT_MAX_BYTES // 1024  # 스트리밍 다운로드에서 기사 하나에 읽을 최대 크기
+
+# 도메인별 기사 추출 규칙(선택자 메모)
+EXTRACT_RULES_PATH = SCRIPT_DIR / 'cache' / 'extract_rules.json'
+
+# 이미 패러디한 기사 필터 보관 기간 기본값 (rawdata.txt의 '중복방지_보관일수'로 변경 가능)
+DEFAULT_SEEN_RETENTION_DAYS = 7
+
+# Claude 패러디 응답 캐시 (같은 기사를 같은 프롬프트/모델로 다시 요청하지 않도록)
+RESPONSE_CACHE_PATH = SCRIPT_DIR / 'cache' / 'response_cache.sqlite3'
+RESPONSE_CACHE_TTL = 7 * 24 * 3600
+RESPONSE_CACHE_MAX_ENTRIES = 3000
+
+# RSS 조건부 요청 상태 및 피드 스냅샷
+RSS_STATE_PATH = SCRIPT_DIR / 'cache' / 'rss_state.json'
+
 # 캐시를 위한 전역 변수
-_article_cache = {}
+_article_cache = ArticleCache(ARTICLE_CACHE_PATH, ttl_seconds=ARTICLE_CACHE_TTL,
+                              negative_ttl_seconds=ARTICLE_CACHE_NEGATIVE_TTL,
+                              max_entries=ARTICLE_CACHE_MAX_ENTRIES)
 _cache_hits = 0
 _cache_misses = 0
+_cache_lock = threading.Lock()
+
+_http_client: Optional[SharedHttpClient] = None
+_http_client_lock = threading.Lock()
+
+_article_fetch_engine: Optional[AsyncArticleFetcher] = None
+_article_fetch_lock = threading.Lock()
+
+_html_extractor: Optional[ArticleExtractor] = None
+_use_newspaper = False
+_html_extractor_lock = threading.Lock()
+_extract_rules = ExtractionRuleRegistry(EXTRACT_RULES_PATH)
+
+# RSS 요약이 충분하면 스크래핑 대신 사용 (main에서 설정에 따라 생성, None이면 항상 스크래핑)
+_summary_policy: Optional[SummaryPolicy] = None
+
+_response_cache = ResponseCache(RESPONSE_CACHE_PATH, ttl_seconds=RESPONSE_CACHE_TTL,
+                                max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+_refresh_responses = False  # --refresh: 응답 캐시를 읽지 않고 새로 생성 (결과는 다시 저장)
+
+# Claude 호출별 토큰 사용량 / 프롬프트 캐시 적중 기록
+_usage_tracker = UsageTracker('Claude 패러디')
+# 패러디 프롬프트 구역별 입력 토큰 추정/예산 (예산은 main에서 설정값으로 교체)
+_prompt_budget = PromptBudget(DEFAULT_PARODY_INPUT_TOKEN_BUDGET)
+_prompt_profiler = PromptProfiler('Claude 패러디')
+# 관측한 출력 길이로 max_tokens를 줄여 잡음 (PARODY_MAX_TOKENS 등은 상한)
+_output_budget = OutputTokenBudget()
+_stream_responses = True  # 실시간 생성을 스트리밍으로 받고 JSON이 완성되면 중단 (rawdata.txt '패러디_스트리밍')
+# 패러디를 record_parodies 도구 인자로 받음 (rawdata.txt '패러디_도구출력', 끄면 응답 텍스트의 JSON을 파싱)
+_tool_output = True
+# 호출한 쪽(step4)이 정한 실행 마감 시각 (time.monotonic 기준, None이면 제한 없음)
+_run_deadline: Optional[float] = None
+_parody_validator = ParodyValidator()
 
 def parse_rawdata(file_path='asset/rawdata.txt') -> Dict[str, Any]:
     """rawdata.txt 파일을 파싱하여 설정값을 딕셔너리로 반환합니다."""
@@ -180,136 +300,226 @@ def parse_rawdata(file_path='asset/rawdata.txt') -> Dict[str, Any]:
     logger.info(f"설정 파일 로드 완료: RSS URL {len(config['rss_urls'])}개")
     return config
 
+def get_config_int(config: Dict[str, Any], key: str, default: int) -> int:
+    """설정값을 정수로 읽습니다. 값이 없거나 잘못되면 기본값을 사용합니다."""
+    value = config.get(key)
+    if value is None:
+        return default
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        logger.warning(f"설정값 '{key}'이(가) 정수가 아닙니다: {value} (기본값 {default} 사용)")
+        return default
+
+def get_config_float(config: Dict[str, Any], key: str, default: float) -> float:
+    """설정값을 실수로 읽습니다. 값이 없거나 잘못되면 기본값을 사용합니다."""
+    value = config.get(key)
+    if value is None:
+        return default
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        logger.warning(f"설정값 '{key}'이(가) 숫자가 아닙니다: {value} (기본값 {default} 사용)")
+        return default
+
 def get_article_content(url: str) -> Optional[Dict[str, Any]]:
-    """주어진 URL의 뉴스 본문을 스크래핑합니다. (캐시 기능 포함)"""
-    global _article_cache, _cache_hits, _cache_misses
+    """주어진 URL의 뉴스 본문을 스크래핑합니다. (실행 간 유지되는 디스크 캐시 사용)"""
+    global _cache_hits, _cache_misses
     
-    # 캐시 확인
-    if url in _article_cache:
-        _cache_hits += 1
+    # 캐시 확인 (본문이 짧거나 실패했던 URL은 None으로 캐시됨)
+    cached = _article_cache.get(url)
+    if cached is not ArticleCache.MISS:
+        with _cache_lock:
+            _cache_hits += 1
         logger.debug(f"캐시 히트: {url}")
-        return _article_cache[url]
+        return cached
     
-    _cache_misses += 1
+    with _cache_lock:
+        _cache_misses += 1
     
+    result = scrape_article(url)
+    _article_cache.put(url, result)
+    return result
+
+def scrape_article(url: str) -> Optional[Dict[str, Any]]:
+    """주어진 URL의 뉴스 본문을 실제로 스크래핑합니다. (비동기 다운로드 엔진 + 파싱 스레드 풀)"""
+    try:
+        return init_article_fetcher().fetch(url)
+    except Exception as e:
+        logger.warning(f"기사 다운로드 실패: {url}, 오류: {e}")
+        return None
+
+def parse_article_html(url: str, html: str) -> Optional[Dict[str, Any]]:
+    """내려받은 기사 HTML에서 제목과 본문을 추출합니다. (파싱용 스레드 풀에서 실행)"""
     try:
-        if NEWSPAPER_AVAILABLE:
-            # newspaper3k 사용
-            user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+        init_html_extractor()
+        if _use_newspaper:
+            # newspaper3k 사용 (다운로드는 이미 끝났으므로 HTML만 넘김)
             config = Config()
-            config.browser_user_agent = user_agent
-            config.request_timeout = 10
-            
+            config.browser_user_agent = ARTICLE_USER_AGENT
+            config.fetch_images = False
+
             article = Article(url, config=config)
-            article.download()
+            article.download(input_html=html)
             article.parse()
-            
+
             if not article.text or len(article.text.strip()) < 100:
                 logger.warning(f"기사 본문이 너무 짧거나 비어있음: {url}")
                 return None
-                
-            result = {
-                'url': url, 
-                'title': article.title, 
-                'text': article.text, 
+
+            return {
+                'url': url,
+                'title': article.title,
+                'text': article.text,
                 'publish_date': article.publish_date
             }
-            
-            # 캐시에 저장 (메모리 제한: 최대 100개)
-            if len(_article_cache) >= 100:
-                # 가장 오래된 항목 제거
-                oldest_key = next(iter(_article_cache))
-                del _article_cache[oldest_key]
-            
-            _article_cache[url] = result
-            return result
         else:
-            # 대체 방법: requests + BeautifulSoup 사용
-            return get_article_content_alternative(url)
-            
+            # 대체 방법: 경량 HTML 추출기 사용
+            return extract_article_alternative(url, html)
+
     except Exception as e:
-        logger.warning(f"기사 다운로드 실패: {url}, 오류: {e}")
+        logger.warning(f"기사 파싱 실패: {url}, 오류: {e}")
         return None
 
 def get_article_content_alternative(url: str) -> Optional[Dict[str, Any]]:
-    """requests와 BeautifulSoup을 사용한 대체 스크래핑 방법"""
+    """공용 HTTP 클라이언트와 경량 추출기를 사용한 대체 스크래핑 방법"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = init_http_client().get(url)
         response.raise_for_status()
-        response.encoding = response.apparent_encoding
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 제목 추출
-        title = ""
-        title_selectors = ['h1', '.title', '.headline', 'title', '[class*="title"]', '[class*="headline"]']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text().strip()
-                break
-        
-        if not title:
-            title_elem = soup.find('title')
-            title = title_elem.get_text().strip() if title_elem else "제목 없음"
-        
-        # 본문 추출
-        text = ""
-        content_selectors = [
-            '[class*="content"]', '[class*="article"]', '[class*="body"]',
-            '.article-body', '.content-body', '.post-content',
-            'article', 'main', '.main-content'
-        ]
-        
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # 불필요한 요소 제거
-                for elem in content_elem(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                    elem.decompose()
-                text = content_elem.get_text().strip()
-                break
-        
-        if not text:
-            # 기본적인 텍스트 추출
-            paragraphs = soup.find_all('p')
-            text = ' '.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 50])
-        
+        # 본문 전체에 대한 문자셋 감지 대신 헤더/<meta>에 선언된 문자셋 사용
+        return extract_article_alternative(url, decode_html(response.content, response.charset_encoding))
+
+    except Exception as e:
+        logger.warning(f"대체 스크래핑 실패: {url}, 오류: {e}")
+        return None
+
+def extract_article_alternative(url: str, html: str) -> Optional[Dict[str, Any]]:
+    """경량 추출기(기본 lxml, 실패 시 BeautifulSoup)로 기사 HTML에서 제목과 본문을 추출합니다.
+
+    도메인별로 학습한 선택자를 먼저 시도하고, 유효한 본문을 찾은 선택자를 다시 기록합니다.
+    """
+    try:
+        rules = _extract_rules.rules_for(url)
+        extracted = init_html_extractor().extract(html, rules)
+        text = extracted['text']
+        _extract_rules.record(url, rules, extracted, valid=len(text.strip()) >= 100)
+
         if len(text.strip()) < 100:
             logger.warning(f"기사 본문이 너무 짧거나 비어있음: {url}")
             return None
             
         return {
             'url': url,
-            'title': title,
+            'title': extracted['title'],
             'text': text,
-            'publish_date': None  # 날짜 추출은 복잡하므로 None으로 설정
+            'publish_date': extracted['publish_date']  # <meta> 발행 시각, 없으면 None
         }
         
     except Exception as e:
-        logger.warning(f"대체 스크래핑 실패: {url}, 오류: {e}")
+        logger.warning(f"대체 파싱 실패: {url}, 오류: {e}")
         return None
 
-def fetch_news_from_rss(rss_urls: List[str]) -> List[Dict[str, Any]]:
-    """여러 RSS 피드에서 최신 뉴스 목록을 가져옵니다."""
+def init_html_extractor(config: Optional[Dict[str, Any]] = None) -> ArticleExtractor:
+    """대체 추출 경로에 쓰는 HTML 추출기를 반환합니다.
+
+    rawdata.txt의 '기사_본문추출기'가 lxml(기본값)/soup이면 해당 추출기를 쓰고, 도메인별로 학습한
+    선택자(_extract_rules)를 먼저 시도합니다. newspaper이면 newspaper3k가 설치되어 있을 때
+    newspaper3k로 파싱하며(선택자 학습 없음), 없으면 lxml 추출기를 씁니다.
+    """
+    global _html_extractor, _use_newspaper
+    with _html_extractor_lock:
+        if _html_extractor is None:
+            name = str((config or {}).get('기사_본문추출기', 'lxml')).strip().lower()
+            _use_newspaper = NEWSPAPER_AVAILABLE and name == 'newspaper'
+            _html_extractor = get_extractor(None if name == 'newspaper' else name)
+        return _html_extractor
+
+def init_http_client(config: Optional[Dict[str, Any]] = None) -> SharedHttpClient:
+    """RSS/기사 다운로드가 함께 쓰는 공용 HTTP 클라이언트를 반환합니다.
+
+    처음 호출할 때 rawdata.txt의 HTTP2_사용, DNS_캐시시간(초, 0이면 끔)으로 만들어지고
+    이후에는 같은 연결 풀을 재사용합니다.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            config = config or {}
+            _http_client = SharedHttpClient(
+                user_agent=ARTICLE_USER_AGENT,
+                http2=str(config.get('HTTP2_사용', 'true')).strip().lower() in ('1', 'true', 'yes', '예'),
+                dns_ttl=get_config_int(config, 'DNS_캐시시간', DEFAULT_DNS_TTL),
+            )
+        return _http_client
+
+def init_article_fetcher(config: Optional[Dict[str, Any]] = None) -> AsyncArticleFetcher:
+    """기사 본문 다운로드에 쓰는 공용 비동기 엔진을 반환합니다.
+
+    처음 호출할 때 rawdata.txt의 호스트별 제한(기사_호스트별_동시연결수, 기사_호스트_요청간격_ms,
+    기사_다운로드_제한시간)과 스트리밍 설정(기사_스트리밍, 기사_최대크기_kb)으로 만들어지고
+    이후에는 같은 엔진(연결 풀)을 재사용합니다. 스트리밍 모드에서는 도메인 규칙의 본문 선택자
+    요소가 닫히면 나머지 HTML을 받지 않습니다.
+    """
+    global _article_fetch_engine
+    with _article_fetch_lock:
+        if _article_fetch_engine is None:
+            config = config or {}
+            _article_fetch_engine = AsyncArticleFetcher(
+                parse_article_html,
+                per_host_connections=get_config_int(config, '기사_호스트별_동시연결수', DEFAULT_PER_HOST_CONNECTIONS),
+                min_interval=get_config_int(config, '기사_호스트_요청간격_ms', DEFAULT_HOST_INTERVAL_MS) / 1000,
+                timeout_budget=get_config_int(config, '기사_다운로드_제한시간', DEFAULT_ARTICLE_TIMEOUT_BUDGET),
+                user_agent=ARTICLE_USER_AGENT,
+                stream=str(config.get('기사_스트리밍', 'true')).strip().lower() in ('1', 'true', 'yes', '예'),
+                max_bytes=get_config_int(config, '기사_최대크기_kb', DEFAULT_ARTICLE_MAX_KB) * 1024,
+                end_selector=_extract_rules.body_selector,
+                client_factory=init_http_client(config).async_client,
+            )
+        return _article_fetch_engine
+
+def fetch_news_from_rss(rss_urls: List[str], feed_store: Optional[FeedStateStore] = None,
+                        seen_filter: Optional[SeenFilter] = None) -> List[Dict[str, Any]]:
+    """여러 RSS 피드에서 최신 뉴스 목록을 가져옵니다.
+
+    feed_store가 주어지면 저장된 ETag/Last-Modified로 조건부 요청을 보내고,
+    변경이 없는 피드(304)는 로컬 스냅샷으로, 변경된 피드는 새 항목만 병합해 사용합니다.
+    seen_filter가 주어지면 이전 날짜에 이미 패러디한 기사는 여기서 제외합니다.
+    """
     all_entries = []
     
     def fetch_single_rss(url: str) -> List[Dict[str, Any]]:
         """단일 RSS 피드를 가져오는 함수"""
         try:
             logger.info(f"RSS 피드 확인 중: {url}")
-            feed = feedparser.parse(url)
+            validators = feed_store.validators(url) if feed_store else {}
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('modified'):
+                headers['If-Modified-Since'] = validators['modified']
+            # 피드도 공용 클라이언트로 받아 기사 다운로드와 연결을 공유 (feedparser는 파싱만)
+            response = init_http_client().get(url, headers=headers)
+            status = response.status_code
+            
+            if status >= 400:
+                logger.warning(f"RSS 피드 오류 (HTTP {status}): {url}")
+                return feed_store.snapshot(url) if feed_store else []
             
-            if hasattr(feed, 'status') and isinstance(feed.status, int) and feed.status >= 400:
-                logger.warning(f"RSS 피드 오류 (HTTP {feed.status}): {url}")
-                return []
+            if feed_store and status == 304:
+                feed_entries = feed_store.snapshot(url)
+                logger.info(f"RSS 피드 변경 없음 (HTTP 304), 스냅샷 {len(feed_entries)}개 사용: {url}")
+            else:
+                feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+                if feed_store:
+                    feed_entries, new_count = feed_store.merge_snapshot(
+                        url, feed.entries, etag=response.headers.get('ETag'),
+                        modified=response.headers.get('Last-Modified')
+                    )
+                    logger.info(f"RSS 피드 {url}: 새 뉴스 {new_count}개 병합 (전체 {len(feed_entries)}개)")
+                else:
+                    feed_entries = feed.entries
                 
             entries = []
-            for entry in feed.entries:
+            for entry in feed_entries:
                 entry['source_rss'] = url
                 entries.append(entry)
             
@@ -332,116 +542,43 @@ def fetch_news_from_rss(rss_urls: List[str]) -> List[Dict[str, Any]]:
             except Exception as e:
                 logger.error(f"RSS 피드 처리 중 오류: {url}, {e}")
     
+    if feed_store:
+        try:
+            feed_store.save()
+        except OSError as e:
+            logger.warning(f"RSS 상태 저장 실패: {e}")
+    
     # 중복 제거 (link 기준)
     unique_entries = list({entry.link: entry for entry in all_entries}.values())
+    
+    # 이전 날짜에 이미 패러디한 기사 제외 (스크래핑/Claude 호출 전에 거름)
+    if seen_filter:
+        before = len(unique_entries)
+        unique_entries = seen_filter.filter_entries(unique_entries)
+        if before != len(unique_entries):
+            logger.info(f"이미 패러디한 기사 {before - len(unique_entries)}개를 제외했습니다.")
     logger.info(f"총 {len(unique_entries)}개의 고유한 뉴스를 발견했습니다.")
     return unique_entries
 
-def rank_and_select_news(news_list: List[Dict[str, Any]], num_to_select: int = 30) -> List[Dict[str, Any]]:
-    """시니어층(50-70대) 관심도 기반 뉴스 선정"""
-    # 50/60/70대 타겟으로 가중치 재조정
-    SENIOR_CATEGORY_WEIGHTS = {
-        'health': 2.5, 'welfare': 2.3, 'economy': 2.0, 'politics': 1.8,
-        'opinion': 1.6, 'local': 1.5, 'market': 1.4, 'society': 1.3,
-    }
-    
-    # 50/60/70대 핵심 관심사로 키워드 가중치 강화
-    SENIOR_KEYWORD_WEIGHTS = {
-        # 연금/복지 관련 (최고 우선순위)
-        '연금': 15, '국민연금': 14, '기초연금': 13, '노령연금': 12,
-        '의료비': 12, '건강보험': 12, '요양보험': 11, '장기요양': 10,
-        
-        # 건강 관련 (50/60/70대 핵심 관심사)
-        '치매': 12, '건강검진': 10, '고혈압': 9, '당뇨': 9, '암': 9,
-        '관절': 8, '무릎': 8, '허리': 8, '백내장': 7, '골다공증': 7,
-        
-        # 경제/생활 관련
-        '물가': 11, '전기료': 10, '가스요금': 10, '수도요금': 9,
-        '부동산': 8, '집값': 8, '아파트': 7, '전세': 7, '임대료': 7,
-        '금리': 8, '예금': 7, '적금': 6, '펀드': 5, '주식': 6,
-        
-        # 정치/사회 관련
-        '대통령': 9, '정부': 8, '국정감사': 7, '특검': 7, '국회': 6,
-        '세금': 9, '소득세': 8, '재산세': 8, '상속세': 7,
-        
-        # 노인복지 관련
-        '노인복지': 12, '독거노인': 10, '경로당': 8, '실버': 8,
-        '요양원': 9, '요양시설': 8, '재가요양': 7,
-        
-        # 자녀/가족 관련
-        '교육': 6, '대학': 6, '취업': 7, '결혼': 6, '육아': 5,
-        '손자': 6, '손녀': 6, '며느리': 5, '사위': 5,
-        
-        # 기타
-        'AI': 4, '스포츠': 4, '문화': 4, '여행': 5, '종교': 5
-    }
-    
-    # 50/60/70대 특화 보너스 키워드
-    SENIOR_BONUS_KEYWORDS = {
-        '노인': 5, '시니어': 5, '50대': 4, '60대': 5, '70대': 6,
-        '은퇴': 5, '정년': 5, '퇴직': 5, '중년': 4, '노년': 5,
-        '베이비부머': 4, '실버': 4, '고령': 4, '장년': 3,
-        '어르신': 4, '노인장': 3, '할머니': 3, '할아버지': 3
-    }
-    
-    # MZ세대/젊은층 관련 제외 키워드 강화
-    EXCLUDE_KEYWORDS = {
-        'K-POP': -5, '아이돌': -5, '방탄소년단': -4, 'BTS': -4,
-        '게임': -4, '온라인게임': -4, 'e스포츠': -4,
-        '유튜버': -4, '인플루언서': -4, '크리에이터': -3,
-        'SNS': -3, '틱톡': -4, '인스타그램': -3, '페이스북': -2,
-        'MZ세대': -4, 'Z세대': -4, '밀레니얼': -3,
-        '힙합': -3, '래퍼': -3, 'EDM': -3,
-        '웹툰': -2, '만화': -2, '애니메이션': -2
-    }
-
-    # 성능 최적화: 키워드 검색을 위한 집합 생성
-    keyword_weights = {**SENIOR_KEYWORD_WEIGHTS, **SENIOR_BONUS_KEYWORDS, **EXCLUDE_KEYWORDS}
-    
-    for news in news_list:
-        score = 0
-        title = news.get('title', '')
-        source_rss = news.get('source_rss', '')
-
-        # 1. 카테고리 가중치
-        for cat, weight in SENIOR_CATEGORY_WEIGHTS.items():
-            if cat in source_rss:
-                score += weight
-                break
-
-        # 2. 키워드 가중치 (최적화된 검색)
-        for keyword, weight in keyword_weights.items():
-            if keyword in title:
-                score += weight
-
-        # 3. 최신성 가중치
-        published_time = news.get('published_parsed')
-        if published_time:
-            try:
-                published_dt = datetime.fromtimestamp(time.mktime(published_time))
-                if datetime.now() - published_dt < timedelta(days=1):
-                    score += 3  # 최신성 가중치 증가
-
-                # 4. 시간대별 가중치 (50/60/70대 생활패턴 반영)
-                hour = published_dt.hour
-                if 6 <= hour <= 9:  # 아침 뉴스 시간
-                    score += 2
-                elif 12 <= hour <= 14:  # 점심시간
-                    score += 1
-                elif 18 <= hour <= 21:  # 저녁 뉴스 시간
-                    score += 1.5
-            except (ValueError, OSError) as e:
-                logger.debug(f"날짜 파싱 오류: {e}")
+def rank_and_select_news(news_list: List[Dict[str, Any]], num_to_select: int = 30,
+                         korean_boundaries: bool = False) -> List[Dict[str, Any]]:
+    """시니어층(50-70대) 관심도 기반 뉴스 선정
 
+    가중치 표는 utils/news_ranking.py에 있습니다. korean_boundaries=True이면
+    '암' 같은 짧은 키워드가 다른 단어('암호화폐') 안에서 매칭되지 않도록 합니다.
+    """
+    # 카테고리/키워드/최신성/시간대 점수를 한 번에 계산 후 상위 num_to_select개만 선택
+    scores = score_news_batch(news_list, get_keyword_matcher(korean_boundaries))
+    for news, score in zip(news_list, scores.tolist()):
         news['score'] = score
 
-    sorted_news = sorted(news_list, key=lambda x: x.get('score', 0), reverse=True)
+    sorted_news = [news_list[i] for i in select_top_k(scores, num_to_select)]
 
     logger.info("시니어(50/60/70대) 맞춤 뉴스 중요도 평가 및 상위 선정...")
     for i, news in enumerate(sorted_news[:10]):
         logger.info(f"  - {i+1}위 (점수: {news.get('score', 0):.1f}): {news.get('title', '')}")
 
-    return sorted_news[:num_to_select]
+    return sorted_news
 
 def analyze_title_patterns(existing_titles: List[str]) -> Dict[str, int]:
     """기존 제목들의 어미 패턴을 분석하여 다양성 확보"""
@@ -453,54 +590,23 @@ def analyze_title_patterns(existing_titles: List[str]) -> Dict[str, int]:
     }
     
     for title in existing_titles[-10:]:  # 최근 10개만 분석
-        if any(ending in title for ending in ['까?', '나?', '을까?', '는가?', '다니?', '라니?']):
-            patterns['question'] += 1
-        elif any(ending in title for ending in ['네', '구나', '어', '야', '지']):
-            patterns['exclamation'] += 1
-        elif any(ending in title for ending in ['다', '군', '겠어']):
-            patterns['statement'] += 1
-        elif any(ending in title for ending in ['겠네', '것 같아', '듯해', '려나']):
-            patterns['concern'] += 1
+        pattern = classify_title_pattern(title)
+        if pattern:
+            patterns[pattern] += 1
     
     return patterns
 
-def create_senior_parody_with_claude(news_item: Dict[str, Any], existing_titles: List[str]) -> str:
-    """Claude AI를 사용하여 시니어 뉴스 패러디 생성 - 다양성 강화 버전"""
-    client = Anthropic(api_key=CLAUDE_API_KEY)
-
-    news_title = news_item.get('title', '제목 없음')
-    news_summary = news_item.get('text', '')[:3000]  # 5000에서 3000으로 단축
-
-    # 중복 방지 목록 문자열 생성
-    if existing_titles:
-        existing_titles_str = "- " + "\n- ".join(existing_titles[-10:])  # 최근 10개만 표시
-    else:
-        existing_titles_str = "없음"
-
-    # 현재 패턴 분석
-    current_patterns = analyze_title_patterns(existing_titles)
-    
-    # 가장 적게 사용된 패턴 찾기
-    min_count = min(current_patterns.values()) if current_patterns.values() else 0
-    underused_patterns = [k for k, v in current_patterns.items() if v == min_count]
-    
-    # 패턴 가이드 생성
-    if underused_patterns:
-        priority_pattern = random.choice(underused_patterns)
-        pattern_guide = f"우선적으로 '{priority_pattern}' 패턴 사용을 권장합니다."
-    else:
-        pattern_guide = "모든 패턴을 골고루 사용해주세요."
-
-    # 개선된 프롬프트 - 다양한 어미와 감정 표현 강화
-    parody_prompt = f"""
+# 패러디 작성 지침 (모든 요청에 동일 - 프롬프트 캐시 대상)
+# ※ 요청마다 바뀌는 값(배정한 어미 패턴, 기사)을 넣으면 캐시가 깨지므로 build_parody_request에서 따로 보냅니다.
+PARODY_SYSTEM_PROMPT = """
 당신은 50~70대 시니어 세대를 위한 뉴스 패러디 콘텐츠 크리에이터입니다. 독자들의 호응을 받을 수 있는 다양하고 매력적인 패러디를 만드세요.
 
 반드시 아래 JSON 형식으로만 응답하세요:
-{{
+{
   "ou_title": "다양한 어미의 매력적인 제목(30자 이내)",
   "latte": "우리 때는... 형식의 과거 회상 + 현재 상황 비교(100자 이내)",
   "ou_think": "시니어 관점의 현실적 걱정과 공감 + 약간의 위트(80자 이내)"
-}}
+}
 
 [제목 작성 핵심 원칙 - 다양성 극대화]
 
@@ -508,19 +614,19 @@ def create_senior_parody_with_claude(news_item: Dict[str, Any], existing_titles:
 
 1️⃣ **감탄/놀라움형 (exclamation)** - 임팩트 강함
 - "~네", "~구나", "~어", "~야", "~지"
-- 예: "요즘 세상 정말 빨라", "젊은이들 대단하구나", "기술이 이 정도였어?"
+- 예: "요즘 세상 정말 빨라", "젊은이들 대단하구나", "기술이 이 정도였어"
 
 2️⃣ **의문/궁금증형 (question)** - 관심 유발  
 - "~까?", "~나?", "~을까?", "~는가?"
 - 예: "이게 정말 가능할까?", "우리도 할 수 있을까?", "언제까지 계속될까?"
 
 3️⃣ **단정/확신형 (statement)** - 신뢰감 조성
-- "~다", "~네", "~군", "~겠어"  
-- 예: "확실히 달라졌다", "이젠 시대가 변했네", "정말 놀랍군"
+- "~다", "~군", "~죠"  
+- 예: "확실히 달라졌다", "이젠 시대가 변했죠", "정말 놀랍군"
 
 4️⃣ **걱정/우려형 (concern)** - 공감대 형성
-- "~겠네", "~것 같아", "~듯해", "~려나"
-- 예: "걱정이 앞서겠네", "힘들 것 같아", "복잡해 보여"
+- "~겠네", "~겠어", "~것 같아", "~듯해", "~려나"
+- 예: "걱정이 앞서겠네", "힘들 것 같아", "앞으로 더 복잡해지려나"
 
 [감정별 제목 템플릿 예시]
 
@@ -532,12 +638,12 @@ def create_senior_parody_with_claude(news_item: Dict[str, Any], existing_titles:
 
 🏛️ **정치 뉴스**:
 - 감탄: "정치인들 참 바쁘네"
-- 우려: "나라 걱정이 앞서"
+- 우려: "나라 앞날이 걱정이야"
 - 단정: "세상 많이 복잡해졌다"
 - 의문: "언제 조용해질까?"
 
 🏥 **건강 뉴스**:
-- 놀라움: "의학이 이렇게 발전했어?"
+- 놀라움: "의학이 이렇게 발전했어"
 - 확신: "건강이 최고인게 맞다"
 - 걱정: "치료비가 너무 부담스럽겠네"
 - 의문: "보험 적용될까?"
@@ -563,7 +669,7 @@ def create_senior_parody_with_claude(news_item: Dict[str, Any], existing_titles:
 [ou_think (현재 관점) 작성 가이드]
 
 ✅ **감정 표현 다양화**:
-- 걱정: "우리 자식들은 어떻게 살아갈까"
+- 걱정: "우리 자식들은 어떻게 살아가려나"
 - 공감: "정말 힘든 세상이야"
 - 호기심: "우리도 한번 배워볼까?"
 - 위트: "그래도 재미있긴 하네"
@@ -586,94 +692,970 @@ def create_senior_parody_with_claude(news_item: Dict[str, Any], existing_titles:
 4. 시니어 공감 포인트: "우리 자식들은 어떻게 살아가나"
 
 [중복 방지 및 다양성]
-- 같은 패턴 연속 사용 금지
-- 기존 제목과 80% 이상 유사성 금지
-- 최근 생성 제목: {existing_titles_str}
+- 제목 어미 패턴은 전체 분포가 고르도록 기사마다 미리 배정해 [제목 어미 패턴]으로 안내합니다.
+- 배정된 패턴의 어미로 제목을 끝내세요.
 
 [절대 준수사항]
 
 🚫 **금지사항**:
-- 연속 3개 이상 같은 어미 사용 금지
 - "아이고", "어이구", "헉" 등 과도한 감탄사
 - 정치적 편향성
 - 세대갈등 조장 표현
 - 30자 초과
 
 ✅ **필수사항**:
-- 4가지 어미 패턴을 골고루 사용
+- 배정된 어미 패턴 준수
 - 자연스럽고 친근한 톤
 - 클릭 욕구 자극하는 호기심
 - 시니어 공감 포인트 포함
+"""
 
-[다양성 보장을 위한 현재 상황]
-현재 패턴 분포: {current_patterns}
-{pattern_guide}
-최근 생성된 제목들: {existing_titles_str}
+# 단건 요청 user 메시지 틀 (구역 텍스트는 PromptBudget으로 예산에 맞춘 뒤 채움)
+# 요청은 앞선 생성 결과와 무관하게 만들어지므로 모두 동시에 보낼 수 있음
+PARODY_USER_TEMPLATE = """
+[제목 어미 패턴]
+{target}
 
 [뉴스 기사]
-제목: {news_title}
-내용: {news_summary[:800]}
+제목: {article_title}
+내용: {article}
 
-※ 중요: 반드시 기존 제목들과 다른 어미 패턴을 사용하여 다양성을 확보하세요. 같은 패턴의 연속 사용을 피하고, 독자들이 지루해하지 않도록 매번 새로운 느낌을 주세요.
+※ 중요: 제목은 반드시 위 어미 패턴으로 끝내세요. 전체 제목의 어미가 고르게 섞이도록 기사마다 패턴을 미리 배정했습니다.
 """
 
-    messages = [
-        {"role": "user", "content": parody_prompt}
-    ]
+# 묶음 요청 user 메시지 틀
+PARODY_GROUP_USER_TEMPLATE = """
+[이번 요청: 기사 {count}건]
+아래 기사마다 패러디를 하나씩 만들고, 각 객체에 기사 번호 "id"를 추가해 JSON 배열로만 응답하세요:
+[
+  {{"id": 1, "ou_title": "...", "latte": "...", "ou_think": "..."}},
+  ...
+]
+- 기사마다 [제목 어미 패턴]에 적힌 어미로 제목을 끝내세요.
+- 한 응답 안의 제목끼리도 표현이 겹치지 않게 하세요.
+
+{articles}
+"""
 
-    max_retries = 3
-    retry_delay = 5  # seconds
+def pattern_instruction(target: Optional[str], previous_title: Optional[str] = None) -> str:
+    """배정한 어미 패턴 안내 문구 (패턴을 지키지 않아 다시 요청하면 이전 제목도 알려 줌)"""
+    if target is None:
+        return "4가지 어미 패턴 중 기사에 어울리는 것을 골라 쓰세요."
+    text = PATTERN_GUIDES[target]
+    if previous_title:
+        text += f" (이전 제목 \"{previous_title}\"은 이 패턴이 아니어서 다시 요청합니다)"
+    return text
+
+def _article_section(article: Dict[str, Any], chars: int) -> PromptSection:
+    """기사 본문 구역 (예산을 넘으면 더 짧은 길이로 다시 요약)"""
+    title, text = article.get('title', ''), article.get('text', '')
+
+    def shrink(current: str, target_tokens: int) -> str:
+        target_chars = int(len(current) * target_tokens / max(1, estimate_tokens(current)))
+        return summarize_article(text, title, max(PROMPT_MIN_ARTICLE_CHARS, target_chars))
+    return PromptSection('article', summarize_article(text, title, chars), trim_priority=3, shrink=shrink)
+
+def _system_blocks() -> List[Dict[str, Any]]:
+    # 고정 지침은 프롬프트 캐시로 재사용하고, 변하는 부분만 user 메시지로 전송
+    return [{"type": "text", "text": PARODY_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+def _fixed_sections() -> List[PromptSection]:
+    """요청마다 같은 구역 (지침, 도구 정의) - 예산에서 줄이지 않음"""
+    sections = [PromptSection('system', PARODY_SYSTEM_PROMPT)]
+    if _tool_output:
+        sections.append(PromptSection('tool', json.dumps(PARODY_TOOL, ensure_ascii=False)))
+    return sections
+
+def _output_params() -> Dict[str, Any]:
+    """구조화 출력을 쓰면 record_parodies 도구 호출을 강제하는 요청 파라미터"""
+    return {'tools': [PARODY_TOOL], 'tool_choice': PARODY_TOOL_CHOICE} if _tool_output else {}
+
+def build_parody_request(news_item: Dict[str, Any], target: Optional[str] = None,
+                         previous_title: Optional[str] = None) -> Dict[str, Any]:
+    """패러디 생성용 Messages API 요청 파라미터(model, max_tokens, temperature, system, messages)를 만듭니다.
+
+    실시간 호출과 배치(Message Batches) 제출이 같은 요청을 사용합니다.
+    고정된 작성 지침(PARODY_SYSTEM_PROMPT)은 프롬프트 캐시 대상 system 블록으로,
+    배정한 제목 어미 패턴(target, DiversityPlanner.assign)과 기사만 user 메시지로 보냅니다.
+    user 메시지의 구역은 입력 토큰 예산(_prompt_budget)에 맞춰 줄이고 구역별 크기를 기록합니다.
+    구조화 출력(_tool_output)을 쓰면 record_parodies 도구 호출을 강제합니다.
+    """
+    news_title = news_item.get('title', '제목 없음')
+    sections = [
+        *_fixed_sections(),
+        PromptSection('template', PARODY_USER_TEMPLATE.format(target='', article_title='', article='')),
+        PromptSection('target', pattern_instruction(target, previous_title)),
+        PromptSection('article_title', news_title),
+        _article_section(news_item, PARODY_TEXT_CHARS),
+    ]
+    texts = _prompt_budget.fit(sections)
+    parody_prompt = PARODY_USER_TEMPLATE.format(**{k: v for k, v in texts.items()
+                                                   if k not in ('system', 'tool', 'template')})
+
+    request = {
+        'model': PARODY_MODEL,
+        'max_tokens': _output_budget.max_tokens(parody_max_tokens_ceiling(1)),
+        'temperature': PARODY_TEMPERATURE,
+        'system': _system_blocks(),
+        'messages': [
+            {"role": "user", "content": parody_prompt}
+        ],
+        **_output_params(),
+    }
+    _prompt_profiler.record(news_title[:30], sections, request)
+    return request
+
+def build_parody_group_request(articles: List[Dict[str, Any]], targets: Optional[List[Optional[str]]] = None,
+                               previous_titles: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
+    """기사 여러 건을 한 요청에 담는 패러디 요청 파라미터를 만듭니다.
+
+    기사마다 1부터 번호(id)와 배정한 어미 패턴(targets)을 붙이고, 응답은 id가 포함된 JSON 배열로 받습니다.
+    system 블록(PARODY_SYSTEM_PROMPT)은 단건 요청과 같아 프롬프트 캐시를 함께 씁니다.
+    입력 토큰 예산은 기사 1건당 PARODY_GROUP_INPUT_TOKENS_PER_ARTICLE만큼 늘려 적용하고,
+    본문을 줄여야 하면 기사 본문들을 크기에 비례해 함께 줄입니다.
+    """
+    targets = targets or [None] * len(articles)
+    previous_titles = previous_titles or [None] * len(articles)
+    headers = []
+    article_sections = []
+    for idx, (article, target, previous) in enumerate(zip(articles, targets, previous_titles), start=1):
+        headers.append(f"[기사 {idx}]\n[제목 어미 패턴] {pattern_instruction(target, previous)}\n"
+                       f"제목: {article.get('title', '제목 없음')}\n내용: ")
+        article_sections.append(_article_section(article, PARODY_GROUP_TEXT_LIMIT))
+
+    sections = [
+        *_fixed_sections(),
+        PromptSection('template', PARODY_GROUP_USER_TEMPLATE.format(count=len(articles), articles='')),
+        PromptSection('article_title', "\n\n".join(headers)),
+        *article_sections,
+    ]
+    budget = _prompt_budget.max_input_tokens
+    if budget > 0:
+        budget += PARODY_GROUP_INPUT_TOKENS_PER_ARTICLE * (len(articles) - 1)
+    _prompt_budget.fit(sections, budget)
+    articles_str = "\n\n".join(header + section.text for header, section in zip(headers, article_sections))
+
+    parody_prompt = PARODY_GROUP_USER_TEMPLATE.format(count=len(articles), articles=articles_str)
+
+    request = {
+        'model': PARODY_MODEL,
+        'max_tokens': _output_budget.max_tokens(parody_max_tokens_ceiling(len(articles)), len(articles)),
+        'temperature': PARODY_TEMPERATURE,
+        'system': _system_blocks(),
+        'messages': [
+            {"role": "user", "content": parody_prompt}
+        ],
+        **_output_params(),
+    }
+    label = articles[0].get('title', '')[:30] + f" 외 {len(articles) - 1}건"
+    _prompt_profiler.record(label, sections, request)
+    return request
+
+def init_claude_gateway(config: Optional[Dict[str, Any]] = None) -> LLMGateway:
+    """패러디 생성에 쓰는 공용 Claude 게이트웨이를 반환합니다.
+
+    처음 호출할 때 rawdata.txt의 분당 한도(Claude_분당요청수, Claude_분당토큰수)로 만들어지고
+    이후에는 같은 게이트웨이(연결 풀, 속도 제한 상태)를 재사용합니다.
+    """
+    config = config or {}
+    return get_gateway(
+        api_key=CLAUDE_API_KEY,
+        base_url=CLAUDE_BASE_URL,
+        rpm=get_config_int(config, 'Claude_분당요청수', DEFAULT_CLAUDE_RPM),
+        tpm=get_config_int(config, 'Claude_분당토큰수', DEFAULT_CLAUDE_TPM),
+        usage=_usage_tracker,
+    )
+
+def parody_max_tokens_ceiling(items: int = 1) -> int:
+    """기사 items건 요청의 max_tokens 상한 (관측 기반 예산은 이 값을 넘지 않음)"""
+    return PARODY_MAX_TOKENS + PARODY_GROUP_TOKENS_PER_ARTICLE * (items - 1)
+
+def _is_complete_parody(obj: Dict[str, Any]) -> bool:
+    return all(isinstance(obj.get(field), str) and obj[field].strip() for field in PARODY_FIELDS)
+
+def parody_stop_condition(items: int = 1) -> Optional[Callable[[str], bool]]:
+    """스트리밍 응답을 언제 닫을지 정하는 함수 (스트리밍을 쓰지 않으면 None)
+
+    단건은 필수 필드가 모두 채워진 객체 하나가, 묶음은 배열이 닫히거나 기사 수만큼의
+    서로 다른 id 객체가 완성되면 True를 반환합니다.
+    도구 출력은 호출이 끝나면 응답도 끝나므로 스트리밍하지 않습니다.
+    """
+    if not _stream_responses or _tool_output:
+        return None
+    scanner = JsonStreamScanner()
 
-    for attempt in range(max_retries):
+    def stop_when(delta: str) -> bool:
+        if not scanner.feed(delta) and not scanner.closed:
+            return False
+        complete = [obj for obj in scanner.objects if _is_complete_parody(obj)]
+        if not complete:
+            return False  # 배열이 닫혀도 쓸 수 있는 객체가 없으면 끊지 않음
+        if items == 1:
+            return True
+        return scanner.closed or len({obj.get('id') for obj in complete}) >= items
+    return stop_when
+
+# 패러디 응답: 도구 호출 인자(dict) 또는 응답 텍스트(JSON 문자열)
+ParodyPayload = Union[str, Dict[str, Any]]
+
+def parody_payload(message: Any) -> ParodyPayload:
+    """Message에서 record_parodies 도구 인자를 꺼냅니다. 도구 호출이 없으면 응답 텍스트"""
+    arguments = tool_input(message)
+    return arguments if arguments is not None else response_text(message)
+
+def request_parody(request_params: Dict[str, Any], label: str = '', items: int = 1) -> Tuple[ParodyPayload, Any]:
+    """패러디 요청 하나를 보내고 (응답, usage)를 반환합니다. 실패하면 ("", None)을 반환합니다.
+
+    응답은 도구 호출 인자(dict)이거나, 구조화 출력을 쓰지 않으면 응답 텍스트입니다.
+
+    속도 제한과 일시적 오류(429/529/5xx)의 재시도는 게이트웨이가 처리합니다.
+    스트리밍을 쓰면 패러디 JSON이 완성되는 즉시 응답을 닫습니다. (items: 요청에 담긴 기사 수)
+    """
+    text, usage = _send_parody_request(request_params, label, items)
+    _prompt_profiler.record_actual(request_params, usage)
+    return text, usage
+
+def _send_parody_request(request_params: Dict[str, Any], label: str, items: int) -> Tuple[ParodyPayload, Any]:
+    gateway = init_claude_gateway()
+    ceiling = parody_max_tokens_ceiling(items)
+    params = request_params
+
+    max_attempts = 2  # 빈 응답이거나 줄여 잡은 max_tokens에서 잘렸을 때 한 번 더 요청
+    for _ in range(max_attempts):
         try:
-            response = client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=2000,  # 1500에서 2000으로 증가
-                temperature=0.9,  # 0.8에서 0.9로 증가 - 더 다양한 표현 유도
-                messages=messages  # type: ignore
-            )
-
-            response_text = ""
-            if response.content:
-                first_content = response.content[0]
-                if hasattr(first_content, 'text') and hasattr(first_content, 'type') and first_content.type == 'text':
-                    response_text = first_content.text
-                elif isinstance(first_content, dict) and 'text' in first_content:
-                    response_text = first_content['text']
-                else:
-                    response_text = str(first_content)
-
-            if not response_text:
-                logger.warning("Claude 응답이 비어있습니다. 재시도합니다.")
-                continue
-
-            return response_text
-
+            response = gateway.create(label=label, stop_when=parody_stop_condition(items), **params)
         except APIError as e:
             error_message = str(e)
             if 'credit balance is too low' in error_message:
                 logger.error("🚨 Claude API 크레딧 부족! Anthropic Console에서 크레딧을 충전해주세요.")
                 logger.error("🔗 https://console.anthropic.com/")
-                return ""
-            elif 'rate limit' in error_message.lower():
-                logger.warning(f"API 속도 제한에 걸렸습니다. {retry_delay}초 후 재시도... ({attempt + 1}/{max_retries})")
-                time.sleep(retry_delay)
-                retry_delay *= 2
-            elif 'overloaded' in error_message.lower():
-                if attempt < max_retries - 1:
-                    logger.warning(f"Claude AI가 과부하 상태입니다. {retry_delay}초 후 재시도... ({attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    logger.error(f"Claude AI 과부하로 패러디 생성에 실패했습니다: {e}")
-                    return ""
             else:
-                logger.error(f"Claude API 오류: {e}")
-                return ""
+                logger.error(f"Claude API 오류로 패러디 생성에 실패했습니다: {e}")
+            return "", None
         except Exception as e:
             logger.error(f"Claude AI 요청 중 예상치 못한 오류 발생: {e}")
-            return ""
-    return ""
+            return "", None
+
+        payload = parody_payload(response)
+        truncated = response.stop_reason == 'max_tokens'
+        _output_budget.observe(response.usage.output_tokens or 0, items, truncated)
+        if truncated and params.get('max_tokens', ceiling) < ceiling:
+            logger.warning(f"응답이 max_tokens({params.get('max_tokens')})에서 잘려 상한({ceiling})으로 다시 요청합니다.")
+            params = dict(params, max_tokens=ceiling)
+            continue
+        if payload:
+            return payload, response.usage
+        logger.warning("Claude 응답이 비어있습니다. 재시도합니다.")
+    return "", None
+
+def create_senior_parody_with_claude(news_item: Dict[str, Any], target: Optional[str] = None) -> ParodyPayload:
+    """Claude AI를 사용하여 시니어 뉴스 패러디 생성 - 다양성 강화 버전 (target: 배정한 제목 어미 패턴)"""
+    return request_parody(build_parody_request(news_item, target), news_item.get('title', '')[:30])[0]
+
+def parse_parody_response(parody_response: ParodyPayload) -> Optional[Dict[str, Any]]:
+    """단건 응답(도구 인자 또는 텍스트)에서 검증된 패러디 객체를 꺼냅니다. 실패하면 None을 반환합니다.
+
+    필드가 빠졌으면 버리고, 글자 수만 넘친 필드는 ParodyValidator가 줄여서 통과시킵니다.
+    """
+    if isinstance(parody_response, dict):
+        elements = tool_parodies(parody_response)
+        if not elements:
+            logger.warning(f"도구 인자에 패러디가 없어 건너뜁니다: {str(parody_response)[:80]}")
+            _parody_validator.reject('empty_tool_input')
+            return None
+        parody_data = _parody_validator.check(elements[0])
+        if parody_data is not None:
+            parody_data.pop('id', None)
+        return parody_data
+
+    clean_str = _clean_response(parody_response)
+    json_start = clean_str.find('{')
+    json_end = clean_str.rfind('}')
+    if json_start != -1 and json_end != -1 and json_end > json_start:
+        clean_str = clean_str[json_start:json_end+1]
+    clean_str = re.sub(r'\s+', ' ', clean_str).strip()
+    try:
+        parody_data = json.loads(clean_str)
+    except json.JSONDecodeError as e:
+        logger.warning(f"JSON 파싱 실패: {e}")
+        logger.warning(f"정리된 응답: {clean_str[:100]}...")
+        _parody_validator.reject('json_error')
+        return None
+    return _parody_validator.check(parody_data)
+
+def _clean_response(parody_response: str) -> str:
+    clean_str = parody_response.strip()
+    if clean_str.startswith("```json"):
+        clean_str = clean_str[7:].strip()
+    elif clean_str.startswith("```"):
+        clean_str = clean_str[3:].strip()
+    if clean_str.endswith("```"):
+        clean_str = clean_str[:-3].strip()
+    return clean_str
+
+def _parse_array_text(parody_response: str) -> List[Any]:
+    """응답 텍스트의 JSON 배열 원소들. 배열 전체를 읽지 못하면 객체를 하나씩 읽습니다."""
+    clean_str = re.sub(r'\s+', ' ', _clean_response(parody_response)).strip()
+    start, end = clean_str.find('['), clean_str.rfind(']')
+    try:
+        if start == -1 or end <= start:
+            raise ValueError("JSON 배열 없음")
+        parsed = json.loads(clean_str[start:end + 1])
+        return parsed if isinstance(parsed, list) else [parsed]
+    except ValueError as e:
+        logger.warning(f"JSON 배열 파싱 실패, 원소별로 다시 읽습니다: {e}")
+    elements: List[Any] = []
+    decoder = json.JSONDecoder()
+    pos = clean_str.find('{')
+    while pos != -1:
+        try:
+            element, next_pos = decoder.raw_decode(clean_str, pos)
+            elements.append(element)
+            pos = clean_str.find('{', next_pos)
+        except ValueError:
+            pos = clean_str.find('{', pos + 1)
+    return elements
+
+def parse_parody_array_response(parody_response: ParodyPayload, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """묶음 요청 응답(도구 인자 또는 JSON 배열 텍스트)에서 기사 번호별 패러디 객체를 추출합니다.
+
+    텍스트 응답은 배열 전체를 읽지 못하면 객체를 하나씩 읽어 들이므로, 일부 원소가 깨져도
+    나머지는 살립니다. 'id'가 요청한 번호가 아니거나 검증(필드 누락)에 실패한 원소는 버립니다.
+    """
+    if isinstance(parody_response, dict):
+        elements = tool_parodies(parody_response)
+    else:
+        elements = _parse_array_text(parody_response)
+
+    wanted = set(ids)
+    parsed_by_id: Dict[int, Dict[str, Any]] = {}
+    for element in elements:
+        try:
+            article_id = int(element.get('id'))
+        except (AttributeError, TypeError, ValueError):
+            article_id = None
+        if article_id not in wanted or article_id in parsed_by_id:
+            logger.warning(f"묶음 응답의 잘못된 원소를 건너뜁니다: {str(element)[:80]}")
+            _parody_validator.reject('bad_id')
+            continue
+        parody_data = _parody_validator.check(element)
+        if parody_data is None:
+            continue
+        parody_data.pop('id')
+        parsed_by_id[article_id] = parody_data
+    return parsed_by_id
+
+def is_similar_title(title: str, title_index: NearDuplicateIndex, threshold: float = 0.85) -> bool:
+    """기존 제목 중 SequenceMatcher 유사도가 threshold를 넘는 제목이 있는지 확인합니다.
+
+    MinHash/LSH 색인으로 후보를 먼저 추리고 후보만 정확히 비교합니다.
+    """
+    return title_index.has_similar(title, threshold)
+
+def generate_parody_for_article(article: Dict[str, Any], target: Optional[str] = None) -> Dict[str, Any]:
+    """스크래핑된 기사 1건으로 패러디를 생성합니다. (작업 스레드에서 실행, target: 배정한 제목 어미 패턴)
+
+    반환값의 'status'는 'ok'(패러디 생성), 'no_article'(본문 없음),
+    'api_failure'(Claude 응답 없음), 'invalid'(JSON 오류 또는 필드 누락) 중 하나입니다.
+    """
+    return generate_parodies_for_group([(0, article)], {0: target})[0]
+
+def build_parody_outcome(article: Dict[str, Any], parody_response: ParodyPayload) -> Dict[str, Any]:
+    """Claude 응답(도구 인자 또는 텍스트)을 검증해 generate_parody_for_article과 같은 형식의 결과로 만듭니다."""
+    if not parody_response:
+        return {'status': 'api_failure'}
+
+    parody_data = parse_parody_response(parody_response)
+    if parody_data is None:
+        return {'status': 'invalid'}
+    return _attach_article(article, parody_data)
+
+def _attach_article(article: Dict[str, Any], parody_data: Dict[str, Any]) -> Dict[str, Any]:
+    parody_data['original_title'] = article['title']
+    parody_data['original_link'] = article['url']
+    parody_data['text'] = article.get('text', '')  # 원문 추가
+    return {'status': 'ok', 'parody': parody_data}
+
+def build_group_outcomes(group: List[Tuple[int, Dict[str, Any]]],
+                         parody_response: ParodyPayload) -> Dict[int, Dict[str, Any]]:
+    """묶음 요청 응답을 순위별 결과로 나눕니다. (단건이면 build_parody_outcome과 같음)
+
+    요청 자체가 실패하면 첫 기사만 'api_failure'로, 나머지는 'no_response'로 표시해
+    연속 실패 횟수가 요청 단위로 세어지게 합니다.
+    """
+    if len(group) == 1:
+        rank, article = group[0]
+        return {rank: build_parody_outcome(article, parody_response)}
+    if not parody_response:
+        return {rank: {'status': 'api_failure' if i == 0 else 'no_response'}
+                for i, (rank, _) in enumerate(group)}
+
+    parsed = parse_parody_array_response(parody_response, list(range(1, len(group) + 1)))
+    outcomes = {}
+    for idx, (rank, article) in enumerate(group, start=1):
+        parody_data = parsed.get(idx)
+        outcomes[rank] = _attach_article(article, parody_data) if parody_data else {'status': 'invalid'}
+    return outcomes
+
+def build_group_request(group: List[Tuple[int, Dict[str, Any]]], targets: Optional[Dict[int, str]] = None,
+                        previous_titles: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
+    """묶음 크기에 맞는 요청 파라미터 (1건이면 기존 단건 프롬프트)
+
+    targets는 순위 -> 배정한 어미 패턴, previous_titles는 패턴이 달라 다시 요청하는 기사의 이전 제목입니다.
+    """
+    targets = targets or {}
+    previous_titles = previous_titles or {}
+    if len(group) == 1:
+        rank, article = group[0]
+        return build_parody_request(article, targets.get(rank), previous_titles.get(rank))
+    return build_parody_group_request([article for _, article in group],
+                                      [targets.get(rank) for rank, _ in group],
+                                      [previous_titles.get(rank) for rank, _ in group])
+
+def parody_cache_key(article: Dict[str, Any]) -> str:
+    """기사 내용 + 프롬프트 버전(지침 해시 포함) + 모델 파라미터로 만든 응답 캐시 키"""
+    return content_key(
+        article.get('title', ''), article.get('text', ''),
+        prompt_version=PARODY_PROMPT_VERSION,
+        system_prompt=hashlib.sha256(PARODY_SYSTEM_PROMPT.encode('utf-8')).hexdigest()[:16],
+        model=PARODY_MODEL,
+        temperature=PARODY_TEMPERATURE,
+    )
+
+def lookup_cached_parody(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """응답 캐시에 있는 패러디로 결과를 만듭니다. 없거나 --refresh 실행이면 None"""
+    if _refresh_responses:
+        return None
+    entry = _response_cache.get(parody_cache_key(article))
+    if entry is None:
+        return None
+    outcome = _attach_article(article, dict(entry['parody']))
+    outcome['cached'] = entry  # 결과를 확정할 때 절감량 집계에 사용
+    return outcome
+
+def _usage_share(usage: Any, items: int) -> Tuple[float, float, float]:
+    """묶음 요청 하나의 사용량을 기사 1건 몫으로 나눕니다. (비율, 입력 토큰, 출력 토큰)"""
+    share = 1 / items
+    input_tokens = output_tokens = 0
+    if usage is not None:
+        input_tokens = ((usage.input_tokens or 0) + (getattr(usage, 'cache_creation_input_tokens', 0) or 0)
+                        + (getattr(usage, 'cache_read_input_tokens', 0) or 0)) * share
+        output_tokens = (usage.output_tokens or 0) * share
+    return share, input_tokens, output_tokens
+
+def _store_parody(key: str, parody: Dict[str, Any], share: float, input_tokens: float, output_tokens: float):
+    parody = {k: v for k, v in parody.items() if k not in ('original_title', 'original_link', 'text')}
+    try:
+        _response_cache.put(key, parody, share, input_tokens, output_tokens)
+    except Exception as e:
+        logger.warning(f"응답 캐시 저장 실패: {e}")
+
+def store_parodies(group: List[Tuple[int, Dict[str, Any]]], outcomes: Dict[int, Dict[str, Any]], usage: Any):
+    """검증을 통과한 패러디를 응답 캐시에 저장합니다. (토큰 수는 묶음 기사 수로 나눠 기록)"""
+    share, input_tokens, output_tokens = _usage_share(usage, len(group))
+    for rank, article in group:
+        outcome = outcomes.get(rank, {})
+        if outcome.get('status') != 'ok':
+            continue
+        _store_parody(parody_cache_key(article), outcome['parody'], share, input_tokens, output_tokens)
+
+def _request_outcomes(group: List[Tuple[int, Dict[str, Any]]], targets: Dict[int, str],
+                      previous_titles: Optional[Dict[int, str]] = None) -> Dict[int, Dict[str, Any]]:
+    """묶음 하나를 요청해 순위별 결과를 만들고, 검증을 통과한 패러디를 응답 캐시에 저장합니다."""
+    label = group[0][1].get('title', '')[:30] + (f" 외 {len(group) - 1}건" if len(group) > 1 else '')
+    payload, usage = request_parody(build_group_request(group, targets, previous_titles), label, len(group))
+    outcomes = build_group_outcomes(group, payload)
+    store_parodies(group, outcomes, usage)
+    return outcomes
+
+def pattern_mismatches(group: List[Tuple[int, Dict[str, Any]]], outcomes: Dict[int, Dict[str, Any]],
+                       targets: Dict[int, str], planner: Optional[DiversityPlanner] = None,
+                       retry: bool = False) -> List[Tuple[int, Dict[str, Any]]]:
+    """생성된 제목이 배정한 어미 패턴과 다른 (순위, 기사) 목록 (planner를 주면 검증 통계도 기록)"""
+    mismatched = []
+    for rank, article in group:
+        outcome = outcomes.get(rank, {})
+        target = targets.get(rank)
+        if outcome.get('status') != 'ok' or target is None:
+            continue
+        title = outcome['parody']['ou_title']
+        matched = (planner.check(title, target, retry) if planner is not None
+                   else classify_title_pattern(title) in (None, target))
+        if not matched:
+            mismatched.append((rank, article))
+    return mismatched
+
+def generate_parodies_for_group(group: List[Tuple[int, Dict[str, Any]]], targets: Optional[Dict[int, str]] = None,
+                                check_cache: bool = True,
+                                planner: Optional[DiversityPlanner] = None) -> Dict[int, Dict[str, Any]]:
+    """(순위, 기사) 묶음 하나를 한 번의 요청으로 생성합니다. (작업 스레드에서 실행)
+
+    targets(순위 -> 배정한 어미 패턴)를 주면 생성된 제목의 패턴을 검증하고, 다른 기사만 모아
+    PATTERN_RETRIES번까지 다시 요청합니다. (다시 받아도 다르면 마지막 결과를 그대로 반환)
+    응답 캐시에 있는 기사는 요청에서 빼고 캐시된 패러디를 그대로 사용합니다.
+    (호출하는 쪽에서 이미 캐시를 확인했으면 check_cache=False)
+
+    Returns:
+        순위 -> generate_parody_for_article과 같은 형식의 결과
+    """
+    targets = targets or {}
+    outcomes: Dict[int, Dict[str, Any]] = {}
+    remaining = []
+    for rank, article in group:
+        cached = lookup_cached_parody(article) if check_cache else None
+        if cached is not None:
+            outcomes[rank] = cached
+        else:
+            remaining.append((rank, article))
+    if not remaining:
+        return outcomes
+
+    outcomes.update(_request_outcomes(remaining, targets))
+    mismatched = pattern_mismatches(remaining, outcomes, targets, planner)
+    for _ in range(PATTERN_RETRIES):
+        if not mismatched:
+            break
+        previous = {rank: outcomes[rank]['parody']['ou_title'] for rank, _ in mismatched}
+        logger.info(f"배정한 어미 패턴과 다른 제목 {len(mismatched)}건을 다시 요청합니다: {list(previous.values())}")
+        retried = _request_outcomes(mismatched, targets, previous)
+        # 다시 받은 결과가 실패면 이전 결과를 유지
+        outcomes.update({rank: outcome for rank, outcome in retried.items() if outcome.get('status') == 'ok'})
+        mismatched = pattern_mismatches(mismatched, retried, targets, planner, retry=True)
+    return outcomes
+
+class ParodyCollector:
+    """순위 순서로 확정되는 패러디 후보를 검증해 모읍니다.
+
+    JSON 검증을 통과한 후보 중 기존 제목과 유사하지 않고 어미 패턴의 할당량(planner)이
+    남은 것만 받아들이며, 제목 패턴 분포와 연속 API 실패 횟수를 함께 추적합니다.
+    요청마다 배정할 어미 패턴은 planner.assign()으로 정합니다.
+    max_failures가 None이면 API 실패로 중단하지 않습니다. (이미 응답을 받은 배치 결과 처리용)
+    journal을 주면 저널에 남은 확정 패러디로 상태를 복원하고, 이후 확정/제외를 기록합니다.
+    """
+
+    def __init__(self, max_needed: int = 30, max_failures: Optional[int] = 5,
+                 journal: Optional[RunJournal] = None):
+        self.max_needed = max_needed
+        self.journal = journal
+        self.max_failures = max_failures
+        self.results: List[Dict[str, Any]] = []
+        self.existing_titles: List[str] = []
+        self.title_index = NearDuplicateIndex()
+        self.api_failures = 0
+        self.aborted = False
+        self.planner = DiversityPlanner(max_needed)
+        # 다양성 추적을 위한 카운터
+        self.pattern_counter = {
+            'exclamation': 0, 'question': 0, 'statement': 0, 'concern': 0
+        }
+        if journal is not None:
+            for parody_data in journal.accepted[:max_needed]:
+                self._accept(parody_data)
+
+    def _accept(self, parody_data: Dict[str, Any]):
+        current_title = parody_data['ou_title']
+        self.results.append(parody_data)
+        self.existing_titles.append(current_title)
+        self.title_index.add(current_title)
+
+        # 패턴 추적 및 카운터 업데이트
+        pattern = classify_title_pattern(current_title)
+        self.planner.accept(pattern)
+        if pattern:
+            self.pattern_counter[pattern] += 1
+
+    def _reject(self, url: str, rank: int, reason: str):
+        if self.journal is not None and url:
+            self.journal.record_rejected(url, rank, reason)
+
+    @property
+    def done(self) -> bool:
+        return self.aborted or len(self.results) >= self.max_needed
+
+    def offer(self, outcome: Dict[str, Any], rank: int, url: str = '', target: Optional[str] = None) -> bool:
+        """순위 rank(1부터)의 생성 결과를 확정합니다. 받아들였으면 True를 반환합니다.
+
+        target은 이 기사에 배정했던 어미 패턴이며, 결과와 상관없이 진행 중 배정에서 해제합니다.
+        """
+        self.planner.release(target)
+        status = outcome['status']
+        if status != 'ok':
+            self._reject(url, rank, status)
+        if status == 'api_failure':
+            self.api_failures += 1
+            logger.warning(f"Claude 응답이 없어 건너뜁니다. (실패 횟수: {self.api_failures})")
+            if self.max_failures is not None and self.api_failures >= self.max_failures:
+                logger.error(f"연속 {self.max_failures}회 API 호출 실패로 중단합니다.")
+                self.aborted = True
+            return False
+        if status != 'ok':
+            return False
+        if outcome.get('cached'):
+            _response_cache.record_saving(outcome['cached'])
+
+        parody_data = outcome['parody']
+        current_title = parody_data['ou_title']
+        pattern = classify_title_pattern(current_title)
+        if not self.planner.has_room(pattern):
+            logger.warning(f"어미 패턴({pattern})의 할당량이 차서 건너뜁니다: {current_title}")
+            self.planner.reject_full()
+            self._reject(url, rank, 'pattern_quota')
+            return False
+        if is_similar_title(current_title, self.title_index):
+            logger.warning(f"유사한 제목이 이미 존재하여 건너뜁니다: {current_title}")
+            self._reject(url, rank, 'similar')
+            return False
+
+        self._accept(parody_data)
+        if self.journal is not None:
+            self.journal.record_accepted(url or parody_data.get('original_link', ''), rank, parody_data)
+
+        source = " [캐시]" if outcome.get('cached') else ""
+        logger.info(f"✅ 패러디 생성 성공 ({len(self.results)}/{self.max_needed}, 순위 {rank}){source}: {current_title}")
+        logger.info(f"현재 패턴 분포: {analyze_title_patterns(self.existing_titles)}")
+        self.api_failures = 0
+        return True
+
+def _article_fetcher(journal: Optional[RunJournal], news_list: List[Dict[str, Any]]):
+    """프리페치에 쓸 기사 수집 함수
+
+    RSS 요약 정책이 켜져 있으면 요약이 충분한 기사는 스크래핑하지 않고 요약을 쓰며,
+    저널이 있으면 수집 결과도 기록합니다.
+    """
+    summary_policy = _summary_policy
+    if journal is None and summary_policy is None:
+        return get_article_content
+    news_by_link = {news.get('link', ''): news for news in news_list}
+
+    def fetch(url: str) -> Optional[Dict[str, Any]]:
+        article = None
+        if summary_policy is not None and url in news_by_link:
+            article = summary_policy.article_from_entry(news_by_link[url])
+        if article is None:
+            article = get_article_content(url)
+        if journal is not None:
+            journal.record_scrape(url, article)
+        return article
+    return fetch
+
+def _completed_future(result: Dict[str, Any]) -> Future:
+    """이미 결과가 정해진 Future를 만듭니다. (스크래핑 실패 후보 처리용)"""
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+def generate_parodies(sorted_news: List[Dict[str, Any]], max_needed: int = 30,
+                      concurrency: int = DEFAULT_GENERATION_CONCURRENCY,
+                      prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+                      prefetch_queue_size: int = DEFAULT_PREFETCH_QUEUE_SIZE,
+                      group_size: int = DEFAULT_PARODY_GROUP_SIZE,
+                      journal: Optional[RunJournal] = None):
+    """순위가 매겨진 후보 뉴스로 패러디를 동시에 생성합니다.
+
+    기사 본문은 ArticlePrefetcher가 순위 선정 직후부터 미리 스크래핑해
+    제한된 큐에 넣고, 이 함수는 큐에서 기사를 꺼내 group_size건씩 묶어
+    최대 concurrency개의 Claude 요청을 동시에 진행합니다. 필요한 개수보다
+    많은 후보를 미리 요청하고, max_needed개가 채워지면 남은 작업은 취소합니다.
+    제목 어미 패턴은 요청할 때 DiversityPlanner가 배정하므로 요청끼리 서로의 결과를 기다리지 않습니다.
+    결과는 항상 순위 순서대로 검증(JSON 정리, 패턴 할당량, 유사 제목 검사)되므로
+    동일한 응답이면 최종 순서와 선택 결과가 실행마다 같습니다.
+    journal을 주면 중단된 실행의 확정 결과에서 이어가고, 진행 상황을 기록합니다.
+
+    Returns:
+        (패러디 결과 목록, 제목 패턴 카운터)
+    """
+    concurrency = max(1, concurrency)
+    group_size = max(1, group_size)
+    # 순위 순서 처리를 기다리는 동안 너무 많은 후보를 미리 소비하지 않도록 제한
+    max_pending = concurrency * group_size * 2
+
+    collector = ParodyCollector(max_needed, journal=journal)
+
+    pending: Dict[int, Future] = {}  # 순위 -> {순위: 결과}를 돌려주는 Future (묶음이면 같은 Future 공유)
+    jobs: List[Future] = []          # 진행 중인 Claude 요청
+    group: List[Tuple[int, Dict[str, Any]]] = []  # 아직 제출하지 않은 묶음
+    targets: Dict[int, str] = {}     # 순위 -> 요청할 때 배정한 어미 패턴
+    next_accept = 0
+
+    prefetcher = ArticlePrefetcher(_article_fetcher(journal, sorted_news), sorted_news,
+                                   workers=prefetch_workers, queue_size=prefetch_queue_size).start()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def submit_group():
+        # 어미 패턴은 제출할 때 미리 배정하므로 요청끼리 서로의 결과를 기다리지 않음
+        job = executor.submit(generate_parodies_for_group, list(group),
+                              {rank: targets[rank] for rank, _ in group},
+                              check_cache=False, planner=collector.planner)
+        jobs.append(job)
+        for rank, _ in group:
+            pending[rank] = job
+        group.clear()
+
+    try:
+        while not collector.done:
+            jobs[:] = [job for job in jobs if not job.done()]
+
+            # 동시 요청 한도까지 프리페치된 기사로 Claude 요청을 제출
+            # (다음 확정 순위의 기사가 아직 없으면 선행 한도와 무관하게 가져옴)
+            # 할당량의 모든 자리가 진행 중인 요청으로 배정되었으면 결과(실패/불일치로 자리가 다시 나는지)를 기다림
+            head_missing = next_accept not in pending
+            if (not prefetcher.exhausted and len(jobs) < concurrency
+                    and ((len(pending) + len(group) < max_pending and collector.planner.open_slots() > 0)
+                         or head_missing)):
+                # 진행 중인 요청이 없으면 다음 기사가 올 때까지 기다림 (stall)
+                item = prefetcher.get(timeout=None if not jobs else 0)
+                if item is not None:
+                    rank, news, article = item
+                    if not article or not article.get('text'):
+                        pending[rank] = _completed_future({rank: {'status': 'no_article'}})
+                    else:
+                        article = dict(article)
+                        article['source_rss'] = news.get('source_rss')
+                        article['original_link'] = news.get('link', '')
+                        cached = lookup_cached_parody(article)
+                        if cached is not None:
+                            # 이전 실행에서 받은 응답은 요청 없이 바로 확정 대기열로
+                            pending[rank] = _completed_future({rank: cached})
+                        else:
+                            group.append((rank, article))
+                            targets[rank] = collector.planner.assign()
+                            if len(group) >= group_size:
+                                submit_group()
+                    continue
+
+            # 더 받을 기사가 없으면 채우지 못한 묶음도 제출
+            if group and prefetcher.exhausted:
+                submit_group()
+                continue
+
+            if next_accept >= len(sorted_news):
+                break  # 남은 후보 없음
+
+            head = pending.get(next_accept)
+            if head is None and prefetcher.exhausted:
+                break
+            if head is None or not head.done():
+                if jobs:
+                    wait(jobs, timeout=0.05, return_when=FIRST_COMPLETED)
+                continue
+
+            # 순위 순서대로 결과 확정
+            rank = next_accept
+            del pending[rank]
+            next_accept += 1
+            target = targets.pop(rank, None)
+            try:
+                outcome = head.result()[rank]
+            except Exception as e:
+                logger.error(f"패러디 생성 중 오류 발생: {e}")
+                collector.planner.release(target)
+                continue
+
+            collector.offer(outcome, next_accept, sorted_news[rank].get('link', ''), target)
+    finally:
+        # 목표 개수를 채웠거나 중단된 경우 대기 중인 작업 취소
+        prefetcher.stop()
+        cancelled = sum(1 for job in jobs if job.cancel())
+        if cancelled:
+            logger.info(f"남은 후보 요청 {cancelled}건을 취소했습니다.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        prefetcher.log_stats()
+        collector.planner.log_stats()
+
+    return collector.results, collector.pattern_counter
+
+def batch_wait_timeout() -> float:
+    """배치를 기다릴 수 있는 시간(초): 기본 제한과 실행 마감까지 남은 시간(결과 저장 몫 제외) 중 작은 값"""
+    if _run_deadline is None:
+        return DEFAULT_BATCH_TIMEOUT
+    return max(0.0, min(DEFAULT_BATCH_TIMEOUT, _run_deadline - time.monotonic() - BATCH_SAVE_RESERVE))
+
+def recover_journaled_batches(client, journal: Optional[RunJournal]) -> bool:
+    """중단된 실행이 제출해 둔 배치의 결과를 받아 응답 캐시에 넣습니다. 모두 받았으면 True
+
+    저널에는 요청(custom_id)별로 묶은 기사의 응답 캐시 키가 남아 있으므로, 받은 패러디를 그 키로 저장하면
+    이번 실행의 후보 수집 단계(lookup_cached_parody)가 새로 제출하지 않고 그대로 사용합니다.
+    마감 전에 끝나지 않은 배치는 저널에 남겨 두고 False를 반환합니다. (새 배치를 또 제출하지 않도록)
+    """
+    if journal is None:
+        return True
+    for batch_id, keys_by_request in list(journal.pending_batches.items()):
+        try:
+            wait_for_batch(client, batch_id, timeout=batch_wait_timeout())
+            usages: Dict[str, Any] = {}
+            responses = collect_results(client, batch_id, usage_tracker=_usage_tracker, usages=usages)
+        except BatchTimeoutError as e:
+            logger.warning(f"이전 실행의 배치가 아직 처리 중입니다. 다시 실행하면 이어서 확인합니다: {e}")
+            return False
+        except APIError as e:
+            logger.error(f"이전 실행의 배치 결과를 받지 못해 버립니다: {batch_id}, {e}")
+            journal.record_batch_collected(batch_id)
+            continue
+
+        restored = 0
+        for custom_id, keys in keys_by_request.items():
+            payload = responses.get(custom_id)
+            if not payload or not keys:
+                continue
+            if len(keys) == 1:
+                parsed = parse_parody_response(payload)
+                parodies = {1: parsed} if parsed else {}
+            else:
+                parodies = parse_parody_array_response(payload, list(range(1, len(keys) + 1)))
+            share, input_tokens, output_tokens = _usage_share(usages.get(custom_id), len(keys))
+            for idx, key in enumerate(keys, start=1):
+                if parodies.get(idx):
+                    _store_parody(key, parodies[idx], share, input_tokens, output_tokens)
+                    restored += 1
+        journal.record_batch_collected(batch_id)
+        logger.info(f"📦 이전 실행의 배치 {batch_id}에서 패러디 {restored}건을 받아 응답 캐시에 넣었습니다.")
+    return True
+
+def generate_parodies_batch(sorted_news: List[Dict[str, Any]], max_needed: int = 30,
+                            prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+                            prefetch_queue_size: int = DEFAULT_PREFETCH_QUEUE_SIZE,
+                            oversample: float = BATCH_OVERSAMPLE, max_rounds: int = BATCH_MAX_ROUNDS,
+                            group_size: int = DEFAULT_PARODY_GROUP_SIZE,
+                            journal: Optional[RunJournal] = None):
+    """Message Batches API로 패러디를 한 번에 생성합니다. (정기 실행용)
+
+    필요한 개수보다 조금 많은 후보(oversample 배)를 모아 배치 하나로 제출하고,
+    완료되면 결과를 순위 순서대로 실시간 경로와 같은 검증(JSON 정리, 패턴 할당량, 유사 제목 검사)에
+    통과시킵니다. 목표 개수에 못 미치면 다음 순위 후보로 배치를 다시 제출합니다.
+    제목 어미 패턴은 후보마다 제출 전에 배정하고, 배정과 다른 제목이 나온 기사는
+    확정하지 않고 다음 배치에 다시 넣습니다. (마지막 배치 뒤에도 남으면 그 결과로 확정)
+    group_size가 2 이상이면 배치 안의 요청 하나에 기사 여러 건을 묶습니다.
+
+    제출한 배치 ID는 저널에 바로 기록하고, 기다릴 시간은 실행 마감(batch_wait_timeout)까지로 줄입니다.
+    중단된 실행이 남긴 배치가 있으면 새로 제출하기 전에 그 결과부터 받아 씁니다.
+
+    Returns:
+        (패러디 결과 목록, 제목 패턴 카운터)
+    """
+    collector = ParodyCollector(max_needed, max_failures=None, journal=journal)
+    planner = collector.planner
+    group_size = max(1, group_size)
+    client = init_claude_gateway().client
+    if not recover_journaled_batches(client, journal):
+        # 이전 배치가 끝나기 전에 새로 제출하면 같은 기사를 두 번 결제하게 됨
+        return collector.results, collector.pattern_counter
+
+    targets: Dict[int, str] = {}       # 순위 -> 배정한 어미 패턴
+    retry_queue: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]] = {}  # 순위 -> (기사, 패턴이 다른 결과)
+    retried = set()                    # 이미 다시 요청한 순위
+
+    def offer(rank: int, outcome: Dict[str, Any]):
+        collector.offer(outcome, rank + 1, sorted_news[rank].get('link', ''), targets.pop(rank, None))
+
+    prefetcher = ArticlePrefetcher(_article_fetcher(journal, sorted_news), sorted_news,
+                                   workers=prefetch_workers, queue_size=prefetch_queue_size).start()
+    try:
+        for round_no in range(1, max_rounds + 1):
+            if collector.done or (prefetcher.exhausted and not retry_queue):
+                break
+            want = math.ceil((max_needed - len(collector.results)) * oversample)
+
+            # 패턴이 달랐던 기사부터 다시 넣고, 본문이 있는 후보를 want개까지 모음
+            # (순위 순서 유지, 응답 캐시에 있는 기사는 요청하지 않음)
+            candidates: Dict[int, Dict[str, Any]] = {}
+            previous_titles: Dict[int, str] = {}
+            for rank, (article, outcome) in retry_queue.items():
+                candidates[rank] = article
+                previous_titles[rank] = outcome['parody']['ou_title']
+                retried.add(rank)
+            retry_queue.clear()
+            outcomes: Dict[int, Dict[str, Any]] = {}
+            while len(candidates) + len(outcomes) < want and not prefetcher.exhausted:
+                item = prefetcher.get(timeout=None)
+                if item is None:
+                    continue
+                rank, news, article = item
+                if not article or not article.get('text'):
+                    continue
+                article = dict(article)
+                article['source_rss'] = news.get('source_rss')
+                article['original_link'] = news.get('link', '')
+                cached = lookup_cached_parody(article)
+                if cached is not None:
+                    outcomes[rank] = cached
+                else:
+                    candidates[rank] = article
+                    targets[rank] = planner.assign()
+            if not candidates and not outcomes:
+                break
+
+            batch_failed = False
+            if candidates:
+                # 어미 패턴을 미리 배정했으므로 배치 안의 요청끼리 서로의 결과가 필요 없음
+                ranks = sorted(candidates)
+                groups = [[(rank, candidates[rank]) for rank in ranks[i:i + group_size]]
+                          for i in range(0, len(ranks), group_size)]
+                batch_requests = [
+                    {'custom_id': f"rank-{g[0][0]:04d}",
+                     'params': build_group_request(g, targets, previous_titles)}
+                    for g in groups
+                ]
+                logger.info(f"📦 배치 {round_no}회차: 후보 {len(ranks)}건(패턴 재요청 {len(previous_titles)}건), "
+                            f"요청 {len(batch_requests)}건 제출 "
+                            f"(캐시 {len(outcomes)}건, 현재 {len(collector.results)}/{max_needed})")
+                cache_keys = {request['custom_id']: [parody_cache_key(article) for _, article in g]
+                              for g, request in zip(groups, batch_requests)}
+                usages: Dict[str, Any] = {}
+                try:
+                    responses = run_message_batch(
+                        client, batch_requests, timeout=batch_wait_timeout(),
+                        usage_tracker=_usage_tracker, usages=usages,
+                        on_submit=(lambda batch_id: journal.record_batch_submitted(batch_id, cache_keys))
+                        if journal is not None else None,
+                    )
+                    batch_pending = False
+                except BatchTimeoutError as e:
+                    # 배치 ID는 저널에 남아 있으므로 다시 실행하면 새로 제출하지 않고 이 배치의 결과를 받음
+                    logger.error(f"실행 제한 시간 안에 배치가 끝나지 않았습니다. 다시 실행하면 이어서 확인합니다: {e}")
+                    responses, batch_pending = {}, True
+                except APIError as e:
+                    logger.error(f"메시지 배치 처리 실패: {e}")
+                    responses, batch_pending = {}, False
+                if not any(responses.values()):
+                    if not batch_pending:
+                        logger.error("배치의 모든 요청이 실패하여 중단합니다.")
+                    batch_failed = True
+                for g, request in zip(groups, batch_requests):
+                    usage = usages.get(request['custom_id'])
+                    _prompt_profiler.record_actual(request['params'], usage)
+                    if usage is not None:
+                        _output_budget.observe(getattr(usage, 'output_tokens', 0) or 0, len(g))
+                if not batch_failed:
+                    for g in groups:
+                        custom_id = f"rank-{g[0][0]:04d}"
+                        fresh = build_group_outcomes(g, responses.get(custom_id) or "")
+                        store_parodies(g, fresh, usages.get(custom_id))
+                        first = [(rank, article) for rank, article in g if rank not in retried]
+                        again = [(rank, article) for rank, article in g if rank in retried]
+                        mismatched = pattern_mismatches(first, fresh, targets, planner)
+                        pattern_mismatches(again, fresh, targets, planner, retry=True)
+                        for rank, article in mismatched:
+                            if PATTERN_RETRIES > 0:
+                                retry_queue[rank] = (article, fresh.pop(rank))
+                        outcomes.update(fresh)
+
+            for rank in sorted(outcomes):
+                if collector.done:
+                    break
+                offer(rank, outcomes[rank])
+            if batch_failed:
+                break
+        # 다시 요청할 배치가 남지 않았으면 패턴이 다른 결과라도 할당량 안에서 확정
+        for rank in sorted(retry_queue):
+            if collector.done:
+                break
+            offer(rank, retry_queue[rank][1])
+    finally:
+        prefetcher.stop()
+        prefetcher.log_stats()
+        planner.log_stats()
+
+    return collector.results, collector.pattern_counter
 
 def get_drive_service():
     """Google Drive API 서비스를 생성하고 반환합니다. (개인 OAuth 계정)"""
@@ -857,7 +1839,7 @@ def create_table_in_docs(docs_service, document_id: str, headers: List[str], row
         # 인덱스가 큰 셀부터(역순) 삽입해야 앞쪽 인덱스가 밀리지 않는다.
         cell_inserts.sort(key=lambda x: x[0], reverse=True)
         
-        requests = [
+        insert_requests = [
             {
                 'insertText': {
                     'location': {'index': insert_index},
@@ -869,13 +1851,13 @@ def create_table_in_docs(docs_service, document_id: str, headers: List[str], row
         
         # 배치로 텍스트 입력 (한 번에 최대 100개 요청)
         batch_size = 100
-        for i in range(0, len(requests), batch_size):
-            batch = requests[i:i + batch_size]
+        for i in range(0, len(insert_requests), batch_size):
+            batch = insert_requests[i:i + batch_size]
             docs_service.documents().batchUpdate(
                 documentId=document_id,
                 body={'requests': batch}
             ).execute()
-            if i + batch_size < len(requests):
+            if i + batch_size < len(insert_requests):
                 time.sleep(0.2)  # API 제한 방지
         
         logger.info(f"표 생성 완료: {num_rows}행 x {num_cols}열")
@@ -885,8 +1867,8 @@ def create_table_in_docs(docs_service, document_id: str, headers: List[str], row
         logger.error(traceback.format_exc())
         raise
 
-def save_results_to_gsheet(client, parody_data_list: List[Dict[str, Any]], spreadsheet_id: str, worksheet_name: str):
-    """생성된 패러디 결과를 구글 시트에 저장합니다. (이전 기록 삭제 후 새로 기록)"""
+def save_results_to_gsheet(client, parody_data_list: List[Dict[str, Any]], spreadsheet_id: str, worksheet_name: str) -> bool:
+    """생성된 패러디 결과를 구글 시트에 저장합니다. (이전 기록 삭제 후 새로 기록) 성공하면 True"""
     try:
         spreadsheet = client.open_by_key(spreadsheet_id)
         try:
@@ -905,7 +1887,7 @@ def save_results_to_gsheet(client, parody_data_list: List[Dict[str, Any]], sprea
             worksheet.clear()
             worksheet.append_row(headers)
             logger.info("기존 데이터를 삭제하고 헤더만 남겼습니다.")
-            return
+            return True
             
         # 새로운 데이터 준비
         rows_to_upload = [headers]  # 헤더를 첫 번째 행으로 추가
@@ -932,9 +1914,11 @@ def save_results_to_gsheet(client, parody_data_list: List[Dict[str, Any]], sprea
         worksheet.clear()
         worksheet.update(values=rows_to_upload, range_name='A1')
         logger.info(f"구글 시트 '{worksheet_name}'의 기존 데이터를 삭제하고 {len(parody_data_list)}개 새로운 데이터로 교체 완료!")
+        return True
 
     except Exception as e:
         logger.error(f"구글 시트 저장 중 오류 발생: {e}")
+        return False
 
 def check_drive_quota(drive_service):
     """Google Drive 할당량을 확인합니다. (서비스 계정의 할당량 확인)"""
@@ -1118,14 +2102,39 @@ def save_results_to_drive_docs(parody_data_list: List[Dict[str, Any]], folder_id
         import traceback
         logger.error(traceback.format_exc())
 
-def main():
-    """메인 실행 함수 - 다양성 강화 로직 포함"""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='시니어 뉴스 패러디 수집/생성')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Claude 응답 캐시를 사용하지 않고 모든 패러디를 새로 생성')
+    parser.add_argument('--restart', action='store_true',
+                        help='중단된 실행 저널을 무시하고 처음부터 다시 생성')
+    return parser.parse_args(argv)
+
+def main(refresh: bool = False, restart: bool = False):
+    """메인 실행 함수 - 다양성 강화 로직 포함
+
+    Args:
+        refresh: True이면 응답 캐시를 읽지 않고 새로 생성합니다. (새 결과는 캐시에 다시 저장)
+        restart: True이면 오늘 중단된 실행이 있어도 이어가지 않고 처음부터 시작합니다.
+    """
+    global _refresh_responses, _summary_policy, _stream_responses, _tool_output, _run_deadline
+    _refresh_responses = refresh
     start_time = time.time()
+    # step4가 이 스크립트에 준 제한 시간 (배치 대기를 그 안으로 줄임)
+    step_timeout = os.environ.get('STEP_TIMEOUT_SECONDS')
+    if step_timeout:
+        try:
+            _run_deadline = time.monotonic() + float(step_timeout)
+        except ValueError:
+            logger.warning(f"STEP_TIMEOUT_SECONDS 값이 숫자가 아니라 무시합니다: {step_timeout}")
     print("="*50)
     print("시니어 뉴스 패러디 자동 생성을 시작합니다. (다양성 강화 버전)", flush=True)
     print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", flush=True)
     print("="*50)
 
+    parody_results: List[Dict[str, Any]] = []
+    pattern_counter = {'exclamation': 0, 'question': 0, 'statement': 0, 'concern': 0}
+
     try:
         # 1. 설정 로드
         logger.info("설정 파일(asset/rawdata.txt) 로드 중...")
@@ -1138,117 +2147,92 @@ def main():
             logger.error("설정 파일에 '패러디결과_스프레드시트_ID' 정보가 없습니다. 프로그램을 종료합니다.")
             return
 
+        # Claude 게이트웨이 준비 (분당 요청/토큰 한도 적용)
+        init_claude_gateway(config)
+        _prompt_budget.max_input_tokens = get_config_int(config, '패러디_입력토큰_상한',
+                                                         DEFAULT_PARODY_INPUT_TOKEN_BUDGET)
+        _stream_responses = str(config.get('패러디_스트리밍', 'true')).strip().lower() in ('1', 'true', 'yes', '예')
+        _tool_output = str(config.get('패러디_도구출력', 'true')).strip().lower() in ('1', 'true', 'yes', '예')
+        # 공용 HTTP 클라이언트(HTTP/2, DNS 캐시), 기사 다운로드 엔진과 본문 추출기 준비
+        init_http_client(config)
+        init_html_extractor(config)
+        init_article_fetcher(config)
+        # RSS 요약이 충분한 기사는 본문 스크래핑 생략
+        if str(config.get('RSS요약_사용', 'true')).strip().lower() in ('1', 'true', 'yes', '예'):
+            _summary_policy = SummaryPolicy(
+                min_chars=get_config_int(config, 'RSS요약_최소길이', DEFAULT_SUMMARY_MIN_CHARS),
+                min_score=get_config_float(config, 'RSS요약_최소점수', DEFAULT_SUMMARY_MIN_SCORE),
+            )
+
         # 2. RSS 피드에서 뉴스 가져오기
         logger.info("RSS 피드에서 뉴스 수집 중...")
-        all_news_entries = fetch_news_from_rss(config['rss_urls'])
+        seen_filter = SeenFilter(retention_days=get_config_int(config, '중복방지_보관일수', DEFAULT_SEEN_RETENTION_DAYS))
+        all_news_entries = fetch_news_from_rss(config['rss_urls'], FeedStateStore(RSS_STATE_PATH), seen_filter)
         
         if not all_news_entries:
             logger.error("수집된 뉴스가 없습니다. RSS 피드를 확인해주세요.")
             return
         
+        # 중단된 실행이 있으면 이미 확정/제외한 기사를 후보에서 빼고 이어서 진행
+        journal = RunJournal(resume=not restart)
+        processed_urls = journal.processed_urls
+        if processed_urls:
+            all_news_entries = [n for n in all_news_entries if n.get('link', '') not in processed_urls]
+
         # 3. 뉴스 중요도 평가 및 선택
         # 충분히 많은 후보군 확보 (예: 100개)
         candidate_count = 100
-        sorted_news = rank_and_select_news(all_news_entries, candidate_count)
+        sorted_news = rank_and_select_news(
+            all_news_entries, candidate_count,
+            korean_boundaries=config.get('키워드_경계규칙', '').lower() in ('1', 'true', 'yes', '예'),
+        )
         
-        # 4. 개선된 패러디 생성 로직 - 다양성 강화
-        logger.info("최소 30개 패러디가 나올 때까지 반복 생성... (다양성 강화)")
-        parody_results = []
-        existing_titles = []
+        # 4. 개선된 패러디 생성 로직 - 다양성 강화 (동시 요청)
         max_needed = 30
-        api_failures = 0
-        max_failures = 5
-        
-        # 다양성 추적을 위한 카운터
-        pattern_counter = {
-            'exclamation': 0, 'question': 0, 'statement': 0, 'concern': 0
-        }
-        
-        for news in sorted_news:
-            # 본문 스크래핑
-            article = get_article_content(news.get('link', ''))
-            if not article or not article.get('text'):
-                continue
-            article['source_rss'] = news.get('source_rss')
-            article['original_link'] = news.get('link', '')
-            
-            # 패턴 다양성 확인 후 생성
-            current_patterns = analyze_title_patterns(existing_titles)
-            logger.info(f"현재 패턴 분포: {current_patterns}")
-            
-            # Claude 패러디 생성
-            try:
-                parody_response = create_senior_parody_with_claude(article, existing_titles)
-                if not parody_response:
-                    api_failures += 1
-                    logger.warning(f"Claude 응답이 없어 건너뜁니다. (실패 횟수: {api_failures})")
-                    if api_failures >= max_failures:
-                        logger.error(f"연속 {max_failures}회 API 호출 실패로 중단합니다.")
-                        break
-                    continue
+        prefetch_workers = get_config_int(config, '기사_프리페치_작업수', DEFAULT_PREFETCH_WORKERS)
+        prefetch_queue_size = get_config_int(config, '기사_프리페치_큐크기', DEFAULT_PREFETCH_QUEUE_SIZE)
+        generation_mode = str(config.get('패러디_생성모드', 'realtime')).strip().lower()
+        group_size = get_config_int(config, '패러디_묶음크기', DEFAULT_PARODY_GROUP_SIZE)
+        if generation_mode == 'batch':
+            logger.info(f"최소 {max_needed}개 패러디가 나올 때까지 생성... (메시지 배치 모드)")
+            parody_results, pattern_counter = generate_parodies_batch(
+                sorted_news, max_needed,
+                prefetch_workers=prefetch_workers, prefetch_queue_size=prefetch_queue_size,
+                group_size=group_size, journal=journal,
+            )
+        else:
+            concurrency = get_config_int(config, '패러디_동시요청수', DEFAULT_GENERATION_CONCURRENCY)
+            logger.info(f"최소 {max_needed}개 패러디가 나올 때까지 생성... (동시 요청 {concurrency}개, 다양성 강화)")
+            parody_results, pattern_counter = generate_parodies(
+                sorted_news, max_needed, concurrency,
+                prefetch_workers=prefetch_workers, prefetch_queue_size=prefetch_queue_size,
+                group_size=group_size, journal=journal,
+            )
 
-                clean_str = parody_response.strip()
-                if clean_str.startswith("```json"):
-                    clean_str = clean_str[7:].strip()
-                elif clean_str.startswith("```"):
-                    clean_str = clean_str[3:].strip()
-                if clean_str.endswith("```"):
-                    clean_str = clean_str[:-3].strip()
-                json_start = clean_str.find('{')
-                json_end = clean_str.rfind('}')
-                if json_start != -1 and json_end != -1 and json_end > json_start:
-                    clean_str = clean_str[json_start:json_end+1]
-                clean_str = re.sub(r'\s+', ' ', clean_str).strip()
-                try:
-                    parody_data = json.loads(clean_str)
-                    if 'ou_title' not in parody_data:
-                        logger.warning("'ou_title' 키가 없어 건너뜁니다.")
-                        continue
-                    current_title = parody_data['ou_title']
-                    is_duplicate = False
-                    for title in existing_titles:
-                        if SequenceMatcher(None, current_title, title).ratio() > 0.85:
-                            is_duplicate = True
-                            logger.warning(f"유사한 제목이 이미 존재하여 건너뜁니다: {current_title}")
-                            break
-                    if not is_duplicate:
-                        parody_data['original_title'] = article['title']
-                        parody_data['original_link'] = article['url']
-                        parody_data['text'] = article.get('text', '')  # 원문 추가
-                        
-                        parody_results.append(parody_data)
-                        existing_titles.append(current_title)
-                        
-                        # 패턴 추적 및 카운터 업데이트
-                        if any(ending in current_title for ending in ['까?', '나?', '을까?', '는가?', '다니?', '라니?']):
-                            pattern_counter['question'] += 1
-                        elif any(ending in current_title for ending in ['네', '구나', '어', '야', '지']):
-                            pattern_counter['exclamation'] += 1
-                        elif any(ending in current_title for ending in ['다', '군', '겠어']):
-                            pattern_counter['statement'] += 1
-                        elif any(ending in current_title for ending in ['겠네', '것 같아', '듯해', '려나']):
-                            pattern_counter['concern'] += 1
-                            
-                        logger.info(f"✅ 패러디 생성 성공 ({len(parody_results)}/{max_needed}): {current_title}")
-                        api_failures = 0
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON 파싱 실패: {e}")
-                    logger.warning(f"정리된 응답: {clean_str[:100]}...")
-                    continue
-            except Exception as e:
-                logger.error(f"패러디 생성 중 오류 발생: {e}")
-                continue
-            if len(parody_results) >= max_needed:
-                break
         # 최종 패턴 분포 출력
         logger.info(f"최종 제목 패턴 분포: {pattern_counter}")
         logger.info(f"총 {len(parody_results)}개의 다양한 패러디를 생성했습니다.")
 
+        # 사용한 기사를 기록해 다음 날부터는 후보에서 제외
+        try:
+            for p_data in parody_results:
+                seen_filter.record(p_data.get('original_link', ''), p_data.get('original_title', ''))
+            seen_filter.save()
+        except OSError as e:
+            logger.warning(f"사용한 기사 기록 저장 실패: {e}")
+
         # 5. 구글 시트에 결과 저장
         logger.info("생성된 패러디 결과를 구글 시트에 저장 중...")
         try:
             g_client = get_gspread_client()
-            save_results_to_gsheet(g_client, parody_results, config['패러디결과_스프레드시트_ID'], WRITE_SHEET_NAME)
+            # 시트 저장까지 끝났으면 저널을 닫음 (실패하면 다음 실행이 저널의 결과로 바로 다시 저장)
+            if save_results_to_gsheet(g_client, parody_results, config['패러디결과_스프레드시트_ID'], WRITE_SHEET_NAME):
+                if journal.pending_batches:
+                    # 결과를 받지 못한 배치가 있으면 저널을 닫지 않아야 재실행이 그 배치를 이어서 확인함
+                    logger.warning(f"결과를 받지 못한 배치가 있어 실행 저널을 열어 둡니다: "
+                                   f"{', '.join(journal.pending_batches)}")
+                else:
+                    journal.complete(len(parody_results))
         except Exception as e:
             logger.error(f"구글 인증 또는 시트 저장에 실패했습니다: {e}")
 
@@ -1263,7 +2247,21 @@ def main():
             logger.error(f"구글 독스 파일 저장에 실패했습니다: {e}")
 
         # 6. 캐시 통계 출력
-        logger.info(f"캐시 통계: 히트 {_cache_hits}회, 미스 {_cache_misses}회")
+        logger.info(f"캐시 통계: 히트 {_cache_hits}회 (본문 없음 {_article_cache.negative_hits}회 포함), 미스 {_cache_misses}회")
+        if _summary_policy is not None:
+            _summary_policy.log_stats()
+        init_article_fetcher().log_stats()
+        init_http_client().log_stats()
+        _extract_rules.log_stats()
+        try:
+            _extract_rules.save()
+        except OSError as e:
+            logger.warning(f"추출 규칙 저장 실패: {e}")
+        _response_cache.log_stats()
+        init_claude_gateway().log_stats()
+        _prompt_profiler.log_report()
+        _output_budget.log_stats(parody_max_tokens_ceiling(1))
+        _parody_validator.log_stats(_usage_tracker.summary()['calls'], len(parody_results))
 
     except KeyboardInterrupt:
         logger.info("사용자에 의해 프로그램이 중단되었습니다.")
@@ -1287,4 +2285,5 @@ def main():
     print("="*50)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    main(refresh=args.refresh, restart=args.restart) 
\ No newline at end of file
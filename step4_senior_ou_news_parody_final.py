@@ -3,6 +3,34 @@ import sys
 import os
 from datetime import datetime
 
+CONFIG_PATH = os.path.join('asset', 'rawdata.txt')
+DEFAULT_STEP_TIMEOUT = 300  # 단계별 제한 시간(초)
+DEFAULT_BATCH_STEP_TIMEOUT_MINUTES = 60  # 배치 모드 step1 제한 시간(분, 배치 결과 대기 포함)
+
+def read_config_value(key, default=None):
+    """asset/rawdata.txt에서 '키: 값' 한 줄을 읽습니다. 없으면 default"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('#') or ':' not in line:
+                    continue
+                k, value = line.split(':', 1)
+                if k.strip() == key:
+                    return value.strip()
+    except OSError:
+        pass
+    return default
+
+def step_timeout(script_name):
+    """스크립트별 제한 시간(초): 배치 모드의 step1은 배치를 기다려야 하므로 '배치_제한시간_분'을 사용"""
+    if script_name.startswith('step1_') and read_config_value('패러디_생성모드', '').lower() == 'batch':
+        try:
+            return int(float(read_config_value('배치_제한시간_분', DEFAULT_BATCH_STEP_TIMEOUT_MINUTES)) * 60)
+        except ValueError:
+            return DEFAULT_BATCH_STEP_TIMEOUT_MINUTES * 60
+    return DEFAULT_STEP_TIMEOUT
+
 def print_progress_bar(step_num, total_steps):
     bar_length = 30
     filled_length = int(round(bar_length * step_num / float(total_steps)))
@@ -17,10 +45,13 @@ def run_script(script_name, step_num=None, total_steps=None):
     if not os.path.exists(script_name):
         print(f"❌ [오류] 스크립트 파일을 찾을 수 없습니다: {script_name}")
         return False
+    timeout = step_timeout(script_name)
     try:
         env = os.environ.copy()
         env['PYTHONIOENCODING'] = 'utf-8'
         env['PYTHONUNBUFFERED'] = '1'
+        # 스크립트가 제한 시간 안에 끝나도록 남은 시간을 알려줌 (step1 배치 대기 등)
+        env['STEP_TIMEOUT_SECONDS'] = str(timeout)
         process = subprocess.Popen(
             [sys.executable, script_name],
             stdout=subprocess.PIPE,
@@ -32,7 +63,7 @@ def run_script(script_name, step_num=None, total_steps=None):
         )
         print(f"✅ 프로세스 시작됨 (PID: {process.pid})")
         
-        stdout, stderr = process.communicate(timeout=300)
+        stdout, stderr = process.communicate(timeout=timeout)
         
         if stdout:
             lines = stdout.strip().split('\n')
@@ -56,7 +87,7 @@ def run_script(script_name, step_num=None, total_steps=None):
         return True
         
     except subprocess.TimeoutExpired:
-        print(f"\n⏰ [타임아웃] {script_name} (5분 초과)")
+        print(f"\n⏰ [타임아웃] {script_name} ({timeout // 60}분 초과)")
         process.kill()
         return False
     except Exception as e:
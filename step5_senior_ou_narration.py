@@ -2,10 +2,9 @@ import os
 import pandas as pd
 from common_utils import get_gspread_client, get_kst_now
 from pathlib import Path
-from anthropic import Anthropic
 from dotenv import load_dotenv
-import time
-from difflib import SequenceMatcher
+from near_duplicate import NearDuplicateIndex
+from llm_gateway import get_gateway
 
 # 환경 변수 로드
 load_dotenv()
@@ -54,14 +53,22 @@ def get_today_news_rows():
         raise ValueError('오늘 날짜에 해당하는 뉴스 데이터가 없습니다.')
     return df_today.reset_index(drop=True)
 
-# 중복 뉴스 필터링 (유사도 0.85 이상이면 중복)
-def is_duplicate(row, prev_rows):
-    for prev in prev_rows:
-        for field in ['ou_title', 'original_title', 'latte', 'ou_think']:
-            if SequenceMatcher(None, str(row[field]), str(prev[field])).ratio() >= 0.85:
-                return True
+DUPLICATE_FIELDS = ['ou_title', 'original_title', 'latte', 'ou_think']
+
+# 중복 뉴스 필터링 (필드별 유사 문장 색인, 유사도 0.85 이상이면 중복)
+def make_duplicate_indexes():
+    return {field: NearDuplicateIndex() for field in DUPLICATE_FIELDS}
+
+def is_duplicate(row, indexes):
+    for field in DUPLICATE_FIELDS:
+        if indexes[field].has_similar(str(row[field]), 0.85, inclusive=True):
+            return True
     return False
 
+def add_to_duplicate_indexes(row, indexes):
+    for field in DUPLICATE_FIELDS:
+        indexes[field].add(str(row[field]))
+
 # 압축형 프롬프트 생성 (번호, 마무리 지시 포함, 라떼는말이죠)
 def make_compact_prompt(news, idx, total):
     news_num = f"첫번째뉴스패러디" if idx == 0 else f"{idx+1}번째뉴스패러디"
@@ -91,44 +98,34 @@ ou_think: {news['ou_think']}{article_section}"""
 
 # Claude 3.5 Sonnet 호출
 def call_claude(prompt):
-    client = Anthropic(api_key=CLAUDE_API_KEY)
-    for _ in range(3):
-        try:
-            response = client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=1200,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            if response.content:
-                first = response.content[0]
-                # dict이고 'text' 키가 있으면 반환, 아니면 str로 변환
-                if isinstance(first, dict) and 'text' in first:
-                    return first['text']
-                else:
-                    return str(first)
-            return ""
-        except Exception as e:
-            print(f"Claude API 오류, 재시도: {e}")
-            time.sleep(3)
-    return ""
+    """공용 Claude 게이트웨이로 나레이션을 생성합니다. (재시도/속도 제한은 게이트웨이가 처리)"""
+    try:
+        return get_gateway(api_key=CLAUDE_API_KEY).generate(
+            prompt,
+            model="claude-3-5-sonnet-20240620",
+            max_tokens=1200,
+            temperature=0.7,
+        )
+    except Exception as e:
+        print(f"Claude API 오류: {e}")
+        return ""
 
 # 메인 실행
 def main():
     df_today = get_today_news_rows()
     narrations = []
-    prev_rows = []
+    duplicate_indexes = make_duplicate_indexes()
     total = 0
     for idx, row in df_today.iterrows():
         if total >= 20:
             break
-        if is_duplicate(row, prev_rows):
+        if is_duplicate(row, duplicate_indexes):
             continue
         print(f"[{total+1}/20] 뉴스 내레이션 생성 중...")
         prompt = make_compact_prompt(row, total, 20)
         narration = call_claude(prompt)
         narrations.append(narration.strip())
-        prev_rows.append(row)
+        add_to_duplicate_indexes(row, duplicate_indexes)
         total += 1
     full_narration = "\n\n".join(narrations)
     with open(NARRATION_OUT_PATH, 'w', encoding='utf-8') as f:
@@ -0,0 +1,23 @@
+"""테스트에서 저장소 루트의 utils 패키지와 step 스크립트를 import할 수 있도록 경로를 추가합니다."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class FakeClock:
+    """time 모듈 대신 주입하는 시계. advance()로 시간을 앞으로 보냅니다."""
+
+    def __init__(self, now: float = 1_800_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    monotonic = time
+
+    def advance(self, seconds: float):
+        self.now += seconds
@@ -0,0 +1,83 @@
+"""utils.article_cache: URL 정규화, TTL(일반/negative), LRU 삭제"""
+
+from datetime import datetime
+
+import pytest
+
+from conftest import FakeClock
+from utils import article_cache
+from utils.article_cache import ArticleCache, canonical_url
+
+ARTICLE = {'title': '국민연금 개혁안 통과', 'text': '본문', 'publish_date': datetime(2026, 3, 9, 7, 30)}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(article_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ArticleCache(tmp_path / 'articles.sqlite', ttl_seconds=100, negative_ttl_seconds=10, max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_canonical_url():
+    assert canonical_url('HTTPS://News.Example.com/a/?utm_source=x&b=2&a=1&input=1195m#top') == \
+        'https://news.example.com/a?a=1&b=2'
+    assert canonical_url('') == ''
+
+
+def test_round_trip_with_canonical_url(cache):
+    assert cache.get('https://example.com/a') is ArticleCache.MISS
+    cache.put('https://example.com/a?utm_medium=rss', ARTICLE)
+    assert cache.get('https://example.com/a/') == ARTICLE
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_expiry(cache, clock):
+    cache.put('https://example.com/a', ARTICLE)
+    cache.put('https://example.com/missing', None)
+    clock.advance(11)
+    assert cache.get('https://example.com/missing') is ArticleCache.MISS   # negative TTL 10초
+    assert cache.get('https://example.com/a') == ARTICLE
+    clock.advance(90)
+    assert cache.get('https://example.com/a') is ArticleCache.MISS
+
+
+def test_negative_entry(cache):
+    cache.put('https://example.com/missing', None)
+    assert cache.get('https://example.com/missing') is None
+    assert cache.negative_hits == 1
+
+
+def test_purge_expired(cache, clock):
+    cache.put('https://example.com/a', ARTICLE)
+    cache.put('https://example.com/missing', None)
+    clock.advance(50)
+    assert cache.purge_expired() == 1
+    assert cache.get('https://example.com/a') == ARTICLE
+
+
+def test_lru_eviction(cache, clock):
+    for name in 'abc':
+        cache.put(f'https://example.com/{name}', ARTICLE)
+        clock.advance(1)
+    cache.get('https://example.com/a')     # a를 최근 사용으로 갱신
+    clock.advance(1)
+    cache.put('https://example.com/d', ARTICLE)
+    assert cache.get('https://example.com/b') is ArticleCache.MISS
+    for name in 'acd':
+        assert cache.get(f'https://example.com/{name}') == ARTICLE
+
+
+def test_persists_across_instances(tmp_path, clock):
+    first = ArticleCache(tmp_path / 'articles.sqlite')
+    first.put('https://example.com/a', ARTICLE)
+    first.close()
+    second = ArticleCache(tmp_path / 'articles.sqlite')
+    assert second.get('https://example.com/a') == ARTICLE
+    second.close()
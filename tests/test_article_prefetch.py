@@ -0,0 +1,119 @@
+"""utils.article_prefetch: 순위마다 한 번씩 내보내기, 큐 크기 제한, 중단과 통계"""
+
+import threading
+import time
+
+from utils.article_prefetch import ArticlePrefetcher
+
+
+def _news(count):
+    return [{'link': f'https://www.yna.co.kr/view/{i}', 'title': f'기사 {i}'} for i in range(count)]
+
+
+def _article(url):
+    return {'url': url, 'text': f'{url} 본문'}
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _drain(prefetcher):
+    items = []
+    while not prefetcher.exhausted:
+        item = prefetcher.get(timeout=2.0)
+        assert item is not None
+        items.append(item)
+    return items
+
+
+def test_every_rank_is_emitted_once():
+    news = _news(20)
+    prefetcher = ArticlePrefetcher(_article, news, workers=4, queue_size=3).start()
+    try:
+        items = _drain(prefetcher)
+    finally:
+        prefetcher.stop()
+
+    assert sorted(rank for rank, _, _ in items) == list(range(20))
+    for rank, entry, article in items:
+        assert entry is news[rank]
+        assert article == _article(entry['link'])
+    assert prefetcher.get(timeout=0) is None
+    assert prefetcher.stats()['fetched'] == prefetcher.stats()['consumed'] == 20
+
+
+def test_failures_are_emitted_as_none():
+    def fetch(url):
+        if url.endswith('/1'):
+            raise RuntimeError('연결 끊김')
+        if url.endswith('/2'):
+            return {'text': ''}
+        return None if url.endswith('/3') else _article(url)
+
+    prefetcher = ArticlePrefetcher(fetch, _news(5), workers=2).start()
+    try:
+        items = {rank: article for rank, _, article in _drain(prefetcher)}
+    finally:
+        prefetcher.stop()
+
+    assert items[1] is None and items[3] is None
+    assert items[2] == {'text': ''}
+    assert items[0] == _article('https://www.yna.co.kr/view/0')
+    assert (prefetcher.fetched, prefetcher.failed) == (2, 3)
+
+
+def test_workers_do_not_run_ahead_of_queue():
+    fetched = []
+    prefetcher = ArticlePrefetcher(lambda url: fetched.append(url) or _article(url), _news(10),
+                                   workers=1, queue_size=2).start()
+    try:
+        # 큐 2칸 + 넣으려고 기다리는 1건까지만 내려받음
+        assert _wait_until(lambda: len(fetched) == 3)
+        time.sleep(0.1)
+        assert len(fetched) == 3
+
+        assert prefetcher.get(timeout=1.0)[0] == 0
+        assert _wait_until(lambda: len(fetched) == 4)
+    finally:
+        prefetcher.stop()
+    assert prefetcher.max_depth == 2
+
+
+def test_get_without_waiting_and_stall_time():
+    release = threading.Event()
+
+    def fetch(url):
+        release.wait(2.0)
+        return _article(url)
+
+    prefetcher = ArticlePrefetcher(fetch, _news(1), workers=1).start()
+    try:
+        assert prefetcher.get(timeout=0) is None
+        assert prefetcher.get(timeout=0.05) is None
+        release.set()
+        assert prefetcher.get()[0] == 0
+    finally:
+        prefetcher.stop()
+    assert prefetcher.exhausted
+    assert prefetcher.stats()['stall_seconds'] >= 0.05
+
+
+def test_stop_ends_workers_blocked_on_full_queue():
+    prefetcher = ArticlePrefetcher(_article, _news(10), workers=2, queue_size=1).start()
+    assert _wait_until(lambda: prefetcher.fetched >= 2)
+    prefetcher.stop()
+    assert not any(thread.is_alive() for thread in prefetcher._threads)
+    assert prefetcher.fetched < 10
+
+
+def test_empty_list_starts_no_workers():
+    prefetcher = ArticlePrefetcher(_article, [], workers=4).start()
+    assert prefetcher.exhausted
+    assert prefetcher.get() is None
+    prefetcher.stop()
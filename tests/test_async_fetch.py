@@ -0,0 +1,244 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from utils import async_fetch
+from utils.async_fetch import AsyncArticleFetcher, ContainerEndDetector, decode_html
+
+ARTICLE_URL = 'https://www.yna.co.kr/view/AKR20260310000100001'
+
+
+def _parse(url, html):
+    return {'url': url, 'html': html}
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """재시도 대기(0.5초 × 지터)를 0으로"""
+    monkeypatch.setattr(async_fetch, 'random', SimpleNamespace(uniform=lambda a, b: 0.0))
+
+
+def _engine(handler, **kwargs):
+    def factory(timeout):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=timeout)
+    kwargs.setdefault('min_interval', 0.0)
+    return AsyncArticleFetcher(_parse, client_factory=factory, **kwargs)
+
+
+@pytest.mark.parametrize('stream', [True, False])
+def test_fetch_returns_parsed_html(stream):
+    engine = _engine(lambda request: httpx.Response(200, html='<p>본문</p>'), stream=stream)
+    try:
+        article = engine.fetch(ARTICLE_URL)
+    finally:
+        engine.close()
+    assert article == {'url': ARTICLE_URL, 'html': '<p>본문</p>'}
+    assert engine.stats()['downloaded'] == 1
+
+
+@pytest.mark.parametrize('stream', [True, False])
+def test_retryable_status_is_retried(no_backoff, stream):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(503 if len(calls) == 1 else 200, html='<p>ok</p>')
+
+    engine = _engine(handler, stream=stream, max_retries=2)
+    try:
+        article = engine.fetch(ARTICLE_URL)
+    finally:
+        engine.close()
+    assert article['html'] == '<p>ok</p>'
+    assert len(calls) == 2
+    assert engine.stats()['retries'] == 1
+
+
+def test_client_error_is_not_retried(no_backoff):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(404)
+
+    engine = _engine(handler, max_retries=3)
+    try:
+        assert engine.fetch(ARTICLE_URL) is None
+    finally:
+        engine.close()
+    assert len(calls) == 1
+    st = engine.stats()
+    assert (st['failed'], st['retries'], st['downloaded']) == (1, 0, 0)
+
+
+def test_transport_error_gives_up_after_max_retries(no_backoff):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        raise httpx.ConnectError('connection refused', request=request)
+
+    engine = _engine(handler, max_retries=2)
+    try:
+        assert engine.fetch(ARTICLE_URL) is None
+    finally:
+        engine.close()
+    assert len(calls) == 3
+    assert engine.stats()['retries'] == 2
+
+
+def test_fetch_all_keeps_url_order_and_counts_hosts():
+    urls = [f'https://www.yna.co.kr/view/{i}' for i in range(5)] + ['https://news.example.com/a']
+
+    def handler(request):
+        return httpx.Response(200, html=request.url.path)
+
+    engine = _engine(handler, per_host_connections=2)
+    try:
+        articles = engine.fetch_all(urls)
+    finally:
+        engine.close()
+    assert [a['url'] for a in articles] == urls
+    assert [a['html'] for a in articles] == ['/view/0', '/view/1', '/view/2', '/view/3', '/view/4', '/a']
+    assert engine.stats()['hosts'] == 2
+
+
+def test_parse_failure_result_is_passed_through():
+    def handler(request):
+        return httpx.Response(200, html='<p>x</p>')
+
+    def factory(timeout):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=timeout)
+
+    engine = AsyncArticleFetcher(lambda url, html: None, client_factory=factory, min_interval=0.0)
+    try:
+        assert engine.fetch(ARTICLE_URL) is None
+    finally:
+        engine.close()
+    assert engine.stats()['downloaded'] == 1
+
+
+BODY_SELECTOR = 'div.story-news'
+STORY = '<p>' + '연금 개혁안이 국회 본회의를 통과했다. ' * 10 + '</p>'
+
+
+def _chunked(chunks, served):
+    async def body():
+        for chunk in chunks:
+            served.append(chunk)
+            yield chunk
+    return body()
+
+
+def _page_chunks(story=STORY):
+    """본문 컨테이너가 셋째 조각에서 닫히고, 뒤에 관련 기사 목록이 이어지는 페이지"""
+    return [
+        '<html><head><meta charset="utf-8"><title>t</title></head><body>'.encode(),
+        f'<div class="story-news">{story}'.encode(),
+        '</div>'.encode(),
+        ('<ul class="related">' + '<li>관련 기사</li>' * 200 + '</ul>').encode(),
+        '<script>var x = 1;</script></body></html>'.encode(),
+    ]
+
+
+def _streaming_engine(chunks, served, **kwargs):
+    total = sum(len(chunk) for chunk in chunks)
+
+    def handler(request):
+        return httpx.Response(200, headers={'Content-Type': 'text/html', 'Content-Length': str(total)},
+                              content=_chunked(chunks, served))
+    return _engine(handler, **kwargs)
+
+
+def test_decode_html_prefers_header_charset():
+    body = '<meta charset="euc-kr"><p>한글</p>'.encode('utf-8')
+    assert decode_html(body, 'utf-8') == '<meta charset="euc-kr"><p>한글</p>'
+
+
+def test_decode_html_falls_back_to_meta_charset():
+    html = '<html><head><meta http-equiv="Content-Type" content="text/html; charset=euc-kr"></head><p>한글 기사</p>'
+    assert decode_html(html.encode('euc-kr')) == html
+    assert decode_html(html.encode('euc-kr'), 'no-such-charset') == html
+
+
+def test_decode_html_ignores_meta_beyond_sniff_window():
+    html = '<!--' + ' ' * 5000 + '--><meta charset="euc-kr"><p>한글</p>'
+    assert decode_html(html.encode('utf-8')) == html
+
+
+def test_decode_html_replaces_cut_multibyte_character():
+    body = '기사'.encode('utf-8')[:-1]
+    assert decode_html(body) == '기�'
+
+
+def test_streaming_uses_meta_charset_without_header():
+    html = '<html><head><meta charset="euc-kr"></head><body><p>한글 기사</p></body></html>'
+
+    def handler(request):
+        return httpx.Response(200, headers={'Content-Type': 'text/html'}, content=html.encode('euc-kr'))
+
+    engine = _engine(handler)
+    try:
+        assert engine.fetch(ARTICLE_URL)['html'] == html
+    finally:
+        engine.close()
+
+
+def test_detector_stops_when_container_closes():
+    detector = ContainerEndDetector(BODY_SELECTOR)
+    chunks = _page_chunks()
+    assert [detector.feed(chunk) for chunk in chunks[:3]] == [False, False, True]
+
+
+def test_detector_skips_short_wrapper():
+    detector = ContainerEndDetector('div[class*="story"]')
+    wrapper = '<div class="story-header"><h1>제목</h1></div>'.encode()
+    assert detector.feed(b'<html><body>' + wrapper) is False
+    assert detector.feed(f'<div class="story-news">{STORY}</div>'.encode()) is True
+
+
+def test_streaming_stops_after_body_container():
+    chunks = _page_chunks()
+    served = []
+    engine = _streaming_engine(chunks, served, end_selector=lambda url: BODY_SELECTOR)
+    try:
+        html = engine.fetch(ARTICLE_URL)['html']
+    finally:
+        engine.close()
+
+    assert len(served) == 3
+    assert html == b''.join(chunks[:3]).decode()
+    st = engine.stats()
+    assert (st['early_stops'], st['capped']) == (1, 0)
+    assert engine.bytes_skipped == len(chunks[3]) + len(chunks[4])
+
+
+def test_streaming_reads_everything_when_body_is_short():
+    chunks = _page_chunks(story='<p>짧은 안내문</p>')
+    served = []
+    engine = _streaming_engine(chunks, served, end_selector=lambda url: BODY_SELECTOR)
+    try:
+        html = engine.fetch(ARTICLE_URL)['html']
+    finally:
+        engine.close()
+
+    assert len(served) == len(chunks)
+    assert html == b''.join(chunks).decode()
+    assert (engine.early_stops, engine.bytes_skipped) == (0, 0)
+
+
+def test_streaming_caps_at_max_bytes():
+    chunks = _page_chunks()
+    served = []
+    engine = _streaming_engine(chunks, served, max_bytes=100)
+    try:
+        html = engine.fetch(ARTICLE_URL)['html']
+    finally:
+        engine.close()
+
+    assert len(html.encode()) <= 100
+    assert b''.join(chunks).decode().startswith(html.rstrip('�'))
+    assert len(served) < len(chunks)
+    assert (engine.capped, engine.early_stops) == (1, 0)
+    assert engine.bytes_skipped == sum(len(chunk) for chunk in chunks[len(served):])
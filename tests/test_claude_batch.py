@@ -0,0 +1,127 @@
+"""utils.claude_batch: 로컬 대역 서버(utils.local_batch_server)로 배치 제출/대기/결과 수집과 저널 복구"""
+
+import json
+import threading
+from datetime import date
+
+import pytest
+from anthropic import Anthropic
+
+from utils import claude_batch
+from utils.claude_batch import (BatchTimeoutError, collect_results, run_message_batch, submit_batch,
+                                wait_for_batch)
+from utils.llm_usage import UsageTracker
+from utils.local_batch_server import serve
+from utils.run_journal import RunJournal
+
+PARODY_TOOL = {'name': 'submit_parodies', 'input_schema': {'type': 'object'}}
+
+
+@pytest.fixture
+def batch_server():
+    """배치가 0.2초 뒤 끝나고 세 번째 요청마다 오류 결과를 내는 서버"""
+    servers = []
+
+    def start(delay=0.2, error_every=3):
+        server = serve(port=0, delay=delay, error_every=error_every)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        servers.append(server)
+        return Anthropic(api_key='test', base_url=f'http://127.0.0.1:{server.server_address[1]}', max_retries=0)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(custom_id, title, tool=False):
+    params = {
+        'model': 'claude-test',
+        'max_tokens': 512,
+        'system': [{'type': 'text', 'text': '시니어 패러디 지침', 'cache_control': {'type': 'ephemeral'}}],
+        'messages': [{'role': 'user', 'content': f'다음 기사를 패러디해 주세요.\n제목: {title}'}],
+    }
+    if tool:
+        params.update(tools=[PARODY_TOOL], tool_choice={'type': 'tool', 'name': PARODY_TOOL['name']})
+    return {'custom_id': custom_id, 'params': params}
+
+
+def test_run_message_batch_collects_text_tool_and_errors(batch_server):
+    client = batch_server()
+    requests = [
+        _request('rank-0001', '국민연금 개혁안 통과'),
+        _request('rank-0002', '독감 예방접종 시작', tool=True),
+        _request('rank-0003', '노인 일자리 확대'),
+    ]
+    submitted, usages, tracker = [], {}, UsageTracker()
+
+    results = run_message_batch(client, requests, poll_initial=0.05, poll_max=0.1, timeout=10,
+                                usage_tracker=tracker, usages=usages, on_submit=submitted.append)
+
+    assert len(submitted) == 1 and submitted[0].startswith('msgbatch_local_')
+    assert set(results) == {'rank-0001', 'rank-0002', 'rank-0003'}
+    assert '국민연금 개혁안 통과' in json.loads(results['rank-0001'])['ou_title']
+    # 도구 호출을 강제한 요청은 도구 인자 dict
+    assert '독감 예방접종 시작' in results['rank-0002']['parodies'][0]['ou_title']
+    assert results['rank-0003'] is None
+
+    assert set(usages) == {'rank-0001', 'rank-0002'}
+    summary = tracker.summary()
+    assert summary['calls'] == 2
+    assert (summary['cache_write_tokens'], summary['cache_read_tokens']) == (len('시니어 패러디 지침') // 2,) * 2
+
+
+def test_missing_results_are_filled_with_none(batch_server, monkeypatch):
+    client = batch_server(error_every=0)
+
+    # 결과 목록에서 한 건이 빠져도 요청한 custom_id는 모두 돌려줌
+    real_collect = claude_batch.collect_results
+    monkeypatch.setattr(claude_batch, 'collect_results',
+                        lambda *args, **kwargs: {k: v for k, v in real_collect(*args, **kwargs).items()
+                                                 if k != 'rank-0002'})
+    results = run_message_batch(client, [_request('rank-0001', '가'), _request('rank-0002', '나')],
+                                poll_initial=0.05, timeout=10)
+    assert results['rank-0002'] is None
+    assert results['rank-0001'] is not None
+
+
+def test_empty_request_list_submits_nothing(batch_server):
+    submitted = []
+    assert run_message_batch(batch_server(), [], on_submit=submitted.append) == {}
+    assert submitted == []
+
+
+def test_wait_for_batch_gives_up_at_timeout(batch_server):
+    client = batch_server(delay=60)
+    batch = submit_batch(client, [_request('rank-0001', '국민연금 개혁안 통과')])
+    with pytest.raises(BatchTimeoutError):
+        wait_for_batch(client, batch.id, poll_initial=0.05, timeout=0.2)
+
+
+def test_journaled_batch_is_collected_after_restart(batch_server, tmp_path):
+    client = batch_server(error_every=0)
+    day = date(2026, 3, 10)
+    keys = {'rank-0001': ['cache-key-1'], 'rank-0002': ['cache-key-2', 'cache-key-3']}
+
+    # 제출 직후 저널에 남기고 결과를 받기 전에 실행이 중단된 상황
+    journal = RunJournal(tmp_path, day=day)
+    batch = submit_batch(client, [_request('rank-0001', '가'), _request('rank-0002', '나')])
+    journal.record_batch_submitted(batch.id, keys)
+
+    resumed = RunJournal(tmp_path, day=day)
+    assert resumed.pending_batches == {batch.id: keys}
+    wait_for_batch(client, batch.id, poll_initial=0.05, timeout=10)
+    results = collect_results(client, batch.id)
+    assert set(results) == set(keys)
+    resumed.record_batch_collected(batch.id)
+    assert resumed.pending_batches == {}
+
+    assert RunJournal(tmp_path, day=day).pending_batches == {}
+
+
+def test_completed_run_forgets_pending_batches(tmp_path):
+    day = date(2026, 3, 10)
+    journal = RunJournal(tmp_path, day=day)
+    journal.record_batch_submitted('msgbatch_local_1', {'rank-0001': ['k']})
+    journal.complete(0)
+    assert RunJournal(tmp_path, day=day).pending_batches == {}
@@ -0,0 +1,141 @@
+"""utils.diversity_plan: 어미 패턴 판별, 프롬프트 예시와의 일치, 할당량 계획"""
+
+import ast
+import re
+
+import pytest
+
+from conftest import ROOT
+from utils.diversity_plan import (PATTERN_GUIDES, PATTERNS, DiversityPlanner, balanced_quotas,
+                                  classify_title_pattern)
+
+# 템플릿 예시의 감정 이름 -> 패턴
+EXAMPLE_LABELS = {
+    '놀라움': 'exclamation', '감탄': 'exclamation',
+    '의문': 'question',
+    '확신': 'statement', '단정': 'statement',
+    '걱정': 'concern', '우려': 'concern',
+}
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+
+
+def _system_prompt() -> str:
+    """step1을 import하지 않고(캐시 파일 생성 등 부작용 없이) PARODY_SYSTEM_PROMPT 문자열만 읽습니다."""
+    tree = ast.parse((ROOT / 'step1_senior_ou_news_parody_collection.py').read_text(encoding='utf-8'))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'PARODY_SYSTEM_PROMPT'
+                                                for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise AssertionError('PARODY_SYSTEM_PROMPT를 찾을 수 없습니다.')
+
+
+def _prompt_sections():
+    """(패턴별 어미 안내, (예시 제목, 패턴) 목록)"""
+    endings, examples = {}, []
+    pattern = None
+    for line in _system_prompt().splitlines():
+        line = line.strip()
+        heading = re.search(r'\((exclamation|question|statement|concern)\)', line)
+        if heading:
+            pattern = heading.group(1)
+        elif line.startswith('['):
+            pattern = None
+        elif pattern and line.startswith('- 예:'):
+            examples += [(title, pattern) for title in _QUOTED_RE.findall(line)]
+        elif pattern and line.startswith('- "~'):
+            endings[pattern] = _QUOTED_RE.findall(line)
+        else:
+            label = re.match(r'- (\S+): "', line)
+            if label and label.group(1) in EXAMPLE_LABELS:
+                examples += [(title, EXAMPLE_LABELS[label.group(1)]) for title in _QUOTED_RE.findall(line)]
+    return endings, examples
+
+
+PROMPT_ENDINGS, PROMPT_EXAMPLES = _prompt_sections()
+
+
+def test_prompt_has_examples_for_every_pattern():
+    assert set(PROMPT_ENDINGS) == set(PATTERNS)
+    assert {pattern for _, pattern in PROMPT_EXAMPLES} == set(PATTERNS)
+    assert len(PROMPT_EXAMPLES) >= 20
+
+
+@pytest.mark.parametrize('title, pattern', PROMPT_EXAMPLES)
+def test_prompt_examples_match_their_pattern(title, pattern):
+    assert classify_title_pattern(title) == pattern
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_prompt_endings_classify_to_their_pattern(pattern):
+    for ending in PROMPT_ENDINGS[pattern]:
+        assert classify_title_pattern('정말 그렇' + ending.lstrip('~')) == pattern, ending
+
+
+def test_prompt_endings_are_not_shared_between_patterns():
+    seen = {}
+    for pattern, endings in PROMPT_ENDINGS.items():
+        for ending in endings:
+            assert seen.setdefault(ending, pattern) == pattern, ending
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_pattern_guides_match_prompt(pattern):
+    assert re.findall(r"'(~[^']+)'", PATTERN_GUIDES[pattern]) == PROMPT_ENDINGS[pattern]
+
+
+@pytest.mark.parametrize('title, pattern', [
+    ('이게 정말 가능할까?', 'question'),
+    ('이게 맞나요?', 'question'),
+    ('요즘 세상 정말 빨라!', 'exclamation'),
+    ('정말 좋은 소식이에요', 'statement'),
+    ('"이젠 시대가 변했네"', 'exclamation'),
+    ('따라가기 힘들겠어', 'concern'),
+    ('나라 걱정이 앞서', 'concern'),
+    ('이러다 큰일 나', None),
+    ('', None),
+])
+def test_classify_title_pattern(title, pattern):
+    assert classify_title_pattern(title) == pattern
+
+
+def test_balanced_quotas():
+    assert balanced_quotas(30) == {'exclamation': 8, 'question': 8, 'statement': 7, 'concern': 7}
+    assert sum(balanced_quotas(5).values()) == 5
+    assert balanced_quotas(-1) == dict.fromkeys(PATTERNS, 0)
+
+
+def test_assign_fills_quotas_evenly():
+    planner = DiversityPlanner(8)
+    assigned = [planner.assign() for _ in range(8)]
+    assert {p: assigned.count(p) for p in PATTERNS} == planner.quotas
+    assert assigned[:4] == list(PATTERNS)  # 같은 패턴이 이어지지 않음
+    assert planner.open_slots() == 0
+
+
+def test_release_and_accept_reopen_slots():
+    planner = DiversityPlanner(4)
+    target = planner.assign()
+    planner.release(target)
+    assert planner.open_slots() == 4
+    assert planner.accept(target) == target
+    assert not planner.has_room(target)
+    assert planner.open_slots() == 3
+
+
+def test_unclassified_titles_take_any_open_slot():
+    planner = DiversityPlanner(2)
+    assert planner.has_room(None)
+    assert planner.accept(None) == 'exclamation'
+    assert planner.accept('question') == 'question'
+    assert not planner.has_room(None)
+    assert planner.accept(None) is None
+    assert planner.unclassified == 1
+
+
+def test_check_retries_only_classified_mismatches():
+    planner = DiversityPlanner(4)
+    assert planner.check('가능할까?', 'question')
+    assert not planner.check('가능하다', 'question')
+    assert planner.check('이러다 큰일 나', 'question')   # 판별 못 한 제목은 다시 요청하지 않음
+    assert planner.check('아무 제목', None)
+    assert (planner.matched, planner.mismatched) == (2, 1)
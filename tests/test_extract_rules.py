@@ -0,0 +1,101 @@
+"""utils.extract_rules: 호스트별 선택자 학습(record), 조회 순서(rules_for), 저장/복원(save)"""
+
+import json
+
+import pytest
+
+from utils.extract_rules import ExtractionRuleRegistry, rule_host
+from utils.html_extract import LxmlExtractor
+
+URL = 'https://www.yna.co.kr/view/AKR20260309000100001'
+BUILTIN = {'yna.co.kr': {'title': ['h1.tit01', 'h1.tit'], 'content': ['div.story-news']}}
+
+
+def _result(content_selector, title_selector=None, probes=1):
+    return {'content_selector': content_selector, 'title_selector': title_selector, 'probes': probes}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ExtractionRuleRegistry(tmp_path / 'rules.json', builtin=BUILTIN)
+
+
+@pytest.mark.parametrize('url, host', [
+    (URL, 'yna.co.kr'),
+    ('https://m.yna.co.kr/view/AKR1', 'yna.co.kr'),
+    ('HTTP://News.Example.com:8080/a', 'news.example.com'),
+])
+def test_rule_host(url, host):
+    assert rule_host(url) == host
+
+
+def test_rules_for_builtin_and_unknown_hosts(registry):
+    assert registry.rules_for(URL) == BUILTIN['yna.co.kr']
+    assert registry.rules_for('https://news.example.com/a') == {'title': [], 'content': []}
+    assert registry.body_selector(URL) == 'div.story-news'
+    assert registry.body_selector('https://news.example.com/a') is None
+
+
+def test_learned_rule_is_tried_first_without_duplicates(registry):
+    rules = registry.rules_for(URL)
+    registry.record(URL, rules, _result('div.article', 'h1.tit'), valid=True)
+    assert registry.rules_for(URL) == {'title': ['h1.tit', 'h1.tit01'], 'content': ['div.article', 'div.story-news']}
+    assert registry.body_selector(URL) == 'div.article'
+
+
+def test_invalid_or_selectorless_results_are_not_learned(registry):
+    url = 'https://news.example.com/a'
+    registry.record(url, {}, _result('article'), valid=False)
+    registry.record(url, {}, _result(None), valid=True)       # 문단 모음으로 찾은 본문
+    assert registry.rules_for(url) == {'title': [], 'content': []}
+    assert (registry.pages, registry.rule_hits) == (2, 0)
+
+
+def test_stats_count_rule_hits_and_probes(registry):
+    rules = registry.rules_for(URL)
+    registry.record(URL, rules, _result('div.story-news', 'h1.tit01', probes=2), valid=True)
+    registry.record(URL, rules, _result('[class*="article"]', probes=5), valid=True)
+    assert (registry.pages, registry.rule_hits, registry.probes) == (2, 1, 7)
+
+
+def test_save_and_reload(tmp_path, registry):
+    url = 'https://news.example.com/a'
+    registry.record(url, {}, _result('div.news-body', 'h2.headline'), valid=True)
+    registry.save()
+    saved = json.loads((tmp_path / 'rules.json').read_text(encoding='utf-8'))
+    assert saved['hosts']['news.example.com']['content'] == 'div.news-body'
+    assert not list(tmp_path.glob('*.tmp'))
+
+    reloaded = ExtractionRuleRegistry(tmp_path / 'rules.json', builtin={})
+    assert reloaded.rules_for(url) == {'title': ['h2.headline'], 'content': ['div.news-body']}
+
+
+def test_save_skips_unchanged_rules(tmp_path, registry):
+    registry.save()
+    assert not (tmp_path / 'rules.json').exists()
+    url = 'https://news.example.com/a'
+    registry.record(url, {}, _result('article'), valid=True)
+    registry.save()
+    (tmp_path / 'rules.json').unlink()
+    registry.record(url, registry.rules_for(url), _result('article'), valid=True)   # 같은 선택자: 저장할 것 없음
+    registry.save()
+    assert not (tmp_path / 'rules.json').exists()
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    (tmp_path / 'rules.json').write_text('{깨진 JSON', encoding='utf-8')
+    registry = ExtractionRuleRegistry(tmp_path / 'rules.json', builtin={})
+    assert registry.rules_for(URL) == {'title': [], 'content': []}
+
+
+def test_learned_rule_needs_one_probe_on_the_next_page(registry):
+    body = '연금 개혁 관련 기사 본문입니다. ' * 10
+    html = f'<h1>공통 제목</h1><div class="news-body">{body}</div>'
+    url = 'https://news.example.com/view/1'
+    extractor = LxmlExtractor()
+
+    first = extractor.extract(html, registry.rules_for(url))
+    registry.record(url, registry.rules_for(url), first, valid=True)
+    second = extractor.extract(html, registry.rules_for('https://news.example.com/view/2'))
+    assert first['probes'] > second['probes'] == 2      # 제목 1회 + 본문 1회
+    assert second['content_selector'] == first['content_selector']
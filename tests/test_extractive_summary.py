@@ -0,0 +1,88 @@
+"""utils.extractive_summary: 문장 분리, 색인어, TextRank, 예산 안의 문장 선택"""
+
+import numpy as np
+import pytest
+
+from utils.extractive_summary import (split_sentences, sentence_terms, summarize_article,
+                                      textrank_scores)
+
+TITLE = '국민연금 보험료율 13%로 인상'
+SENTENCES = [
+    '국회가 10일 본회의를 열었다.',
+    '국민연금 보험료율을 9%에서 13%로 올리는 개정안이 찬성 180표로 통과했다.',
+    '여야는 그동안 여러 차례 회의를 거듭하며 의견을 조율해 왔다.',
+    '보험료율은 내년부터 매년 0.5%포인트씩 인상된다.',
+    '회의장 밖에서는 시민들이 모여 각자의 의견을 밝혔다.',
+    '정부는 이번 개혁으로 기금 소진 시점이 2064년으로 늦춰질 것으로 내다봤다.',
+    '일부 참석자는 회의가 길어져 자리를 뜨기도 했다.',
+    '저작권자(c) 연합뉴스, 무단 전재-재배포 금지.',
+    '홍길동 기자 hong@yna.co.kr',
+]
+ARTICLE = '(서울=연합뉴스) 홍길동 기자 = ' + ' '.join(SENTENCES)
+
+
+def test_split_sentences_keeps_decimals_and_merges_fragments():
+    text = '보험료율이 0.5%포인트 오른다. 정말? 정부는 3.5조원을 투입한다고 밝혔다.'
+    assert split_sentences(text) == ['보험료율이 0.5%포인트 오른다. 정말?', '정부는 3.5조원을 투입한다고 밝혔다.']
+    assert split_sentences('') == []
+
+
+def test_split_sentences_after_korean_ending_without_space():
+    assert split_sentences('개정안이 통과됐다.정부는 환영 입장을 밝혔다.') == [
+        '개정안이 통과됐다.', '정부는 환영 입장을 밝혔다.']
+
+
+def test_sentence_terms():
+    assert sentence_terms('연금 개혁 3.5% OECD 및') == ['연금', '개혁', '3.5', 'oecd', '및']
+    assert sentence_terms('보험료율') == ['보험', '험료', '료율']
+
+
+def test_textrank_scores():
+    assert textrank_scores(np.ones((1, 3))).tolist() == [1.0]
+    # 다른 두 문장과 모두 비슷한 가운데 문장이 중심
+    vectors = np.array([[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = textrank_scores(vectors)
+    assert scores.max() == 1.0
+    assert np.argmax(scores) == 1
+    assert scores[0] == pytest.approx(scores[2])
+
+
+def test_textrank_handles_unrelated_sentences():
+    scores = textrank_scores(np.eye(3))
+    assert scores.tolist() == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_short_article_is_only_cleaned():
+    assert summarize_article('<p>국회가  개정안을 통과시켰다.</p>', budget_chars=600) == '국회가 개정안을 통과시켰다.'
+
+
+def test_summary_fits_budget_and_keeps_order():
+    summary = summarize_article(ARTICLE, title=TITLE, budget_chars=120)
+    assert 0 < len(summary) <= 120
+    picked = [s for s in SENTENCES if s in summary]
+    assert ' '.join(picked) == summary
+
+
+def test_summary_prefers_facts_and_drops_noise():
+    summary = summarize_article(ARTICLE, title=TITLE, budget_chars=150)
+    assert SENTENCES[1] in summary
+    assert not summary.startswith('(서울=연합뉴스)')
+    assert '저작권자' not in summary and '@' not in summary
+    assert SENTENCES[6] not in summary
+
+
+def test_repeated_sentences_are_used_once():
+    text = ' '.join([SENTENCES[1]] * 5 + SENTENCES[2:7])
+    summary = summarize_article(text, title=TITLE, budget_chars=200)
+    assert summary.count(SENTENCES[1]) == 1
+
+
+def test_single_long_sentence_is_truncated():
+    sentence = '국민연금 보험료율을 ' + '단계적으로 올리고 ' * 40 + '통과했다.'
+    assert summarize_article(sentence, budget_chars=50) == sentence[:50]
+
+
+def test_noise_only_article_falls_back_to_prefix():
+    text = ' '.join(['저작권자(c) 연합뉴스, 무단 전재-재배포 금지.'] * 20)
+    assert summarize_article(text, budget_chars=40) == text[:40]
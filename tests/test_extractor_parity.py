@@ -0,0 +1,66 @@
+"""저장소에 포함된 연합뉴스 기사 HTML(tests/fixtures/yna)로 lxml/soup 추출기 결과가 같은지 확인합니다.
+
+fixture는 기자 이름/이메일 등을 지운 기사 페이지이며 utils.bench_extractors run의 기본 묶음이기도 합니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from utils.bench_extractors import COMPARED_FIELDS, DEFAULT_FIXTURE_DIR, compare, load_fixtures
+from utils.extract_rules import BUILTIN_RULES
+from utils.html_extract import LxmlExtractor, SoupExtractor
+
+FIXTURES = load_fixtures(DEFAULT_FIXTURE_DIR)
+KST = timezone(timedelta(hours=9))
+
+# fixture별 기대값: (제목, 본문 시작, 발행 시각)
+EXPECTED = {
+    '01_pension_reform.html': ('국민연금 보험료율 13%로 인상…개혁안 국회 본회의 통과',
+                               '(서울=연합뉴스) 기자 = 국민연금 보험료율을', datetime(2026, 3, 9, 7, 30, 12, tzinfo=KST)),
+    '02_flu_vaccine.html': ('65세 이상 독감 예방접종 오늘부터 무료…가까운 의료기관서',
+                            '(세종=연합뉴스) 기자 = 질병관리청은', datetime(2025, 10, 15, 9, 0, tzinfo=KST)),
+    '03_empty_heading.html': ('기초연금 월 40만원으로…내년 예산안에 반영',
+                              '(세종=연합뉴스) 기자 = 정부가', datetime(2026, 8, 27, 23, 15, tzinfo=timezone.utc)),
+    '04_paragraphs_only.html': ('서울 지하철 노인 무임승차 연령 논의 재점화',
+                                '(서울=연합뉴스) 기자 = 서울 지하철의', None),
+    '05_nested_markup.html': ('"손주 돌보느라 허리 휘어요"…조부모 육아수당 도입 검토',
+                              '(대전=연합뉴스) 기자 = 맞벌이 자녀를', datetime(2026, 5, 1, 14, 5, 31, tzinfo=KST)),
+}
+RULES = {'none': None, 'builtin': BUILTIN_RULES['yna.co.kr']}
+
+
+def test_fixture_corpus_is_present():
+    assert sorted(FIXTURES) == sorted(EXPECTED)
+    assert Path(DEFAULT_FIXTURE_DIR).is_relative_to(Path(__file__).resolve().parent)
+
+
+@pytest.mark.parametrize('rules', RULES.values(), ids=list(RULES))
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_backends_agree(name, rules):
+    lxml_result = LxmlExtractor().extract(FIXTURES[name], rules)
+    soup_result = SoupExtractor().extract(FIXTURES[name], rules)
+    for field in COMPARED_FIELDS + ('title_selector', 'content_selector'):
+        assert lxml_result[field] == soup_result[field], field
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_expected_article(name):
+    title, body_start, published = EXPECTED[name]
+    result = LxmlExtractor().extract(FIXTURES[name], RULES['builtin'])
+    assert result['title'] == title
+    assert body_start in result['text'] and len(result['text']) >= 100
+    assert result['publish_date'] == published
+    # 본문 안의 스크립트/관련 기사/바깥 메뉴는 들어가지 않음
+    for noise in ('googletag', '관련 기사', '본문 바로가기', '무단 전재'):
+        assert noise not in result['text']
+
+
+def test_builtin_rule_hits_current_layout():
+    result = LxmlExtractor().extract(FIXTURES['01_pension_reform.html'], RULES['builtin'])
+    assert (result['title_selector'], result['content_selector'], result['probes']) == ('h1.tit01', 'div.story-news', 2)
+
+
+def test_bench_compare_reports_no_mismatches():
+    assert compare(FIXTURES) == 0
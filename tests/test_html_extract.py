@@ -0,0 +1,93 @@
+"""utils.html_extract: 선택자 변환, lxml/soup 추출기가 같은 규칙으로 같은 결과를 내는지"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.html_extract import (LxmlExtractor, SoupExtractor, clean_text, css_to_xpath, get_extractor,
+                                parse_meta_date, selector_matcher)
+
+EXTRACTORS = [LxmlExtractor, SoupExtractor]
+
+
+@pytest.mark.parametrize('selector, xpath', [
+    ('h1', '//h1'),
+    ('.title', "//*[contains(concat(' ', normalize-space(@class), ' '), ' title ')]"),
+    ('[class*="content"]', "//*[contains(@class, 'content')]"),
+    ('div.story-news', "//div[contains(concat(' ', normalize-space(@class), ' '), ' story-news ')]"),
+])
+def test_css_to_xpath(selector, xpath):
+    assert css_to_xpath(selector) == xpath
+
+
+def test_unsupported_selector():
+    with pytest.raises(ValueError):
+        css_to_xpath('div > p')
+    with pytest.raises(ValueError):
+        selector_matcher('a[href]')
+
+
+def test_selector_matcher():
+    matches = selector_matcher('div.story-news')
+    assert matches('div', 'story-news article')
+    assert not matches('div', 'story-newsletter')
+    assert not matches('section', 'story-news')
+
+
+@pytest.mark.parametrize('html, title', [
+    # 빈 <h1>은 없는 것으로 보고 다음 선택자(.title)로 넘어감
+    ('<title>T</title><body><h1></h1><div class="title">Real Title</div></body>', 'Real Title'),
+    ('<title>T</title><body><h1>  </h1></body>', 'T'),                # 공백만 있는 요소는 선택되지만 제목이 비어 <title> 사용
+    ('<title>T</title><body><h1><span>제목</span></h1></body>', '제목'),
+    ('<body><p>본문</p></body>', '제목 없음'),
+])
+@pytest.mark.parametrize('extractor_cls', EXTRACTORS)
+def test_empty_elements_are_skipped_the_same_way(extractor_cls, html, title):
+    assert extractor_cls().extract(html)['title'] == title
+
+
+@pytest.mark.parametrize('extractor_cls', EXTRACTORS)
+def test_rules_first_and_noise_removed(extractor_cls):
+    body = '오늘 발표된 내용입니다. ' * 10
+    html = (f'<h1>기본 제목</h1><div class="news-body"><script>var x = 1;</script>{body}'
+            f'<aside>관련 기사</aside></div><div class="content">짧음</div>')
+    result = extractor_cls().extract(html, {'title': ['h2'], 'content': ['div.news-body']})
+    assert result['title'] == '기본 제목' and result['title_selector'] == 'h1'
+    assert result['text'] == body.strip()
+    assert result['content_selector'] == 'div.news-body'
+    assert result['probes'] == 3
+
+
+@pytest.mark.parametrize('extractor_cls', EXTRACTORS)
+def test_short_rule_body_falls_back_to_default_selectors(extractor_cls):
+    html = '<h1>제목</h1><div class="story">짧음</div><article>' + '기사 본문. ' * 20 + '</article>'
+    result = extractor_cls().extract(html, {'content': ['div.story']})
+    assert result['content_selector'] == 'article'
+
+
+def test_get_extractor_falls_back_to_soup():
+    assert get_extractor('lxml').name == 'lxml'
+    assert get_extractor('soup').name == 'soup'
+    assert get_extractor('unknown').name == 'lxml'
+
+
+def test_clean_text():
+    assert clean_text('\n  첫 줄\t 이어짐  \n\n   \n 둘째 줄 ') == '첫 줄 이어짐\n둘째 줄'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-03-09T07:30:12Z', datetime(2026, 3, 9, 7, 30, 12, tzinfo=timezone.utc)),
+    ('2026-03-09', datetime(2026, 3, 9)),
+    ('어제', None),
+    (None, None),
+])
+def test_parse_meta_date(value, expected):
+    assert parse_meta_date(value) == expected
+
+
+@pytest.mark.parametrize('extractor_cls', EXTRACTORS)
+def test_publish_date_from_meta(extractor_cls):
+    html = ('<head><meta name="pubdate" content="2026-01-02T03:04:05+09:00">'
+            '<meta property="article:published_time" content="잘못된 값"></head><h1>제목</h1>')
+    assert extractor_cls().extract(html)['publish_date'].isoformat() == '2026-01-02T03:04:05+09:00'
+    assert extractor_cls().extract('<h1>제목</h1>')['publish_date'] is None
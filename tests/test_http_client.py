@@ -0,0 +1,232 @@
+"""utils.http_client: DNS 캐시, 캐시를 거치는 네트워크 계층, 공용 클라이언트 통계"""
+
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpcore
+import httpx
+import pytest
+
+from conftest import FakeClock
+from utils import http_client
+from utils.http_client import DnsCache, SharedHttpClient, _AsyncCachingBackend, _CachingBackend
+
+HOST = 'www.yna.co.kr'
+
+
+def _addrinfo(address):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, 443))]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http_client, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """socket.getaddrinfo 대신 호출 횟수를 세는 조회 함수"""
+    calls = []
+
+    def getaddrinfo(host, port, type=0):
+        calls.append((host, port))
+        if host.endswith('.invalid'):
+            raise socket.gaierror('Name or service not known')
+        return _addrinfo('203.0.113.10')
+    monkeypatch.setattr(http_client.socket, 'getaddrinfo', getaddrinfo)
+    return calls
+
+
+def test_dns_cache_reuses_address_until_ttl(clock, resolver):
+    cache = DnsCache(ttl=300)
+    assert cache.resolve(HOST, 443) == '203.0.113.10'
+    clock.advance(299)
+    assert cache.resolve(HOST, 443) == '203.0.113.10'
+    assert len(resolver) == 1
+    clock.advance(2)
+    cache.resolve(HOST, 443)
+    assert len(resolver) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_dns_cache_keys_by_port_and_skips_ip_addresses(clock, resolver):
+    cache = DnsCache()
+    cache.resolve(HOST, 443)
+    cache.resolve(HOST, 80)
+    assert cache.resolve('127.0.0.1', 80) == '127.0.0.1'
+    assert cache.resolve('::1', 80) == '::1'
+    assert resolver == [(HOST, 443), (HOST, 80)]
+
+
+def test_dns_cache_does_not_store_failures(clock, resolver):
+    cache = DnsCache()
+    for _ in range(2):
+        with pytest.raises(OSError):
+            cache.resolve('news.invalid', 443)
+    assert len(resolver) == 2
+    assert cache.lookup('news.invalid', 443) is None
+
+
+def test_dns_cache_evicts_least_recently_used(clock):
+    cache = DnsCache(max_entries=2)
+    cache.store('a.example', 443, _addrinfo('192.0.2.1'))
+    cache.store('b.example', 443, _addrinfo('192.0.2.2'))
+    assert cache.lookup('a.example', 443) == '192.0.2.1'
+    cache.store('c.example', 443, _addrinfo('192.0.2.3'))
+    assert cache.lookup('b.example', 443) is None
+    assert cache.lookup('a.example', 443) == '192.0.2.1'
+    cache.forget('a.example', 443)
+    assert cache.lookup('a.example', 443) is None
+
+
+class RecordingBackend:
+    """연결 대상만 기록하고, fail에 든 주소로는 연결에 실패하는 네트워크 계층"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.connected = []
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.connected.append(host)
+        if host in self.fail:
+            raise httpcore.ConnectError(f'cannot connect to {host}')
+        return host
+
+
+class AsyncRecordingBackend(RecordingBackend):
+    async def connect_tcp(self, *args, **kwargs):
+        return RecordingBackend.connect_tcp(self, *args, **kwargs)
+
+
+def test_caching_backend_connects_to_cached_address(clock, resolver):
+    inner = RecordingBackend()
+    backend = _CachingBackend(inner, DnsCache())
+    backend.connect_tcp(HOST, 443)
+    backend.connect_tcp(HOST, 443)
+    assert inner.connected == ['203.0.113.10', '203.0.113.10']
+    assert len(resolver) == 1
+
+
+def test_caching_backend_retries_by_name_when_cached_address_fails(clock, resolver):
+    cache = DnsCache()
+    inner = RecordingBackend(fail={'203.0.113.10'})
+    backend = _CachingBackend(inner, cache)
+    assert backend.connect_tcp(HOST, 443) == HOST
+    assert inner.connected == ['203.0.113.10', HOST]
+    assert cache.lookup(HOST, 443) is None
+
+
+def test_caching_backend_lets_lookup_failure_surface_as_connect_error(clock, resolver):
+    inner = RecordingBackend(fail={'news.invalid'})
+    with pytest.raises(httpcore.ConnectError):
+        _CachingBackend(inner, DnsCache()).connect_tcp('news.invalid', 443)
+    assert inner.connected == ['news.invalid']
+
+
+def test_async_caching_backend(clock, monkeypatch):
+    lookups = []
+
+    async def getaddrinfo(host, port, type=0):
+        lookups.append(host)
+        return _addrinfo('203.0.113.10')
+
+    async def run():
+        monkeypatch.setattr(asyncio.get_running_loop(), 'getaddrinfo', getaddrinfo)
+        cache = DnsCache()
+        inner = AsyncRecordingBackend(fail={'203.0.113.10'})
+        backend = _AsyncCachingBackend(inner, cache)
+        assert await backend.connect_tcp(HOST, 443) == HOST
+        return inner.connected, cache
+
+    connected, cache = asyncio.run(run())
+    assert connected == ['203.0.113.10', HOST]
+    assert lookups == [HOST]
+    assert cache.lookup(HOST, 443) is None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status = 404 if self.path == '/missing' else 200
+        body = b'<rss></rss>'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_shared_client_reuses_connection_and_counts(local_server):
+    http = SharedHttpClient(http2=False)
+    try:
+        assert http.get(f'{local_server}/rss').status_code == 200
+        assert http.get(f'{local_server}/rss').status_code == 200
+        assert http.get(f'{local_server}/missing').status_code == 404
+    finally:
+        http.close()
+
+    st = http.stats()
+    assert (st['requests'], st['connections']) == (3, 1)
+    assert (st['dns_misses'], st['dns_hits']) == (1, 0)
+    assert st['hosts']['localhost'] == {'requests': 3, 'connections': 1, 'errors': 1,
+                                        'versions': {'HTTP/1.1': 3}}
+
+
+def test_shared_client_without_dns_cache(local_server):
+    http = SharedHttpClient(http2=False, dns_ttl=0)
+    try:
+        assert http.get(f'{local_server}/rss').status_code == 200
+    finally:
+        http.close()
+    assert http.dns_cache is None
+    assert (http.stats()['dns_hits'], http.stats()['dns_misses']) == (0, 0)
+
+
+def test_async_client_shares_metrics(local_server):
+    http = SharedHttpClient(http2=False)
+
+    async def run():
+        async with http.async_client(timeout=5.0) as client:
+            for _ in range(2):
+                assert (await client.get(f'{local_server}/article')).status_code == 200
+
+    try:
+        asyncio.run(run())
+    finally:
+        http.close()
+    host = http.stats()['hosts']['localhost']
+    assert (host['requests'], host['connections']) == (2, 1)
+    assert http.dns_cache.misses == 1
+
+
+def test_async_client_keeps_injected_transport():
+    http = SharedHttpClient(http2=False)
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+    async def run():
+        async with http.async_client(transport=transport) as client:
+            return (await client.get('https://www.yna.co.kr/view/1')).status_code
+
+    try:
+        assert asyncio.run(run()) == 503
+    finally:
+        http.close()
+    assert http.stats()['hosts'][HOST]['errors'] == 1
+    assert http.stats()['dns_misses'] == 0
@@ -0,0 +1,60 @@
+"""utils.json_stream.JsonStreamScanner: 조각 경계, 설명 속 괄호, 최상위 배열/객체"""
+
+import json
+
+import pytest
+
+from utils.json_stream import JsonStreamScanner
+
+ITEMS = [{'id': 1, 'ou_title': '연금이 또 바뀐다네', 'latte': '괄호 "[참고]"와 {중괄호}는 문자열'},
+         {'id': 2, 'ou_title': '이게 정말 가능할까?', 'latte': '이스케이프 \\" 따옴표'}]
+ARRAY_REPLY = (
+    '[참고] 요청하신 패러디입니다. 기사 [1]과 [ 2 ]를 {순서대로} 작성했어요.\n'
+    '```json\n' + json.dumps(ITEMS, ensure_ascii=False, indent=2) + '\n```\n끝에 붙은 설명 [{"id": 9}]'
+)
+
+
+def _scan(text, size):
+    scanner = JsonStreamScanner()
+    for i in range(0, len(text), size):
+        scanner.feed(text[i:i + size])
+    return scanner
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, len(ARRAY_REPLY)])
+def test_array_after_prose_with_brackets(size):
+    scanner = _scan(ARRAY_REPLY, size)
+    assert scanner.objects == ITEMS
+    assert scanner.closed          # 뒤의 설명 속 배열은 읽지 않음
+
+
+@pytest.mark.parametrize('size', [1, 5, 1000])
+def test_single_object(size):
+    scanner = _scan('응답: {"ou_title": "제목", "id": 1} 이상입니다.', size)
+    assert scanner.objects == [{'ou_title': '제목', 'id': 1}]
+    assert scanner.closed
+
+
+def test_not_closed_until_an_object_is_found():
+    scanner = JsonStreamScanner()
+    scanner.feed('[참고] 설명 {잘못된 값} 그리고 [')
+    assert not scanner.closed and scanner.objects == []
+    assert scanner.feed(' {"id": 1}') == [{'id': 1}]
+    assert not scanner.closed      # 배열이 아직 닫히지 않음
+    scanner.feed(']')
+    assert scanner.closed
+
+
+def test_feed_returns_only_new_objects():
+    scanner = JsonStreamScanner()
+    text = json.dumps(ITEMS, ensure_ascii=False)
+    middle = text.index('}, {') + 1
+    assert scanner.feed(text[:middle]) == ITEMS[:1]
+    assert scanner.feed(text[middle:]) == ITEMS[1:]
+    assert scanner.objects == ITEMS
+
+
+def test_invalid_element_is_skipped():
+    scanner = _scan('[{"id": 1,}, {"id": 2}]', 4)
+    assert scanner.objects == [{'id': 2}]
+    assert scanner.closed
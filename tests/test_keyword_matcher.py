@@ -0,0 +1,41 @@
+"""utils.keyword_matcher: 기존 부분 문자열 점수 계산과의 동등성, 경계 규칙"""
+
+import pytest
+
+from utils.keyword_matcher import KeywordMatcher, _synthetic_titles, naive_score
+from utils.news_ranking import KEYWORD_WEIGHTS
+
+
+def test_score_matches_naive_on_synthetic_titles():
+    matcher = KeywordMatcher(KEYWORD_WEIGHTS)
+    for title in _synthetic_titles(list(KEYWORD_WEIGHTS), 5000, seed=7):
+        assert matcher.score(title) == naive_score(KEYWORD_WEIGHTS, title), title
+
+
+@pytest.mark.parametrize('weights, text', [
+    ({'he': 1, 'she': 2, 'his': 3, 'hers': 4}, 'ushers'),   # 겹치는 키워드, 실패 링크 출력
+    ({'연금': 2, '국민연금': 3, '기초연금': 1}, '국민연금과 기초연금 개편'),
+    ({'암': 2, '건강': 1}, '암 암 암 건강'),                # 여러 번 등장해도 한 번만 더함
+    ({'AI': 1.5}, ''),                                      # 빈 문자열
+    ({'a': 0.1, 'b': 0.2, 'c': 0.3}, 'cab'),                 # 부동소수 합산 순서
+])
+def test_score_matches_naive_on_edge_cases(weights, text):
+    assert KeywordMatcher(weights).score(text) == naive_score(weights, text)
+
+
+def test_matches_lists_keywords_in_dictionary_order():
+    matcher = KeywordMatcher({'연금': 1, '국민연금': 2, '개편': 1})
+    assert matcher.matches('국민연금 개편') == ['연금', '국민연금', '개편']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('폐암 조기 발견', ['암']),
+    ('암이 재발', ['암']),
+    ('암호화폐 급락', []),
+    ('AI 돌봄 로봇', ['AI']),
+    ('OpenAI 발표', []),
+    ('AI로봇', ['AI']),
+])
+def test_korean_boundaries(text, expected):
+    matcher = KeywordMatcher({'암': 2, 'AI': 1}, korean_boundaries=True)
+    assert matcher.matches(text) == expected
@@ -0,0 +1,127 @@
+"""utils.llm_gateway: Retry-After 헤더 해석, 429/529/5xx 재시도와 백오프"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from anthropic import Anthropic, APIConnectionError, APIStatusError, RateLimitError
+
+from utils import llm_gateway
+from utils.llm_gateway import (BACKOFF_BASE, DEFAULT_MAX_RETRIES, LLMGateway, is_retryable,
+                               retry_after_seconds)
+
+REQUEST = httpx.Request('POST', 'https://api.anthropic.com/v1/messages')
+
+
+def _rate_limit_error(headers):
+    response = httpx.Response(429, headers=headers, request=REQUEST)
+    return RateLimitError('rate limited', response=response, body=None)
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'retry-after': '7'}, 7.0),
+    ({'retry-after': '1.5'}, 1.5),
+    ({'retry-after-ms': '2500', 'retry-after': '9'}, 2.5),    # 밀리초 값 우선
+    ({'retry-after-ms': 'soon', 'retry-after': '9'}, 9.0),    # 잘못된 밀리초 값은 무시
+    ({}, None),
+    ({'retry-after': 'not a date'}, None),
+])
+def test_header_values(headers, expected):
+    assert retry_after_seconds(_rate_limit_error(headers)) == expected
+
+
+def test_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = retry_after_seconds(_rate_limit_error({'retry-after': format_datetime(when, usegmt=True)}))
+    assert 27 <= seconds <= 30
+
+
+def test_past_http_date_is_zero():
+    when = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert retry_after_seconds(_rate_limit_error({'retry-after': format_datetime(when, usegmt=True)})) == 0.0
+
+
+def test_errors_without_response():
+    assert retry_after_seconds(APIConnectionError(request=REQUEST)) is None
+    assert retry_after_seconds(ValueError('boom')) is None
+
+
+MESSAGE = {
+    'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'claude-test',
+    'content': [{'type': 'text', 'text': '안녕하세요'}], 'stop_reason': 'end_turn', 'stop_sequence': None,
+    'usage': {'input_tokens': 12, 'output_tokens': 5},
+}
+
+
+class SleepClock:
+    """time 모듈 대신 주입: sleep()은 기다리지 않고 기록한 뒤 시계를 그만큼 앞으로 보냄"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _gateway(monkeypatch, statuses, max_retries=DEFAULT_MAX_RETRIES):
+    """statuses 순서대로 응답하는 MockTransport를 붙인 게이트웨이와 (호출 기록, 대기 기록)"""
+    calls, clock = [], SleepClock()
+    replies = iter(statuses)
+
+    def handler(request):
+        calls.append(request)
+        status, headers = next(replies)
+        if status == 200:
+            return httpx.Response(200, json=MESSAGE)
+        return httpx.Response(status, headers=headers,
+                              json={'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'busy'}})
+
+    monkeypatch.setattr(llm_gateway, 'time', clock)
+    monkeypatch.setattr(llm_gateway.random, 'uniform', lambda low, high: 1.0)
+    gateway = LLMGateway(api_key='test', rpm=6000, tpm=10_000_000, max_retries=max_retries)
+    gateway.client = Anthropic(api_key='test', max_retries=0,
+                               http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return gateway, calls, clock.sleeps
+
+
+def test_create_retries_overloaded_and_rate_limited(monkeypatch):
+    gateway, calls, sleeps = _gateway(monkeypatch, [
+        (529, {}), (429, {'retry-after': '3'}), (500, {}), (200, {}),
+    ])
+    assert gateway.generate('질문', max_tokens=10) == '안녕하세요'
+    assert len(calls) == 4
+    assert gateway.retries == 3
+    # 529: 지수 백오프 2초, 429: Retry-After 3초(다른 스레드도 같은 시각까지 멈춤), 500: 백오프 8초
+    assert sleeps == [BACKOFF_BASE, 3.0, BACKOFF_BASE * 4]
+    assert gateway.usage.records[-1].input_tokens == 12
+
+
+def test_create_gives_up_after_max_retries(monkeypatch):
+    gateway, calls, _ = _gateway(monkeypatch, [(529, {})] * 3, max_retries=2)
+    with pytest.raises(APIStatusError) as info:
+        gateway.generate('질문')
+    assert info.value.status_code == 529
+    assert len(calls) == 3
+
+
+def test_create_does_not_retry_client_errors(monkeypatch):
+    gateway, calls, sleeps = _gateway(monkeypatch, [(400, {}), (200, {})])
+    with pytest.raises(APIStatusError):
+        gateway.generate('질문')
+    assert len(calls) == 1 and not sleeps
+
+
+@pytest.mark.parametrize('status, expected', [(429, True), (529, True), (500, True), (503, True),
+                                              (400, False), (401, False), (404, False)])
+def test_is_retryable(status, expected):
+    response = httpx.Response(status, request=REQUEST)
+    error = Anthropic(api_key='test')._make_status_error('오류', body=None, response=response)
+    assert is_retryable(error) is expected
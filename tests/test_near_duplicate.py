@@ -0,0 +1,54 @@
+"""utils.near_duplicate: LSH 후보 + SequenceMatcher 재검사가 전수 비교와 같은 판정을 내는지"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from utils.near_duplicate import NearDuplicateIndex
+
+TITLES = [
+    '국민연금 개혁안 국회 통과, 보험료율 13%로 인상',
+    '기초연금 40만원 인상 추진…내년 예산안 반영',
+    '서울 아파트값 3주 연속 상승, 강남권 주도',
+    '폐암 조기 검진 대상 확대, 60대 흡연자 무료',
+    '독감 예방접종 오늘부터 시작, 65세 이상 무료',
+    '한국은행 기준금리 동결, 연내 인하 가능성 시사',
+]
+
+
+def test_finds_lightly_edited_title():
+    index = NearDuplicateIndex()
+    for title in TITLES:
+        index.add(title)
+    assert len(index) == len(TITLES)
+    assert index.has_similar('국민연금 개혁안 국회 통과…보험료율 13%로 인상', 0.85)
+    assert index.query('[속보] 기초연금 40만원 인상 추진, 내년 예산안 반영', 0.8)[0][0] == TITLES[1]
+    assert not index.has_similar('프로야구 한국시리즈 7차전 매진', 0.5)
+
+
+def test_keys_and_threshold_boundaries():
+    index = NearDuplicateIndex()
+    index.add(TITLES[0], key=0)
+    assert index.query(TITLES[0]) == [(0, 1.0)]
+    assert not index.has_similar(TITLES[0], 1.0)
+    assert index.has_similar(TITLES[0], 1.0, inclusive=True)
+
+
+def test_agrees_with_exhaustive_sequence_matcher():
+    rng = random.Random(3)
+    words = ' '.join(TITLES).split()
+    corpus = [' '.join(rng.sample(words, rng.randint(4, 8))) for _ in range(300)]
+    index = NearDuplicateIndex()
+    for text in corpus:
+        index.add(text)
+    # 기존 문장을 살짝 바꾼 질의: 0.85 초과 쌍은 LSH가 놓치지 않아야 함
+    for text in rng.sample(corpus, 50):
+        query = text.replace(' ', '  ', 1) + '!'
+        exhaustive = any(SequenceMatcher(None, query, other).ratio() > 0.85 for other in corpus)
+        assert index.has_similar(query, 0.85) == exhaustive, query
+
+
+def test_rejects_invalid_band_settings():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=8, bands=16)
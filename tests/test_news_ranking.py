@@ -0,0 +1,111 @@
+"""utils.news_ranking: 일괄 점수 계산이 기존 항목별 score 계산(rank_and_select_news)과 같은지, 상위 k개 선택"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from utils.news_ranking import (KEYWORD_WEIGHTS, SENIOR_CATEGORY_WEIGHTS, get_keyword_matcher, score_news_batch,
+                                select_top_k)
+
+NOW = datetime(2026, 3, 10, 11, 20, 30)
+
+
+def baseline_score(news, now):
+    """기존 rank_and_select_news의 항목별 점수 계산 (datetime.now() 대신 now 사용)"""
+    score = 0
+    title = news.get('title', '')
+    source_rss = news.get('source_rss', '')
+    for cat, weight in SENIOR_CATEGORY_WEIGHTS.items():
+        if cat in source_rss:
+            score += weight
+            break
+    for keyword, weight in KEYWORD_WEIGHTS.items():
+        if keyword in title:
+            score += weight
+    published_time = news.get('published_parsed')
+    if published_time:
+        try:
+            published_dt = datetime.fromtimestamp(time.mktime(published_time))
+            if now - published_dt < timedelta(days=1):
+                score += 3
+            hour = published_dt.hour
+            if 6 <= hour <= 9:
+                score += 2
+            elif 12 <= hour <= 14:
+                score += 1
+            elif 18 <= hour <= 21:
+                score += 1.5
+        except (ValueError, OSError):
+            pass
+    return score
+
+
+def _struct(**delta):
+    return (NOW - timedelta(**delta)).timetuple()
+
+
+ENTRIES = [
+    {'title': '국민연금 보험료율 인상, 60대 수령액은', 'source_rss': 'https://www.yna.co.kr/rss/economy.xml',
+     'published_parsed': _struct(hours=3)},
+    {'title': '치매 조기검진 확대…어르신 무료', 'source_rss': 'https://www.yna.co.kr/rss/health.xml',
+     'published_parsed': _struct(hours=4, minutes=30)},                                  # 06:50 아침
+    {'title': '아이돌 컴백 무대 화제', 'source_rss': 'https://www.yna.co.kr/rss/entertainment.xml',
+     'published_parsed': _struct(hours=17)},                                             # 18:20 저녁
+    {'title': '물가 상승에 전기료·가스요금 부담', 'source_rss': 'https://www.yna.co.kr/rss/market.xml',
+     'published_parsed': _struct(days=1, seconds=1)},                                    # 1일 경계 바로 밖
+    {'title': '물가 상승에 전기료·가스요금 부담', 'source_rss': 'https://www.yna.co.kr/rss/market.xml',
+     'published_parsed': _struct(hours=23, minutes=59)},                                 # 1일 경계 바로 안
+    {'title': '경로당 점심 지원 늘린다', 'source_rss': 'https://www.yna.co.kr/rss/local.xml',
+     'published_parsed': _struct(minutes=50)},                                           # 10:30
+    {'title': '기초연금 인상안 국회 논의', 'source_rss': 'https://www.yna.co.kr/rss/politics.xml',
+     'published_parsed': _struct(days=3, hours=-2)},                                     # 13:20 점심, 오래됨
+    {'title': '게임 중독 예방 캠페인', 'source_rss': 'https://news.example.com/feed'},  # 날짜 없음
+    {'title': '', 'source_rss': ''},
+    {'title': '암 환자 요양병원 지원', 'source_rss': 'https://www.yna.co.kr/rss/welfare.xml',
+     'published_parsed': _struct(days=10)},
+]
+
+# 기존 코드가 날짜 오류를 삼키고(또는 그 전에 실패해) 최신성/시간대 가중치를 주지 않아야 하는 입력
+MALFORMED = [
+    (2026, 3, 10, 9),                     # 6개보다 짧은 구조체
+    ('2026', '3', 'x', 9, 0, 0, 0, 0, 0),  # 숫자가 아닌 필드
+    (10 ** 20, 1, 1, 0, 0, 0, 0, 0, 0),    # int64 범위 밖
+    (2026, 13, 40, 25, 0, 0, 0, 0, 0),     # 범위 밖 월/일/시
+    [],
+]
+
+
+def test_batch_scores_match_baseline():
+    scores = score_news_batch(ENTRIES, get_keyword_matcher(), now=NOW)
+    expected = [baseline_score(news, NOW) for news in ENTRIES]
+    assert scores.tolist() == pytest.approx(expected, rel=1e-12)
+
+
+def test_batch_ranking_matches_baseline_sort():
+    scores = score_news_batch(ENTRIES, get_keyword_matcher(), now=NOW)
+    expected = sorted(range(len(ENTRIES)), key=lambda i: baseline_score(ENTRIES[i], NOW), reverse=True)
+    assert select_top_k(scores, 5).tolist() == expected[:5]
+
+
+@pytest.mark.parametrize('parsed', MALFORMED)
+def test_malformed_published_parsed_gets_no_date_bonus(parsed):
+    news = {'title': '국민연금 개혁', 'source_rss': 'https://www.yna.co.kr/rss/economy.xml',
+            'published_parsed': parsed}
+    undated = {k: v for k, v in news.items() if k != 'published_parsed'}
+    dated = dict(undated, published_parsed=_struct(hours=2))
+    scores = score_news_batch([news, undated, dated], get_keyword_matcher(), now=NOW)
+    assert scores[0] == scores[1] == baseline_score(undated, NOW)
+    assert scores[2] == baseline_score(dated, NOW)       # 섞여 있는 정상 항목은 그대로 계산
+
+
+def test_empty_list():
+    assert score_news_batch([], get_keyword_matcher(), now=NOW).shape == (0,)
+
+
+@pytest.mark.parametrize('k', [0, 1, 3, 6, 10])
+def test_select_top_k_keeps_original_order_for_ties(k):
+    scores = np.array([1.0, 5.0, 3.0, 5.0, 3.0, 0.0])
+    expected = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
+    assert select_top_k(scores, k).tolist() == expected
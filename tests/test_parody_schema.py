@@ -0,0 +1,75 @@
+"""utils.parody_schema: 도구 인자 추출, 패러디 검증, 본문형 필드 줄이기"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils.parody_schema import (FIELD_LIMITS, PARODY_TOOL_NAME, ParodyValidator, shorten_text,
+                                 tool_input, tool_parodies)
+
+VALID = {'id': 1, 'ou_title': '연금이 또 바뀐다네', 'latte': '우리 때는 연금이 뭔지도 몰랐어.',
+         'ou_think': '이번엔 제대로 되려나 싶네요.'}
+
+
+@pytest.mark.parametrize('text, limit, expected', [
+    ('짧은 문장.', 10, '짧은 문장.'),
+    ('첫 문장이에요. 둘째 문장은 길어요', 12, '첫 문장이에요.'),
+    ('띄어쓰기 기준으로 자르기, 끝', 14, '띄어쓰기 기준으로 자르기'),   # 끝 쉼표 제거
+    ('한참동안띄어쓰기가없는긴문장 끝', 10, None),         # 절반도 안 남으면 포기
+])
+def test_shorten_text(text, limit, expected):
+    assert shorten_text(text, limit) == expected
+
+
+def test_shorten_text_never_splices_words():
+    text = '우리 때는 연금이라는 말도 몰랐는데 요즘은 매년 제도가 바뀌니 따라가기 바쁘다'
+    for limit in range(15, len(text)):
+        shortened = shorten_text(text, limit)
+        assert shortened is not None and len(shortened) <= limit
+        assert text.startswith(shortened)      # 앞부분만 남기고 가운데 어절은 빼지 않음
+
+
+def test_valid_item_passes_with_whitespace_normalised():
+    validator = ParodyValidator()
+    parody = validator.check(dict(VALID, ou_title='  연금이\n또   바뀐다네 '))
+    assert parody == VALID
+    assert (validator.checked, validator.passed) == (1, 1)
+
+
+def test_long_title_is_rejected_not_shortened():
+    validator = ParodyValidator()
+    title = '우리 동네 경로당에 새로 들어온 안마의자가 이렇게 좋을 줄이야'
+    assert len(title) > FIELD_LIMITS['ou_title']
+    assert validator.check(dict(VALID, ou_title=title)) is None
+    assert validator.rejected == {'too_long_ou_title': 1}
+
+
+def test_long_body_field_is_trimmed_from_the_end():
+    validator = ParodyValidator({'ou_title': 30, 'latte': 20, 'ou_think': 80})
+    parody = validator.check(dict(VALID, latte='우리 때는 연금이 뭔지도 몰랐어. 요즘은 다들 챙긴다더라.'))
+    assert parody['latte'] == '우리 때는 연금이 뭔지도 몰랐어.'
+    assert validator.repaired == {'latte': 1}
+
+
+@pytest.mark.parametrize('item, reason', [
+    ('문자열', 'not_object'),
+    ({k: v for k, v in VALID.items() if k != 'latte'}, 'missing_latte'),
+    (dict(VALID, ou_think='   '), 'missing_ou_think'),
+    (dict(VALID, ou_think='가' * 81), 'too_long_ou_think'),
+])
+def test_invalid_items(item, reason):
+    validator = ParodyValidator()
+    assert validator.check(item) is None
+    assert validator.rejected == {reason: 1}
+
+
+def test_tool_input_and_parodies():
+    message = SimpleNamespace(content=[
+        SimpleNamespace(type='text', text='설명'),
+        {'type': 'tool_use', 'name': PARODY_TOOL_NAME, 'input': {'parodies': [VALID]}},
+    ])
+    assert tool_parodies(tool_input(message)) == [VALID]
+    assert tool_input(SimpleNamespace(content=[])) is None
+    assert tool_parodies({'parodies': VALID}) == [VALID]
+    assert tool_parodies(VALID) == [VALID]
+    assert tool_parodies({}) == []
@@ -0,0 +1,114 @@
+"""utils.prompt_budget: 구역 줄이기 함수, 우선순위별 예산 맞추기, 추정/실제 토큰 집계"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils.prompt_budget import PromptBudget, PromptProfiler, PromptSection, drop_oldest_lines, truncate_text
+
+
+def chars(text):
+    """테스트용 추정기: 글자 수 = 토큰 수"""
+    return len(text)
+
+
+def _sections():
+    return [
+        PromptSection('system', 'S' * 100),
+        PromptSection('recent_titles', '\n'.join(f'제목{i:02d}' for i in range(10)), trim_priority=1,
+                      shrink=drop_oldest_lines(3, chars)),
+        PromptSection('article_1', 'A' * 200, trim_priority=2, shrink=lambda t, n: truncate_text(t, n, chars)),
+        PromptSection('article_2', 'B' * 100, trim_priority=2, shrink=lambda t, n: truncate_text(t, n, chars)),
+    ]
+
+
+def test_truncate_text_prefers_sentence_boundary():
+    text = '연금 개혁안이 통과됐다. 보험료율은 13%로 오른다. 정부는 설명회를 연다.'
+    assert truncate_text(text, 1000, chars) == text
+    cut = truncate_text(text, 30, chars)
+    assert cut == '연금 개혁안이 통과됐다. 보험료율은 13%로 오른다.'
+    assert len(truncate_text('가' * 100, 40, chars)) == 40
+
+
+def test_drop_oldest_lines_keeps_minimum():
+    shrink = drop_oldest_lines(2, chars)
+    text = 'a1\nb2\nc3\nd4'
+    assert shrink(text, 5) == 'c3\nd4'
+    assert shrink(text, 0) == 'c3\nd4'
+    assert shrink(text, 100) == text
+
+
+def test_fit_within_budget_is_unchanged():
+    sections = _sections()
+    texts = PromptBudget(1000, chars).fit(sections)
+    assert texts['article_1'] == 'A' * 200
+    assert [s.tokens for s in sections] == [100, 49, 200, 100]
+    assert all(s.trimmed_tokens == 0 for s in sections)
+
+
+def test_fit_trims_lowest_priority_first():
+    sections = _sections()
+    texts = PromptBudget(430, chars).fit(sections)
+    # 449 → 430: 최근 제목 목록만 앞에서부터 줄이면 충분
+    assert texts['recent_titles'].split('\n') == [f'제목{i:02d}' for i in range(4, 10)]
+    assert texts['article_1'] == 'A' * 200 and texts['article_2'] == 'B' * 100
+    assert sections[1].trimmed_tokens == 20
+
+
+def test_fit_shares_trimming_within_priority():
+    sections = _sections()
+    PromptBudget(280, chars).fit(sections)
+    system, titles, first, second = sections
+    assert system.tokens == 100 and system.trimmed_tokens == 0
+    assert titles.text.count('\n') == 2
+    # 남은 초과분을 기사 본문 크기(2:1)에 비례해 나눔
+    assert sum(s.tokens for s in sections) <= 280
+    assert first.trimmed_tokens == pytest.approx(2 * second.trimmed_tokens, abs=1)
+
+
+def test_fit_never_trims_fixed_sections():
+    sections = [PromptSection('system', 'S' * 500), PromptSection('note', 'N' * 50, trim_priority=1)]
+    PromptBudget(100, chars).fit(sections)
+    assert [s.tokens for s in sections] == [500, 50]
+
+
+def test_fit_without_limit_only_estimates():
+    sections = _sections()
+    PromptBudget(0, chars).fit(sections)
+    assert sum(s.tokens for s in sections) == 449
+    # 호출마다 주는 예산이 기본값보다 우선
+    PromptBudget(0, chars).fit(sections, max_input_tokens=300)
+    assert sum(s.tokens for s in sections) <= 300
+
+
+def test_profiler_reports_sections_and_estimate_ratio():
+    profiler = PromptProfiler()
+    budget = PromptBudget(430, chars)
+
+    first, second = _sections(), _sections()
+    budget.fit(first)
+    PromptBudget(0, chars).fit(second)
+    request_1, request_2, failed = {'n': 1}, {'n': 2}, {'n': 3}
+    assert profiler.record('기사 1', first, request_1) == 429
+    profiler.record('기사 2', second, request_2)
+    profiler.record('기사 3', second, failed)
+
+    profiler.record_actual(request_1, SimpleNamespace(input_tokens=300, cache_read_input_tokens=222,
+                                                      cache_creation_input_tokens=0))
+    profiler.record_actual(request_2, {'input_tokens': 449, 'cache_creation_input_tokens': None})
+    profiler.record_actual(failed, None)
+    profiler.record_actual(request_1, {'input_tokens': 999})  # 이미 처리한 요청은 무시
+
+    report = profiler.report()
+    assert (report['requests'], report['trimmed_requests']) == (3, 1)
+    assert report['estimated_total'] == 429 + 449 * 2
+    assert report['sections']['recent_titles'] == {'tokens': 29 + 49 * 2,
+                                                    'share': pytest.approx((29 + 49 * 2) / (429 + 449 * 2)),
+                                                    'trimmed': 20}
+    assert list(report['sections'])[0] == 'article_1'
+    assert report['actual_ratio'] == pytest.approx((522 + 449) / (429 + 449))
+
+
+def test_empty_profiler_report():
+    report = PromptProfiler().report()
+    assert (report['requests'], report['avg_per_request'], report['actual_ratio']) == (0, 0.0, None)
@@ -0,0 +1,66 @@
+"""utils.response_cache: 내용 기반 키, TTL, LRU 삭제, 절감량 집계"""
+
+import pytest
+
+from conftest import FakeClock
+from utils import response_cache
+from utils.response_cache import ResponseCache, content_key
+
+PARODY = {'ou_title': '연금이 또 바뀐다네', 'latte': '라떼는 말이야', 'ou_think': '걱정이 앞서네'}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'responses.sqlite', ttl_seconds=100, max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_content_key():
+    key = content_key('제목', '본문', prompt_version=3, model='m')
+    assert key == content_key(' 제목 ', '본문', model='m', prompt_version=3)
+    assert key != content_key('제목', '본문 수정', prompt_version=3, model='m')
+    assert key != content_key('제목', '본문', prompt_version=4, model='m')
+
+
+def test_round_trip_and_savings(cache):
+    assert cache.get('k') is None
+    cache.put('k', PARODY, request_share=0.5, input_tokens=1200, output_tokens=300)
+    entry = cache.get('k')
+    assert entry == {'parody': PARODY, 'request_share': 0.5, 'input_tokens': 1200, 'output_tokens': 300}
+    cache.record_saving(entry)
+    assert (cache.hits, cache.misses, cache.used) == (1, 1, 1)
+    assert (cache.saved_requests, cache.saved_input_tokens, cache.saved_output_tokens) == (0.5, 1200, 300)
+
+
+def test_ttl_expiry(cache, clock):
+    cache.put('k', PARODY)
+    clock.advance(100)
+    assert cache.get('k') is not None
+    clock.advance(1)
+    assert cache.get('k') is None
+
+
+def test_put_drops_expired_entries_first(cache, clock):
+    cache.put('old', PARODY)
+    clock.advance(101)
+    cache.put('new', PARODY)
+    assert cache._connect().execute('SELECT key FROM responses').fetchall() == [('new',)]
+
+
+def test_lru_eviction(cache, clock):
+    for key in 'abc':
+        cache.put(key, PARODY)
+        clock.advance(1)
+    cache.get('a')
+    clock.advance(1)
+    cache.put('d', PARODY)
+    assert cache.get('b') is None
+    assert all(cache.get(key) for key in 'acd')
@@ -0,0 +1,180 @@
+"""utils.rss_state: 조건부 요청 값, 304 스냅샷, 새 항목 병합과 보관 기간"""
+
+import calendar
+import time
+
+import feedparser
+import httpx
+import pytest
+
+from utils import rss_state
+from utils.rss_state import FeedStateStore, entry_guid, entry_timestamp
+
+FEED_URL = 'https://www.yna.co.kr/rss/news.xml'
+ETAG = '"feed-v1"'
+MODIFIED = 'Tue, 10 Mar 2026 02:00:00 GMT'
+
+
+def _rss(items):
+    body = ''.join(
+        f'<item><title>{title}</title><link>https://www.yna.co.kr/view/{guid}</link>'
+        f'<guid>{guid}</guid><pubDate>{pub_date}</pubDate><description>{title} 요약</description></item>'
+        for guid, title, pub_date in items
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>연합뉴스</title>'
+            f'{body}</channel></rss>').encode('utf-8')
+
+
+ITEMS_V1 = [
+    ('AKR001', '국민연금 개혁안 통과', 'Tue, 10 Mar 2026 01:00:00 GMT'),
+    ('AKR002', '독감 예방접종 시작', 'Tue, 10 Mar 2026 00:30:00 GMT'),
+]
+ITEMS_V2 = [
+    ('AKR003', '노인 일자리 확대', 'Tue, 10 Mar 2026 03:00:00 GMT'),
+] + ITEMS_V1
+NOW = calendar.timegm((2026, 3, 10, 4, 0, 0))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = float(NOW)
+
+        def time(self):
+            return self.now
+
+        def struct_time(self, value):
+            return time.struct_time(value)
+
+    fake = Clock()
+    monkeypatch.setattr(rss_state, 'time', fake)
+    return fake
+
+
+class FeedServer:
+    """ETag/Last-Modified가 같으면 304를 돌려주는 피드 서버"""
+
+    def __init__(self, items):
+        self.items = items
+        self.etag = ETAG
+        self.requests = []
+
+    def handler(self, request):
+        self.requests.append(request)
+        if request.headers.get('If-None-Match') == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=_rss(self.items),
+                              headers={'ETag': self.etag, 'Last-Modified': MODIFIED,
+                                       'Content-Type': 'application/rss+xml'})
+
+
+def _poll(store, server):
+    """step1.fetch_news_from_rss와 같은 순서로 피드 하나를 조건부 요청합니다."""
+    validators = store.validators(FEED_URL)
+    headers = {}
+    if validators['etag']:
+        headers['If-None-Match'] = validators['etag']
+    if validators['modified']:
+        headers['If-Modified-Since'] = validators['modified']
+    with httpx.Client(transport=httpx.MockTransport(server.handler)) as client:
+        response = client.get(FEED_URL, headers=headers)
+    if response.status_code == 304:
+        return response.status_code, store.snapshot(FEED_URL), 0
+    feed = feedparser.parse(response.content)
+    entries, new_count = store.merge_snapshot(FEED_URL, feed.entries, etag=response.headers.get('ETag'),
+                                              modified=response.headers.get('Last-Modified'))
+    return response.status_code, entries, new_count
+
+
+def test_entry_timestamp_is_utc():
+    entry = {'published_parsed': time.struct_time((2026, 3, 10, 1, 0, 0, 1, 69, 0))}
+    assert entry_timestamp(entry) == calendar.timegm((2026, 3, 10, 1, 0, 0))
+    assert entry_timestamp({'updated_parsed': (2026, 3, 10, 0, 0, 0, 1, 69, 0)}) == calendar.timegm(
+        (2026, 3, 10, 0, 0, 0))
+
+
+@pytest.mark.parametrize('entry', [{}, {'published_parsed': None}, {'published_parsed': ('x',) * 9}])
+def test_entry_timestamp_missing_or_malformed(entry):
+    assert entry_timestamp(entry) is None
+
+
+def test_entry_guid_falls_back_to_link():
+    assert entry_guid({'id': 'a', 'link': 'b'}) == 'a'
+    assert entry_guid({'link': 'b'}) == 'b'
+    assert entry_guid({}) == ''
+
+
+def test_not_modified_feed_uses_snapshot(tmp_path, clock):
+    store = FeedStateStore(tmp_path / 'rss_state.json')
+    server = FeedServer(ITEMS_V1)
+
+    status, first, new_count = _poll(store, server)
+    assert (status, new_count) == (200, 2)
+    assert 'If-None-Match' not in server.requests[0].headers
+
+    status, second, new_count = _poll(store, server)
+    assert (status, new_count) == (304, 0)
+    assert server.requests[1].headers['If-None-Match'] == ETAG
+    assert server.requests[1].headers['If-Modified-Since'] == MODIFIED
+
+    # 스냅샷은 병합 결과와 같은 항목을 같은 형태(FeedParserDict, struct_time)로 돌려줌
+    assert [e.link for e in second] == [e.link for e in first]
+    assert [e.title for e in second] == ['국민연금 개혁안 통과', '독감 예방접종 시작']
+    assert isinstance(second[0], feedparser.FeedParserDict)
+    assert isinstance(second[0].published_parsed, time.struct_time)
+    assert [entry_timestamp(e) for e in second] == [entry_timestamp(e) for e in first]
+
+
+def test_snapshot_survives_restart(tmp_path, clock):
+    path = tmp_path / 'rss_state.json'
+    store = FeedStateStore(path)
+    server = FeedServer(ITEMS_V1)
+    _poll(store, server)
+    store.save()
+
+    reloaded = FeedStateStore(path)
+    status, entries, _ = _poll(reloaded, server)
+    assert status == 304
+    assert [e.id for e in entries] == ['AKR001', 'AKR002']
+    assert reloaded.validators(FEED_URL) == {'etag': ETAG, 'modified': MODIFIED}
+
+
+def test_changed_feed_merges_only_new_items(tmp_path, clock):
+    store = FeedStateStore(tmp_path / 'rss_state.json')
+    server = FeedServer(ITEMS_V1)
+    _poll(store, server)
+
+    server.items, server.etag = ITEMS_V2, '"feed-v2"'
+    status, entries, new_count = _poll(store, server)
+    assert (status, new_count) == (200, 1)
+    assert [e.id for e in entries] == ['AKR003', 'AKR001', 'AKR002']
+    assert store.validators(FEED_URL)['etag'] == '"feed-v2"'
+
+
+def test_merge_keeps_entries_missing_from_latest_feed(tmp_path, clock):
+    store = FeedStateStore(tmp_path / 'rss_state.json')
+    store.merge_snapshot(FEED_URL, feedparser.parse(_rss(ITEMS_V1)).entries)
+
+    # 피드 창에서 밀려난 항목도 보관 기간 안이면 스냅샷에 남음
+    entries, new_count = store.merge_snapshot(FEED_URL, feedparser.parse(_rss(ITEMS_V2[:1])).entries)
+    assert new_count == 1
+    assert [e.id for e in entries] == ['AKR003', 'AKR001', 'AKR002']
+
+
+def test_merge_drops_expired_and_caps_entries(tmp_path, clock):
+    store = FeedStateStore(tmp_path / 'rss_state.json', retention_hours=3, max_entries_per_feed=1)
+    entries, _ = store.merge_snapshot(FEED_URL, feedparser.parse(_rss(ITEMS_V2)).entries)
+    assert [e.id for e in entries] == ['AKR003']
+
+    store = FeedStateStore(tmp_path / 'other.json', retention_hours=3)
+    entries, _ = store.merge_snapshot(FEED_URL, feedparser.parse(_rss(ITEMS_V2)).entries)
+    # 04:00 기준 3시간: 01:00은 경계 안, 00:30은 만료
+    assert [e.id for e in entries] == ['AKR003', 'AKR001']
+
+
+def test_corrupt_state_file_starts_empty(tmp_path):
+    path = tmp_path / 'rss_state.json'
+    path.write_text('{not json', encoding='utf-8')
+    store = FeedStateStore(path)
+    assert store.snapshot(FEED_URL) == []
+    assert store.validators(FEED_URL) == {'etag': None, 'modified': None}
@@ -0,0 +1,91 @@
+"""utils.rss_summary: 요약 정리, 품질 점수, 요약 사용 여부"""
+
+import pytest
+
+from utils.rss_summary import SummaryPolicy, clean_summary, count_sentences, summary_quality
+
+TITLE = '국민연금 개혁안 국회 본회의 통과'
+FULL_SUMMARY = (
+    '<p>(서울=연합뉴스) 홍길동 김철수 기자 = 국민연금 보험료율을 단계적으로 올리는 개혁안이 '
+    '10일 국회 본회의를 통과했다.</p><p>개정안은 현재 9%인 보험료율을 매년 0.5%포인트씩 올려 '
+    '13%까지 높이고, 소득대체율은 43%로 조정하는 내용을 담았다. 정부는 이번 개혁으로 기금 소진 시점이 '
+    '7~8년 늦춰질 것으로 보고 있다. 노인단체들은 수령액이 줄어드는 것 아니냐며 우려를 나타냈고, 청년 단체들은 '
+    '부담만 늘었다고 반발했다. 보건복지부는 하반기에 세부 시행령을 마련해 &quot;국민 설명회&quot;를 열 계획이다.</p>'
+)
+
+
+def _news(summary, title=TITLE):
+    return {'title': title, 'summary': summary, 'link': 'https://www.yna.co.kr/view/AKR001'}
+
+
+def test_clean_summary_strips_tags_entities_and_byline():
+    text = clean_summary(FULL_SUMMARY)
+    assert text.startswith('국민연금 보험료율을')
+    assert '<' not in text and '&quot;' not in text
+    assert '"국민 설명회"' in text
+    assert '  ' not in text
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('(세종=연합뉴스) 정부가 발표했다.', '정부가 발표했다.'),
+    ('(워싱턴=연합뉴스) 이수정 특파원 = 미국이 발표했다.', '미국이 발표했다.'),
+    ('정부가 (가칭=연합) 안을 냈다.', '정부가 (가칭=연합) 안을 냈다.'),
+    (None, ''),
+])
+def test_clean_summary_byline_only_at_start(raw, expected):
+    assert clean_summary(raw) == expected
+
+
+def test_count_sentences():
+    assert count_sentences('개혁안이 통과했다. 반발도 있다. 정말인가요? 그렇다!') == 4
+    assert count_sentences('3.5% 인상') == 0
+
+
+def test_quality_prefers_long_novel_summaries():
+    full = summary_quality(TITLE, clean_summary(FULL_SUMMARY))
+    lead = summary_quality(TITLE, '국민연금 개혁안이 국회 본회의를 통과했다.')
+    assert full >= 0.9
+    assert lead < full
+    assert summary_quality(TITLE, '') == 0.0
+
+
+def test_quality_penalises_title_repetition():
+    repeated = summary_quality(TITLE, f'{TITLE}. {TITLE}. {TITLE}.', target_chars=10)
+    novel = summary_quality(TITLE, '보험료율이 오른다. 수령액은 줄어든다. 노인단체가 반발했다.', target_chars=10)
+    assert repeated < novel
+
+
+def test_policy_uses_full_summary():
+    policy = SummaryPolicy()
+    article = policy.article_from_entry(_news(FULL_SUMMARY))
+    assert article == {
+        'url': 'https://www.yna.co.kr/view/AKR001',
+        'title': TITLE,
+        'text': clean_summary(FULL_SUMMARY),
+        'publish_date': None,
+        'from_summary': True,
+    }
+    assert (policy.used, policy.thin) == (1, 0)
+
+
+def test_policy_reads_description_when_summary_missing():
+    news = {'title': TITLE, 'description': FULL_SUMMARY, 'link': 'x'}
+    assert SummaryPolicy().article_from_entry(news)['text'] == clean_summary(FULL_SUMMARY)
+
+
+@pytest.mark.parametrize('summary', [
+    '',
+    '(서울=연합뉴스) 국민연금 개혁안이 국회 본회의를 통과했다.',
+    # 충분히 길어도 한 문장이면 스크래핑
+    '국민연금 보험료율을 단계적으로 올리고 소득대체율을 조정하며 ' * 8 + '통과했다.',
+])
+def test_policy_scrapes_thin_summaries(summary):
+    policy = SummaryPolicy()
+    assert policy.article_from_entry(_news(summary)) is None
+    assert (policy.used, policy.thin) == (0, 1)
+
+
+def test_policy_thresholds_are_configurable():
+    text = '보험료율이 오른다. 수령액은 줄어든다. 노인단체가 반발했다.'
+    assert SummaryPolicy().article_from_entry(_news(text)) is None
+    assert SummaryPolicy(min_chars=20, min_score=0.5).article_from_entry(_news(text)) is not None
@@ -0,0 +1,89 @@
+"""utils.run_journal: 중단된 실행 복원, 완료 후 초기화, 잘린 줄과 오래된 저널 정리"""
+
+import json
+from datetime import date
+
+from utils.run_journal import RunJournal
+
+DAY = date(2026, 3, 10)
+ARTICLE = {'title': '국민연금 개혁안 통과', 'text': '본문 ' * 50}
+
+
+def _parody(n):
+    return {'original_link': f'https://www.yna.co.kr/view/{n}', 'parody_title': f'패러디 {n}'}
+
+
+def _events(journal):
+    return [json.loads(line) for line in journal.path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_new_journal_starts_empty(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    assert journal.path == tmp_path / '2026-03-10.jsonl'
+    assert (journal.accepted, journal.processed_urls) == ([], set())
+    assert [e['type'] for e in _events(journal)] == ['run_start']
+
+
+def test_resume_restores_progress(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    journal.record_scrape('https://www.yna.co.kr/view/1', ARTICLE)
+    journal.record_accepted('https://www.yna.co.kr/view/1', 0, _parody(1))
+    journal.record_scrape('https://www.yna.co.kr/view/2', None)
+    journal.record_rejected('https://www.yna.co.kr/view/3', 2, 'similar')
+    journal.record_rejected('https://www.yna.co.kr/view/4', 3, 'api_error')
+
+    resumed = RunJournal(tmp_path, day=DAY)
+    assert resumed.accepted == [_parody(1)]
+    assert resumed.failed_scrapes == {'https://www.yna.co.kr/view/2'}
+    # API 오류 등 최종 사유가 아닌 제외는 다시 시도
+    assert resumed.rejected_urls == {'https://www.yna.co.kr/view/3'}
+    assert resumed.processed_urls == {f'https://www.yna.co.kr/view/{n}' for n in (1, 2, 3)}
+    last = _events(resumed)[-1]
+    assert (last['type'], last['resumed']) == ('run_start', 1)
+
+
+def test_scrape_event_records_length(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    journal.record_scrape('https://www.yna.co.kr/view/1', ARTICLE)
+    journal.record_scrape('https://www.yna.co.kr/view/2', {'text': ''})
+    scrapes = [e for e in _events(journal) if e['type'] == 'scrape']
+    assert [(e['ok'], e['chars']) for e in scrapes] == [(True, len(ARTICLE['text'])), (False, 0)]
+
+
+def test_completed_run_starts_over(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    journal.record_accepted('https://www.yna.co.kr/view/1', 0, _parody(1))
+    journal.complete(1)
+
+    resumed = RunJournal(tmp_path, day=DAY)
+    assert resumed.accepted == []
+    resumed.record_accepted('https://www.yna.co.kr/view/2', 0, _parody(2))
+    assert RunJournal(tmp_path, day=DAY).accepted == [_parody(2)]
+
+
+def test_resume_false_marks_previous_records_completed(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    journal.record_accepted('https://www.yna.co.kr/view/1', 0, _parody(1))
+
+    fresh = RunJournal(tmp_path, day=DAY, resume=False)
+    assert fresh.accepted == []
+    assert _events(fresh)[-2]['type'] == 'completed'
+    assert _events(fresh)[-2]['reason'] == 'restart'
+    assert RunJournal(tmp_path, day=DAY).accepted == []
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    journal = RunJournal(tmp_path, day=DAY)
+    journal.record_accepted('https://www.yna.co.kr/view/1', 0, _parody(1))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "accepted", "url": "https://www.yna.co.kr/vi')
+
+    assert RunJournal(tmp_path, day=DAY).accepted == [_parody(1)]
+
+
+def test_old_journals_are_removed(tmp_path):
+    for name in ('2026-03-01.jsonl', '2026-03-03.jsonl', 'notes.jsonl'):
+        (tmp_path / name).write_text('', encoding='utf-8')
+
+    RunJournal(tmp_path, day=DAY, retention_days=7)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['2026-03-03.jsonl', '2026-03-10.jsonl', 'notes.jsonl']
@@ -0,0 +1,67 @@
+"""utils.seen_filter: 날짜별 블룸 필터 저장/복원, 보관 기간, 제목 지문"""
+
+from datetime import date, timedelta
+
+from utils.seen_filter import BloomFilter, SeenFilter, title_fingerprint
+
+TODAY = date(2026, 3, 10)
+URL = 'https://www.yna.co.kr/view/AKR20260309000100001?input=1195m'
+TITLE = '[속보] 국민연금 개혁안 국회 통과 | 연합뉴스'
+
+
+def test_bloom_round_trip():
+    bloom = BloomFilter(capacity=100)
+    for i in range(100):
+        bloom.add(f'item-{i}')
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert restored.num_hashes == bloom.num_hashes and restored.num_bits == bloom.num_bits
+    assert all(f'item-{i}' in restored for i in range(100))
+    assert sum(f'other-{i}' in restored for i in range(1000)) < 10
+
+
+def test_title_fingerprint_ignores_decorations():
+    assert title_fingerprint(TITLE) == title_fingerprint('국민연금 개혁안, 국회 통과!')
+    assert title_fingerprint(TITLE) != title_fingerprint('기초연금 개혁안 국회 통과')
+    assert title_fingerprint('[단독]') == ''
+
+
+def test_save_and_load_across_runs(tmp_path):
+    yesterday = SeenFilter(tmp_path, today=TODAY - timedelta(days=1))
+    yesterday.record(URL, TITLE)
+    yesterday.save()
+    assert (tmp_path / '2026-03-09.bloom').exists()
+
+    seen = SeenFilter(tmp_path, today=TODAY)
+    assert seen.is_seen(url=URL.replace('?input=1195m', ''))
+    assert seen.is_seen(title='국민연금 개혁안 국회 통과')
+    assert not seen.is_seen(url='https://www.yna.co.kr/view/other', title='다른 기사')
+    entries = [{'link': URL, 'title': TITLE}, {'link': 'https://example.com/a', 'title': '새 기사'}]
+    assert seen.filter_entries(entries) == entries[1:]
+
+
+def test_same_day_picks_are_not_filtered(tmp_path):
+    seen = SeenFilter(tmp_path, today=TODAY)
+    seen.record(URL, TITLE)
+    seen.save()
+    assert not SeenFilter(tmp_path, today=TODAY).is_seen(URL, TITLE)
+
+
+def test_expired_filters_are_deleted(tmp_path):
+    old = SeenFilter(tmp_path, today=TODAY - timedelta(days=10))
+    old.record(URL, TITLE)
+    old.save()
+    seen = SeenFilter(tmp_path, retention_days=7, today=TODAY)
+    assert not seen.is_seen(URL, TITLE)
+    assert not list(tmp_path.glob('*.bloom'))
+
+
+def test_rebuild_from_history(tmp_path):
+    seen = SeenFilter(tmp_path, today=TODAY)
+    seen.record(URL, TITLE, day=TODAY - timedelta(days=2))
+    seen.record('https://example.com/old', '오래된 기사', day=TODAY - timedelta(days=30))
+    for path in tmp_path.glob('*.bloom'):
+        path.unlink()
+
+    assert seen.rebuild() == 1
+    assert len(seen.history_path.read_text(encoding='utf-8').splitlines()) == 1
+    assert SeenFilter(tmp_path, today=TODAY).is_seen(URL, TITLE)
@@ -0,0 +1,166 @@
+"""실행 간에 유지되는 기사 본문 캐시 (SQLite).
+
+- 정규화된 URL을 키로 사용합니다.
+- TTL이 지난 항목은 무시되고, 항목 수가 max_entries를 넘으면
+  가장 오래 사용되지 않은 항목부터 삭제합니다. (LRU)
+- 본문은 zlib으로 압축해서 저장합니다.
+- 본문이 너무 짧거나 스크래핑에 실패한 URL은 '없음'으로 따로 기록해
+  짧은 TTL 동안 다시 스크래핑하지 않습니다. (negative cache)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 기사 식별과 무관한 추적용 쿼리 파라미터
+TRACKING_PARAMS = {'input', 'fbclid', 'gclid'}
+
+_MISS = object()
+
+
+def canonical_url(url: str) -> str:
+    """캐시 키로 쓸 수 있도록 URL을 정규화합니다.
+
+    스킴/호스트 소문자화, 프래그먼트와 추적 파라미터(utm_* 등) 제거,
+    쿼리 파라미터 정렬, 끝 슬래시 제거를 수행합니다.
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+class ArticleCache:
+    """URL → 기사 딕셔너리 캐시. get()이 ArticleCache.MISS를 반환하면 캐시에 없는 것입니다."""
+
+    MISS = _MISS
+
+    def __init__(self, db_path: Union[str, Path], ttl_seconds: int = 3 * 24 * 3600,
+                 negative_ttl_seconds: int = 6 * 3600, max_entries: int = 2000):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS articles ('
+                ' url TEXT PRIMARY KEY,'
+                ' payload BLOB,'          # 압축된 JSON, negative 항목은 NULL
+                ' created_at REAL NOT NULL,'
+                ' last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_last_access ON articles(last_access)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _encode(article: Dict[str, Any]) -> bytes:
+        data = dict(article)
+        if isinstance(data.get('publish_date'), datetime):
+            data['publish_date'] = data['publish_date'].isoformat()
+        return zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    @staticmethod
+    def _decode(payload: bytes) -> Dict[str, Any]:
+        data = json.loads(zlib.decompress(payload).decode('utf-8'))
+        if data.get('publish_date'):
+            try:
+                data['publish_date'] = datetime.fromisoformat(data['publish_date'])
+            except (TypeError, ValueError):
+                pass
+        return data
+
+    def get(self, url: str):
+        """캐시된 기사를 반환합니다. negative 항목이면 None, 없으면 ArticleCache.MISS."""
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT payload, created_at FROM articles WHERE url = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return _MISS
+            payload, created_at = row
+            ttl = self.ttl_seconds if payload is not None else self.negative_ttl_seconds
+            if now - created_at > ttl:
+                conn.execute('DELETE FROM articles WHERE url = ?', (key,))
+                conn.commit()
+                self.misses += 1
+                return _MISS
+            conn.execute('UPDATE articles SET last_access = ? WHERE url = ?', (now, key))
+            conn.commit()
+        if payload is None:
+            self.negative_hits += 1
+            return None
+        self.hits += 1
+        return self._decode(payload)
+
+    def put(self, url: str, article: Optional[Dict[str, Any]]):
+        """기사를 저장합니다. article이 None이면 negative 항목으로 저장합니다."""
+        key = canonical_url(url)
+        if not key:
+            return
+        now = time.time()
+        payload = self._encode(article) if article is not None else None
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO articles (url, payload, created_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        (count,) = conn.execute('SELECT COUNT(*) FROM articles').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                'DELETE FROM articles WHERE url IN '
+                '(SELECT url FROM articles ORDER BY last_access ASC LIMIT ?)',
+                (overflow,),
+            )
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 항목을 삭제하고 삭제 건수를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cur = conn.execute(
+                'DELETE FROM articles WHERE (payload IS NOT NULL AND created_at < ?) '
+                'OR (payload IS NULL AND created_at < ?)',
+                (now - self.ttl_seconds, now - self.negative_ttl_seconds),
+            )
+            conn.commit()
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,149 @@
+"""뉴스 순위 선정 직후 기사 본문을 미리 스크래핑하는 프리페치 파이프라인.
+
+작업 스레드들이 순위 순서대로 기사를 내려받아 크기가 제한된 큐에 넣고,
+패러디 생성 루프는 큐에서 기사를 꺼내 쓰므로 스크래핑 시간이
+Claude 응답 대기 시간과 겹쳐서 진행됩니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (순위, RSS 항목, 스크래핑 결과 또는 None)
+PrefetchItem = Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+class ArticlePrefetcher:
+    """순위가 매겨진 뉴스 목록의 기사 본문을 작업 스레드로 미리 가져옵니다.
+
+    - 모든 순위에 대해 정확히 한 번씩 항목을 내보냅니다. (실패 시 기사 값은 None)
+    - 큐가 가득 차면 작업 스레드가 대기하므로 필요 이상으로 앞서 나가지 않습니다.
+    - get()에서 소비자가 기다린 시간(stall)과 큐 깊이를 통계로 남깁니다.
+    """
+
+    def __init__(self, fetch_fn: Callable[[str], Optional[Dict[str, Any]]],
+                 news_list: List[Dict[str, Any]], workers: int = 6, queue_size: int = 12):
+        self._fetch_fn = fetch_fn
+        self._news_list = news_list
+        self._workers = max(1, workers)
+        self._queue: "queue.Queue[PrefetchItem]" = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._next_index = 0
+        self._emitted = 0
+
+        # 통계
+        self.fetched = 0
+        self.failed = 0
+        self.stall_seconds = 0.0
+        self._depth_samples = 0
+        self._depth_total = 0
+        self.max_depth = 0
+
+    def start(self) -> "ArticlePrefetcher":
+        """작업 스레드를 시작합니다."""
+        for i in range(min(self._workers, len(self._news_list))):
+            thread = threading.Thread(target=self._worker, name=f"prefetch-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"기사 프리페치 시작: 후보 {len(self._news_list)}개, 작업 스레드 {len(self._threads)}개, "
+                    f"큐 크기 {self._queue.maxsize}")
+        return self
+
+    def _claim_next(self) -> Optional[int]:
+        with self._lock:
+            if self._stop.is_set() or self._next_index >= len(self._news_list):
+                return None
+            index = self._next_index
+            self._next_index += 1
+            return index
+
+    def _worker(self):
+        while True:
+            index = self._claim_next()
+            if index is None:
+                return
+            news = self._news_list[index]
+            try:
+                article = self._fetch_fn(news.get('link', ''))
+            except Exception as e:
+                logger.warning(f"프리페치 중 오류: {news.get('link', '')}, {e}")
+                article = None
+            with self._lock:
+                if article and article.get('text'):
+                    self.fetched += 1
+                else:
+                    self.failed += 1
+            # 큐가 가득 차면 공간이 생기거나 중단될 때까지 대기
+            while not self._stop.is_set():
+                try:
+                    self._queue.put((index, news, article), timeout=0.2)
+                    break
+                except queue.Full:
+                    continue
+
+    @property
+    def exhausted(self) -> bool:
+        """모든 순위의 항목을 내보냈는지 여부"""
+        return self._emitted >= len(self._news_list)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[PrefetchItem]:
+        """다음 기사를 꺼냅니다. timeout 안에 없거나 모두 소진되면 None을 반환합니다.
+
+        timeout=0이면 기다리지 않고, None이면 다음 항목이 올 때까지 기다립니다.
+        기다린 시간은 stall 시간으로 집계됩니다.
+        """
+        if self.exhausted:
+            return None
+        depth = self._queue.qsize()
+        self._depth_samples += 1
+        self._depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+        started = time.perf_counter()
+        try:
+            if timeout == 0:
+                item = self._queue.get_nowait()
+            else:
+                item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        finally:
+            if timeout != 0:
+                self.stall_seconds += time.perf_counter() - started
+        self._emitted += 1
+        return item
+
+    def stop(self):
+        """남은 프리페치 작업을 중단합니다."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=0.5)
+
+    def stats(self) -> Dict[str, Any]:
+        """프리페치 통계를 반환합니다."""
+        avg_depth = self._depth_total / self._depth_samples if self._depth_samples else 0.0
+        return {
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'consumed': self._emitted,
+            'avg_queue_depth': round(avg_depth, 2),
+            'max_queue_depth': self.max_depth,
+            'stall_seconds': round(self.stall_seconds, 2),
+        }
+
+    def log_stats(self):
+        """프리페치 통계를 로그로 남깁니다."""
+        st = self.stats()
+        logger.info(
+            f"프리페치 통계: 수집 {st['fetched']}건, 실패 {st['failed']}건, 소비 {st['consumed']}건, "
+            f"평균 큐 깊이 {st['avg_queue_depth']}, 최대 큐 깊이 {st['max_queue_depth']}, "
+            f"생성 루프 대기 {st['stall_seconds']}초"
+        )
@@ -0,0 +1,377 @@
+"""asyncio 기반 기사 다운로드 엔진.
+
+백그라운드 스레드 하나에서 이벤트 루프를 돌리며, 연결을 재사용하는
+httpx.AsyncClient 하나로 모든 기사 HTML을 내려받습니다.
+
+- 호스트별 동시 요청 수(semaphore)와 요청 시작 간격(politeness)을 지킵니다.
+  (기사 대부분이 yna.co.kr 한 호스트에서 오므로 호스트 단위로 제한)
+- URL마다 전체 시간 예산(timeout_budget)을 두고, 그 안에서만 재시도합니다.
+- 받은 HTML은 이벤트 루프를 막지 않도록 파싱용 스레드 풀(executor)에 넘깁니다.
+- 스트리밍 모드(기본값)에서는 응답을 조각 단위로 읽다가 바이트 상한(max_bytes)에 닿거나
+  본문 컨테이너 요소(end_selector(url)이 돌려주는 선택자)가 본문 길이를 채운 채 닫히면 나머지를 받지 않습니다.
+  (선택자에 맞는 요소라도 글자 수가 MIN_RULE_BODY_LENGTH 미만이면 본문 앞의 감싸는 요소로 보고 계속 읽음)
+  기사 뒤쪽의 스크립트/광고/관련 기사 목록을 내려받고 디코딩하는 비용을 줄입니다.
+- 문자셋은 Content-Type 헤더, 없으면 문서 앞부분의 <meta charset>을 따르고,
+  선언이 없으면 감지 없이 UTF-8로 디코딩합니다.
+
+client_factory를 주면 그 함수가 만든 클라이언트(예: utils.http_client.SharedHttpClient.async_client,
+HTTP/2·DNS 캐시·호스트별 연결 통계 공유)를 씁니다.
+
+스레드에서 쓰는 동기 인터페이스(fetch)와 여러 URL을 한 번에 받는 fetch_all을 제공합니다.
+
+    engine = AsyncArticleFetcher(parse_fn=parse_article_html)
+    article = engine.fetch(url)             # 프리페치 작업 스레드 등에서 호출
+    articles = engine.fetch_all(urls)       # URL 순서대로 결과 목록
+    engine.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from utils.html_extract import MIN_RULE_BODY_LENGTH, selector_matcher
+except ImportError:
+    from html_extract import MIN_RULE_BODY_LENGTH, selector_matcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36')
+DEFAULT_PER_HOST_CONNECTIONS = 6
+DEFAULT_MIN_INTERVAL = 0.02    # 같은 호스트에 요청을 시작하는 최소 간격(초)
+DEFAULT_TIMEOUT_BUDGET = 15.0  # URL 하나에 쓸 수 있는 전체 시간(초, 재시도 포함)
+DEFAULT_REQUEST_TIMEOUT = 10.0
+DEFAULT_MAX_RETRIES = 1
+DEFAULT_PARSE_WORKERS = 4
+DEFAULT_MAX_BYTES = 512 * 1024  # 기사 한 건에서 읽을 최대 바이트 (스트리밍 모드)
+
+# 재시도할 상태 코드 (그 외 4xx는 바로 실패)
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 문서 앞부분에서 찾는 문자셋 선언 (<meta charset="..."> / <meta http-equiv content="...; charset=...">)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_META_SNIFF_BYTES = 4096
+
+ParseFn = Callable[[str, str], Optional[Dict[str, Any]]]
+EndSelectorFn = Callable[[str], Optional[str]]
+ClientFactory = Callable[..., httpx.AsyncClient]
+
+
+def _valid_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def decode_html(body: bytes, header_charset: Optional[str] = None) -> str:
+    """선언된 문자셋으로 HTML을 디코딩합니다. (헤더 → <meta> → UTF-8, 문자셋 감지 없음)
+
+    스트리밍을 중간에 멈추면 마지막 글자가 잘릴 수 있으므로 잘못된 바이트는 대체 문자로 바꿉니다.
+    """
+    charset = _valid_charset(header_charset)
+    if charset is None:
+        match = _META_CHARSET_RE.search(body[:_META_SNIFF_BYTES])
+        charset = _valid_charset(match.group(1).decode('ascii')) if match else None
+    return body.decode(charset or 'utf-8', errors='replace')
+
+
+def _visible_text_length(elem: Any) -> int:
+    """요소 안의 글자 수 (script/style/주석 내용과 공백 제외)"""
+    length = len((elem.text or '').strip())
+    for node in elem.iterdescendants():
+        if isinstance(node.tag, str) and node.tag not in ('script', 'style') and node.text:
+            length += len(node.text.strip())
+        if node.tail:
+            length += len(node.tail.strip())
+    return length
+
+
+class ContainerEndDetector:
+    """HTML 조각을 점진적으로 파싱하다가 선택자에 맞는 요소가 본문 길이를 채운 채 닫히면 알려줍니다. (lxml 필요)
+
+    학습한 선택자가 넓으면(예: [class*="content"]) 본문보다 먼저 닫히는 감싸는 요소에도 맞을 수 있으므로,
+    글자 수가 min_chars 미만인 요소는 무시하고 계속 읽습니다. 추출기도 같은 기준(MIN_RULE_BODY_LENGTH)
+    미만이면 규칙 선택자를 버리고 다시 찾으므로, 멈춘 시점까지 받은 HTML로 같은 본문이 나옵니다.
+    """
+
+    def __init__(self, selector: str, min_chars: int = MIN_RULE_BODY_LENGTH):
+        self._matches = selector_matcher(selector)
+        self.min_chars = min_chars
+        self._parser = etree.HTMLPullParser(events=('end',))
+
+    def feed(self, chunk: bytes) -> bool:
+        """조각을 넣고, 본문 컨테이너가 닫혔으면 True"""
+        self._parser.feed(chunk)
+        for _, elem in self._parser.read_events():
+            if (isinstance(elem.tag, str) and self._matches(elem.tag, elem.get('class', ''))
+                    and _visible_text_length(elem) >= self.min_chars):
+                return True
+        return False
+
+
+class _HostLimiter:
+    """호스트 하나의 동시 요청 수와 요청 시작 간격 제한"""
+
+    def __init__(self, connections: int, min_interval: float):
+        self.semaphore = asyncio.Semaphore(connections)
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait_turn(self) -> float:
+        """요청 시작 간격을 지키도록 기다리고 기다린 시간(초)을 반환합니다."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next_start - now)
+            self._next_start = max(now, self._next_start) + self.min_interval
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class AsyncArticleFetcher:
+    """공유 연결 풀 + 호스트별 제한으로 기사 HTML을 내려받아 parse_fn(url, html)으로 파싱합니다.
+
+    parse_fn은 파싱용 스레드 풀에서 실행되며, 결과(기사 딕셔너리 또는 None)를 그대로 반환합니다.
+    다운로드 실패/시간 초과는 None을 반환합니다.
+    """
+
+    def __init__(self, parse_fn: ParseFn,
+                 per_host_connections: int = DEFAULT_PER_HOST_CONNECTIONS,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 timeout_budget: float = DEFAULT_TIMEOUT_BUDGET,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 max_connections: int = 32,
+                 parse_workers: int = DEFAULT_PARSE_WORKERS,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 stream: bool = True,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 end_selector: Optional[EndSelectorFn] = None,
+                 client_factory: Optional[ClientFactory] = None):
+        self.parse_fn = parse_fn
+        self.per_host_connections = max(1, per_host_connections)
+        self.min_interval = max(0.0, min_interval)
+        self.timeout_budget = timeout_budget
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self._max_connections = max_connections
+        self._user_agent = user_agent
+        self._client_factory = client_factory
+        self.stream = stream
+        self.max_bytes = max(0, max_bytes)  # 0이면 상한 없음
+        self.end_selector = end_selector if LXML_AVAILABLE else None
+        self._hosts: Dict[str, _HostLimiter] = {}
+        self._parse_pool = ThreadPoolExecutor(max_workers=max(1, parse_workers),
+                                              thread_name_prefix='article-parse')
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self.downloaded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.early_stops = 0       # 본문 컨테이너가 닫혀 읽기를 멈춘 건수
+        self.capped = 0            # 바이트 상한에 닿아 읽기를 멈춘 건수
+        self.bytes_skipped = 0     # 중단으로 받지 않은 바이트 (Content-Length를 알 때만)
+        self.download_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.politeness_wait = 0.0
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name='article-fetch-loop', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        if self._client_factory is not None:
+            self._client = self._client_factory(timeout=self.request_timeout)
+        else:
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': self._user_agent},
+                timeout=self.request_timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self._max_connections,
+                                    max_keepalive_connections=self._max_connections),
+            )
+        self._ready.set()
+        self._loop.run_forever()
+
+    def _host(self, url: str) -> _HostLimiter:
+        # 이벤트 루프 스레드에서만 호출되므로 잠금 불필요
+        host = urlsplit(url).netloc.lower()
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = _HostLimiter(self.per_host_connections, self.min_interval)
+        return limiter
+
+    def _count(self, **values: float):
+        with self._stats_lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    async def _download(self, url: str) -> str:
+        limiter = self._host(url)
+        for attempt in range(self.max_retries + 1):
+            async with limiter.semaphore:
+                self._count(politeness_wait=await limiter.wait_turn())
+                started = time.perf_counter()
+                try:
+                    if self.stream:
+                        status, html = await self._get_streaming(url)
+                    else:
+                        status, html = await self._get_full(url)
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    error: Exception = e
+                else:
+                    self._count(download_seconds=time.perf_counter() - started)
+                    if status < 400:
+                        return html
+                    error = httpx.HTTPStatusError(f"HTTP {status}", request=httpx.Request('GET', url),
+                                                  response=httpx.Response(status))
+                    if status not in _RETRYABLE_STATUS:
+                        raise error
+            if attempt >= self.max_retries:
+                raise error
+            self._count(retries=1)
+            await asyncio.sleep(0.5 * (2 ** attempt) * random.uniform(0.8, 1.2))
+        raise RuntimeError("unreachable")
+
+    async def _get_full(self, url: str):
+        """응답 전체를 받아 (상태 코드, HTML)을 반환합니다."""
+        response = await self._client.get(url)
+        if response.status_code >= 400:
+            return response.status_code, ''
+        self._count(bytes_received=response.num_bytes_downloaded)
+        return response.status_code, decode_html(response.content, response.charset_encoding)
+
+    async def _get_streaming(self, url: str):
+        """응답을 조각 단위로 읽다가 본문 컨테이너가 닫히거나 바이트 상한에 닿으면 멈춥니다."""
+        async with self._client.stream('GET', url) as response:
+            if response.status_code >= 400:
+                return response.status_code, ''
+            selector = self.end_selector(str(response.url)) if self.end_selector else None
+            detector = ContainerEndDetector(selector) if selector else None
+            chunks: List[bytes] = []
+            size = 0
+            stopped = None
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if detector is not None and detector.feed(chunk):
+                    stopped = 'early_stops'
+                    break
+                if self.max_bytes and size >= self.max_bytes:
+                    stopped = 'capped'
+                    break
+            # 중단하면 남은 본문을 읽지 않고 연결을 닫음 (async with 종료 시)
+            body = b''.join(chunks)
+            if self.max_bytes and len(body) > self.max_bytes:
+                body = body[:self.max_bytes]
+            counts = {'bytes_received': response.num_bytes_downloaded}
+            if stopped:
+                counts[stopped] = 1
+                total = response.headers.get('Content-Length')
+                if total and total.isdigit():
+                    counts['bytes_skipped'] = max(0, int(total) - response.num_bytes_downloaded)
+            self._count(**counts)
+            return response.status_code, decode_html(body, response.charset_encoding)
+
+    async def fetch_async(self, url: str) -> Optional[Dict[str, Any]]:
+        """기사 하나를 내려받아 파싱합니다. (이벤트 루프 안에서 호출)"""
+        try:
+            html = await asyncio.wait_for(self._download(url), timeout=self.timeout_budget)
+        except asyncio.TimeoutError:
+            self._count(failed=1, timed_out=1)
+            logger.warning(f"기사 다운로드 시간 초과({self.timeout_budget:.0f}초): {url}")
+            return None
+        except Exception as e:
+            self._count(failed=1)
+            logger.warning(f"기사 다운로드 실패: {url}, 오류: {e}")
+            return None
+        self._count(downloaded=1)
+
+        started = time.perf_counter()
+        try:
+            return await self._loop.run_in_executor(self._parse_pool, self.parse_fn, url, html)
+        finally:
+            self._count(parse_seconds=time.perf_counter() - started)
+
+    def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """다른 스레드에서 기사 하나를 받아옵니다. (완료될 때까지 대기)"""
+        return asyncio.run_coroutine_threadsafe(self.fetch_async(url), self._loop).result()
+
+    def fetch_all(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """여러 기사를 동시에 받아 URL 순서대로 반환합니다."""
+        async def gather():
+            return await asyncio.gather(*(self.fetch_async(url) for url in urls))
+        return asyncio.run_coroutine_threadsafe(gather(), self._loop).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'downloaded': self.downloaded,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'retries': self.retries,
+                'hosts': len(self._hosts),
+                'megabytes': round(self.bytes_received / 1e6, 2),
+                'early_stops': self.early_stops,
+                'capped': self.capped,
+                'skipped_megabytes': round(self.bytes_skipped / 1e6, 2),
+                'avg_download': round(self.download_seconds / self.downloaded, 3) if self.downloaded else 0.0,
+                'parse_seconds': round(self.parse_seconds, 2),
+                'politeness_wait': round(self.politeness_wait, 2),
+            }
+
+    def log_stats(self):
+        st = self.stats()
+        if not (st['downloaded'] or st['failed']):
+            return
+        logger.info(
+            f"기사 다운로드 통계: 성공 {st['downloaded']}건, 실패 {st['failed']}건 (시간 초과 {st['timed_out']}건), "
+            f"재시도 {st['retries']}회, 호스트 {st['hosts']}개, {st['megabytes']}MB, "
+            f"평균 다운로드 {st['avg_download']}초, 파싱 합계 {st['parse_seconds']}초, "
+            f"호스트 간격 대기 {st['politeness_wait']}초"
+        )
+        if self.stream:
+            logger.info(
+                f"스트리밍 다운로드: 본문 종료 후 중단 {st['early_stops']}건, "
+                f"{self.max_bytes // 1024}KB 상한 도달 {st['capped']}건, "
+                f"받지 않은 데이터 {st['skipped_megabytes']}MB (Content-Length 기준)"
+            )
+
+    def close(self):
+        """연결 풀과 이벤트 루프, 파싱 스레드 풀을 정리합니다."""
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._parse_pool.shutdown(wait=False)
@@ -0,0 +1,161 @@
+"""기사 HTML 추출기(lxml / soup) 결과 비교 및 성능 측정 도구.
+
+저장해 둔 기사 HTML 묶음(fixture)으로 두 추출기의 제목/본문/발행 시각이 같은지 확인하고,
+페이지당 파싱 시간과 최대 메모리 사용량을 추출기별로 측정합니다.
+메모리는 추출기마다 별도 프로세스에서 측정합니다. (lxml은 C 메모리를 쓰므로 RSS 기준)
+
+기본 fixture는 저장소에 포함된 tests/fixtures/yna (기자 이름 등을 지운 연합뉴스 기사 HTML)이며,
+tests/test_extractor_parity.py가 같은 묶음으로 결과 일치를 확인합니다.
+
+    # 연합뉴스 기사 HTML 저장 (RSS 링크 등, cache/extract_fixtures에 원본 그대로 저장)
+    python -m utils.bench_extractors record https://www.yna.co.kr/view/AKR... [...]
+    # 비교 + 측정 (--dir cache/extract_fixtures 로 새로 저장한 묶음 측정)
+    python -m utils.bench_extractors run --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from utils.html_extract import EXTRACTORS
+except ImportError:
+    from html_extract import EXTRACTORS
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'yna'
+# record로 내려받은 원본 HTML (기자 이름/이메일이 그대로 있으므로 gitignore 대상인 cache/에 저장)
+RECORD_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'extract_fixtures'
+COMPARED_FIELDS = ('title', 'text', 'publish_date')
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def load_fixtures(directory: Path) -> Dict[str, str]:
+    return {path.name: path.read_text(encoding='utf-8') for path in sorted(directory.glob('*.html'))}
+
+
+def record(urls: List[str], directory: Path):
+    """URL의 HTML을 내려받아 fixture로 저장합니다."""
+    try:
+        from utils.async_fetch import AsyncArticleFetcher
+    except ImportError:
+        from async_fetch import AsyncArticleFetcher
+
+    directory.mkdir(parents=True, exist_ok=True)
+    engine = AsyncArticleFetcher(lambda url, html: {'html': html})
+    try:
+        for url, result in zip(urls, engine.fetch_all(urls)):
+            if not result:
+                print(f"실패: {url}")
+                continue
+            path = directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.html"
+            path.write_text(result['html'], encoding='utf-8')
+            print(f"저장: {path.name} <- {url}")
+    finally:
+        engine.close()
+
+
+def compare(pages: Dict[str, str]) -> int:
+    """lxml과 soup 추출 결과(제목/본문/발행 시각)를 비교하고 공백 정규화 후에도 다른 페이지 수를 반환합니다."""
+    lxml_extractor, soup_extractor = EXTRACTORS['lxml'](), EXTRACTORS['soup']()
+    exact = 0
+    mismatches = 0
+    for name, html in pages.items():
+        a, b = lxml_extractor.extract(html), soup_extractor.extract(html)
+        if all(a[k] == b[k] for k in COMPARED_FIELDS):
+            exact += 1
+            continue
+        same = a['publish_date'] == b['publish_date'] and all(
+            _SPACE_RE.sub(' ', a[k]).strip() == _SPACE_RE.sub(' ', b[k]).strip() for k in ('title', 'text'))
+        if not same:
+            mismatches += 1
+            print(f"  불일치: {name} (제목 {a['title'][:30]!r} / {b['title'][:30]!r}, "
+                  f"본문 {len(a['text'])}자 / {len(b['text'])}자)")
+    print(f"결과 비교: {len(pages)}개 중 완전 일치 {exact}개, 공백 차이만 {len(pages) - exact - mismatches}개, "
+          f"불일치 {mismatches}개")
+    return mismatches
+
+
+def measure(name: str, pages: Dict[str, str], repeat: int) -> Dict[str, float]:
+    """현재 프로세스에서 추출기 하나를 측정합니다."""
+    extractor = EXTRACTORS[name]()
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    per_page = []
+    for _ in range(repeat):
+        for html in pages.values():
+            started = time.perf_counter()
+            extractor.extract(html)
+            per_page.append(time.perf_counter() - started)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'median_ms': statistics.median(per_page) * 1000,
+        'mean_ms': statistics.fmean(per_page) * 1000,
+        'python_peak_kb': py_peak / 1024,
+        # ru_maxrss: 리눅스 KB 단위 (macOS는 바이트)
+        'rss_growth_kb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss)
+                         / (1024 if sys.platform == 'darwin' else 1),
+    }
+
+
+def run(directory: Path, repeat: int) -> int:
+    pages = load_fixtures(directory)
+    if not pages:
+        print(f"fixture가 없습니다: {directory} (record 명령으로 먼저 저장하세요)")
+        return 1
+    print(f"fixture {len(pages)}개 ({sum(len(h) for h in pages.values()) / 1e6:.1f}MB), 반복 {repeat}회")
+    mismatches = compare(pages)
+
+    results = {}
+    for name in EXTRACTORS:
+        out = subprocess.run(
+            [sys.executable, '-m', 'utils.bench_extractors', '_measure', name,
+             '--dir', str(directory), '--repeat', str(repeat)],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent.parent,
+        )
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+    for name, r in results.items():
+        print(f"  {name:5s}: 페이지당 중앙값 {r['median_ms']:.2f}ms (평균 {r['mean_ms']:.2f}ms), "
+              f"Python 최대 할당 {r['python_peak_kb']:,.0f}KB, 최대 RSS 증가 {r['rss_growth_kb']:,.0f}KB")
+    if 'soup' in results and 'lxml' in results and results['lxml']['median_ms']:
+        print(f"  lxml 속도 향상: {results['soup']['median_ms'] / results['lxml']['median_ms']:.1f}배")
+    return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기사 HTML 추출기 비교/성능 측정')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_record = sub.add_parser('record', help='기사 HTML을 fixture로 저장')
+    p_record.add_argument('urls', nargs='+')
+    p_record.add_argument('--dir', type=Path, default=RECORD_DIR)
+    p_run = sub.add_parser('run', help='추출 결과 비교 및 성능 측정')
+    p_run.add_argument('--dir', type=Path, default=DEFAULT_FIXTURE_DIR)
+    p_run.add_argument('--repeat', type=int, default=5)
+    p_measure = sub.add_parser('_measure')  # run이 추출기별 프로세스에서 호출
+    p_measure.add_argument('name', choices=sorted(EXTRACTORS))
+    p_measure.add_argument('--dir', type=Path, default=DEFAULT_FIXTURE_DIR)
+    p_measure.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.urls, args.dir)
+    elif args.command == 'run':
+        sys.exit(run(args.dir, args.repeat))
+    else:
+        print(json.dumps(measure(args.name, load_fixtures(args.dir), args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Claude Message Batches API로 여러 요청을 한 번에 제출하고 결과를 모읍니다.
+
+정기 실행처럼 즉시 응답이 필요 없는 경우, 요청마다 messages.create를
+부르는 대신 배치 하나로 제출하면 비용과 속도 제한 부담이 줄어듭니다.
+
+    results = run_message_batch(client, [
+        {'custom_id': 'rank-0001', 'params': {...messages.create 인자...}},
+    ])
+    results['rank-0001']  # 응답 텍스트(도구 호출 응답이면 도구 인자 dict), 실패한 요청은 None
+
+오프라인 테스트는 utils.local_batch_server 를 띄운 뒤
+CLAUDE_BASE_URL=http://127.0.0.1:8765 으로 실행합니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INITIAL = 5.0      # 첫 상태 확인까지 대기(초)
+DEFAULT_POLL_MAX = 120.0        # 상태 확인 간격 상한(초)
+DEFAULT_BATCH_TIMEOUT = 6 * 3600  # 호출하는 쪽에 남은 시간이 있으면 그 시간으로 줄여 씀
+
+
+# 요청 하나의 결과: 응답 텍스트, 또는 tool_choice로 도구 호출을 강제한 요청이면 도구 인자
+BatchResult = Union[str, Dict[str, Any]]
+
+
+class BatchTimeoutError(RuntimeError):
+    """배치가 제한 시간 안에 끝나지 않았을 때 발생합니다."""
+
+
+def _result_payload(result: Any) -> Optional[BatchResult]:
+    """배치 결과 한 건에서 도구 인자(도구 호출이 있으면) 또는 응답 텍스트를 꺼냅니다. 성공이 아니면 None"""
+    if getattr(result, 'type', None) != 'succeeded':
+        return None
+    message = result.message
+    text = None
+    for block in message.content or []:
+        block_type = getattr(block, 'type', None)
+        if block_type == 'tool_use' and isinstance(block.input, dict):
+            return block.input
+        if block_type == 'text' and block.text and text is None:
+            text = block.text
+    return text
+
+
+def submit_batch(client, requests: List[Dict[str, Any]]):
+    """요청 목록({'custom_id', 'params'})을 배치로 제출하고 MessageBatch를 반환합니다."""
+    batch = client.messages.batches.create(requests=requests)
+    logger.info(f"📦 메시지 배치 제출: {batch.id} (요청 {len(requests)}건)")
+    return batch
+
+
+def wait_for_batch(client, batch_id: str, poll_initial: float = DEFAULT_POLL_INITIAL,
+                   poll_max: float = DEFAULT_POLL_MAX, timeout: float = DEFAULT_BATCH_TIMEOUT):
+    """배치가 끝날 때까지 지수 백오프로 상태를 확인합니다."""
+    started = time.monotonic()
+    delay = poll_initial
+    while True:
+        batch = client.messages.batches.retrieve(batch_id)
+        if batch.processing_status == 'ended':
+            counts = batch.request_counts
+            logger.info(
+                f"📦 배치 완료: {batch_id} (성공 {counts.succeeded}, 오류 {counts.errored}, "
+                f"만료 {counts.expired}, 취소 {counts.canceled}, {time.monotonic() - started:.0f}초)"
+            )
+            return batch
+
+        elapsed = time.monotonic() - started
+        if elapsed + delay > timeout:
+            raise BatchTimeoutError(f"배치 {batch_id}가 {timeout:.0f}초 안에 끝나지 않았습니다.")
+        logger.info(f"⏳ 배치 처리 중: {batch_id} (진행 중 {batch.request_counts.processing}건), {delay:.0f}초 후 다시 확인")
+        time.sleep(delay)
+        delay = min(delay * 2, poll_max)
+
+
+def collect_results(client, batch_id: str, usage_tracker=None,
+                    usages: Optional[Dict[str, Any]] = None) -> Dict[str, Optional[BatchResult]]:
+    """끝난 배치의 결과를 custom_id → 응답 텍스트 또는 도구 인자(실패 시 None)로 모읍니다.
+
+    usage_tracker(utils.llm_usage.UsageTracker)를 주면 성공한 요청의 토큰 사용량을 기록하고,
+    usages 딕셔너리를 주면 custom_id → usage 객체를 채워 넣습니다.
+    """
+    results: Dict[str, Optional[BatchResult]] = {}
+    for entry in client.messages.batches.results(batch_id):
+        payload = _result_payload(entry.result)
+        if entry.result.type == 'succeeded':
+            if usage_tracker is not None:
+                usage_tracker.record(entry.custom_id, entry.result.message.usage)
+            if usages is not None:
+                usages[entry.custom_id] = entry.result.message.usage
+        if payload is None:
+            logger.warning(f"배치 요청 실패: {entry.custom_id} ({entry.result.type})")
+        results[entry.custom_id] = payload
+    return results
+
+
+def run_message_batch(client, requests: List[Dict[str, Any]], poll_initial: float = DEFAULT_POLL_INITIAL,
+                      poll_max: float = DEFAULT_POLL_MAX,
+                      timeout: float = DEFAULT_BATCH_TIMEOUT, usage_tracker=None,
+                      usages: Optional[Dict[str, Any]] = None,
+                      on_submit: Optional[Callable[[str], None]] = None) -> Dict[str, Optional[BatchResult]]:
+    """요청 목록을 배치로 제출하고 완료를 기다린 뒤 custom_id별 응답(텍스트 또는 도구 인자)을 반환합니다.
+
+    결과에 없는 custom_id도 None으로 채워 돌려줍니다.
+    on_submit을 주면 제출 직후 배치 ID로 호출합니다. (기다리다 중단되어도 다음 실행이 같은 배치를
+    다시 확인할 수 있도록 저널에 남기는 용도)
+    """
+    if not requests:
+        return {}
+    batch = submit_batch(client, requests)
+    if on_submit is not None:
+        on_submit(batch.id)
+    wait_for_batch(client, batch.id, poll_initial=poll_initial, poll_max=poll_max, timeout=timeout)
+    results = collect_results(client, batch.id, usage_tracker, usages)
+    for request in requests:
+        results.setdefault(request['custom_id'], None)
+    return results
@@ -0,0 +1,196 @@
+"""제목 어미 패턴 다양성 계획: 실행 전에 패턴별 할당량을 정하고 기사마다 목표 패턴을 배정합니다.
+
+예전에는 프롬프트마다 지금까지 확정된 제목의 패턴 분포를 보고 적게 쓰인 패턴을 권했기 때문에
+요청이 앞선 결과에 의존했고, 그래도 분포가 한쪽으로 쏠렸습니다. (예: 감탄 16, 의문 4, 단정 6, 걱정 2)
+
+- DiversityPlanner: 필요한 개수(슬롯)를 4가지 패턴에 고르게 나눈 할당량을 미리 정하고,
+  요청을 보낼 때마다 (할당량 - 확정 - 진행 중)이 가장 많이 남은 패턴을 배정합니다.
+  앞선 결과를 기다리지 않으므로 요청을 모두 동시에 보낼 수 있습니다.
+- classify_title_pattern: 제목 끝 어미를 미리 컴파일한 정규식 하나로 판별합니다.
+  생성된 제목이 배정한 패턴과 다르면 그 기사만 다시 요청하고, 할당량이 찬 패턴은 받지 않습니다.
+  어미로 판별하지 못한 제목(None)은 다르다고 보지 않고, 남은 자리가 있는 아무 패턴의 자리에 받습니다.
+  (PARODY_SYSTEM_PROMPT의 어미 안내와 예시 제목은 이 표와 맞아야 함: tests/test_diversity_plan.py)
+
+    planner = DiversityPlanner(30)
+    target = planner.assign()                  # 요청 전에 배정
+    ok = planner.check(title, target)          # 생성 결과 검증 (다르면 재요청)
+    planner.release(target)                    # 결과 확정 시 진행 중 배정 해제
+    if planner.has_room(pattern): planner.accept(pattern)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PATTERNS = ('exclamation', 'question', 'statement', 'concern')
+
+# 패턴별 제목 끝 어미 (같은 위치에서 시작하면 앞에 적은 패턴이 우선, 더 긴 어미가 더 앞에서 시작하므로 우선)
+# 어미 하나는 한 패턴에만 둡니다. ('~네'는 감탄, '~겠어'는 걱정, 물음표 없는 '~나'는 판별하지 않음)
+TITLE_PATTERN_ENDINGS: Dict[str, List[str]] = {
+    'concern': ['겠네', '겠다', '겠어', '것 ?같아', '것 ?같다', '듯해', '듯하다', '려나', '까 ?봐', '어쩌나', '어쩌지',
+                r'걱정\S*(?: 앞서)?'],
+    'question': ['을까', '는가', '는지', '가나', '까', '니', '냐'],
+    'statement': ['다', '군', '죠', '이에', '예'],
+    'exclamation': ['구나', '다니', '라니', '네', '어', '아', '라', '야', '지', '해', '걸'],
+}
+
+# 패턴별 프롬프트 안내 (어미 예시, PARODY_SYSTEM_PROMPT의 안내와 같음)
+PATTERN_GUIDES: Dict[str, str] = {
+    'exclamation': "감탄/놀라움형(exclamation): '~네', '~구나', '~어', '~야', '~지'로 끝냄",
+    'question': "의문/궁금증형(question): '~까?', '~나?', '~을까?', '~는가?'로 끝냄",
+    'statement': "단정/확신형(statement): '~다', '~군', '~죠'로 끝냄",
+    'concern': "걱정/우려형(concern): '~겠네', '~겠어', '~것 같아', '~듯해', '~려나'로 끝냄",
+}
+
+_QUESTION_MARK_RE = re.compile(r'\?[\s"\'”’)\]]*$')
+_TRAILING_RE = re.compile(r'[\s!.~…"\'”’)\]]+$')
+_POLITE_RE = re.compile(r'(?<=[가-힣])요$')
+_ENDING_RE = re.compile('|'.join(
+    f"(?P<{pattern}>{'|'.join(endings)})$" for pattern, endings in TITLE_PATTERN_ENDINGS.items()
+))
+
+
+def classify_title_pattern(title: str) -> Optional[str]:
+    """제목의 어미 패턴(exclamation/question/statement/concern)을 판별합니다. 모르면 None
+
+    물음표로 끝나면 의문형, 아니면 끝의 문장부호와 높임 '요'를 떼고 마지막 어미로 판별합니다.
+    어미로 판별하지 못해도 느낌표로 끝나면 감탄형입니다.
+    """
+    title = (title or '').strip()
+    if not title:
+        return None
+    if _QUESTION_MARK_RE.search(title):
+        return 'question'
+    core = _POLITE_RE.sub('', _TRAILING_RE.sub('', title))
+    match = _ENDING_RE.search(core)
+    if match:
+        return match.lastgroup
+    return 'exclamation' if title.rstrip('"\'”’)] ').endswith('!') else None
+
+
+def balanced_quotas(slots: int, patterns: Sequence[str] = PATTERNS) -> Dict[str, int]:
+    """slots개를 패턴마다 고르게 나눕니다. (나머지는 앞쪽 패턴부터 1개씩)"""
+    base, extra = divmod(max(0, slots), len(patterns))
+    return {pattern: base + (1 if i < extra else 0) for i, pattern in enumerate(patterns)}
+
+
+class DiversityPlanner:
+    """패턴별 할당량, 진행 중 배정, 확정 수와 검증 통계를 관리합니다. (스레드 안전)"""
+
+    def __init__(self, slots: int, patterns: Sequence[str] = PATTERNS):
+        self.patterns = tuple(patterns)
+        self.quotas = balanced_quotas(slots, self.patterns)
+        self._lock = threading.Lock()
+        self.accepted: Counter = Counter()
+        self.pending: Counter = Counter()
+        self.assigned: Counter = Counter()  # 누적 배정 수 (남은 자리가 같으면 덜 배정한 패턴부터)
+        # 검증 통계
+        self.matched = 0          # 첫 응답이 목표 패턴과 일치
+        self.mismatched = 0       # 목표 패턴과 달라 다시 요청
+        self.rematched = 0        # 다시 요청해서 일치
+        self.quota_rejected = 0   # 할당량이 찬 패턴이라 받지 않음
+        self.unclassified = 0     # 어미로 판별하지 못해 남은 자리에 받은 제목
+
+    def schedule(self) -> List[str]:
+        """슬롯 순서대로 펼친 배정 계획 (같은 패턴이 이어지지 않도록 돌아가며 배치)"""
+        remaining = dict(self.quotas)
+        plan: List[str] = []
+        while any(remaining.values()):
+            for pattern in self.patterns:
+                if remaining[pattern]:
+                    plan.append(pattern)
+                    remaining[pattern] -= 1
+        return plan
+
+    def _open(self, pattern: str) -> int:
+        return self.quotas[pattern] - self.accepted[pattern] - self.pending[pattern]
+
+    def assign(self) -> str:
+        """남은 자리(할당량 - 확정 - 진행 중)가 가장 많은 패턴을 배정합니다.
+
+        후보를 필요한 개수보다 많이 보내면 자리가 음수가 될 수 있으며, 그때도 가장 덜 초과된 패턴을 고릅니다.
+        """
+        with self._lock:
+            pattern = max(self.patterns,
+                          key=lambda p: (self._open(p), -self.assigned[p], -self.patterns.index(p)))
+            self.pending[pattern] += 1
+            self.assigned[pattern] += 1
+        return pattern
+
+    def open_slots(self) -> int:
+        """아직 배정하지 않은 자리 수 (0이면 진행 중인 요청만으로 할당량을 채울 수 있음)"""
+        with self._lock:
+            return sum(max(0, self._open(p)) for p in self.patterns)
+
+    def release(self, pattern: Optional[str]):
+        """배정한 요청의 결과가 확정되면(채택 여부와 무관) 진행 중 배정을 해제합니다."""
+        if pattern is None:
+            return
+        with self._lock:
+            if self.pending[pattern] > 0:
+                self.pending[pattern] -= 1
+
+    def has_room(self, pattern: Optional[str]) -> bool:
+        """pattern의 할당량이 남았는지 (판별하지 못한 제목(None)은 어느 패턴이든 자리가 남았는지)"""
+        with self._lock:
+            if pattern is None:
+                return any(self.accepted[p] < self.quotas[p] for p in self.patterns)
+            return pattern in self.quotas and self.accepted[pattern] < self.quotas[pattern]
+
+    def accept(self, pattern: Optional[str]) -> Optional[str]:
+        """확정한 제목을 패턴 자리에 넣고 그 패턴을 반환합니다.
+
+        판별하지 못한 제목(None)은 남은 자리가 가장 많은 패턴의 자리를 씁니다. (자리가 없으면 None)
+        """
+        with self._lock:
+            if pattern is None:
+                slot = max(self.patterns, key=lambda p: (self.quotas[p] - self.accepted[p], -self.patterns.index(p)))
+                if self.accepted[slot] >= self.quotas[slot]:
+                    return None
+                pattern = slot
+                self.unclassified += 1
+            self.accepted[pattern] += 1
+        return pattern
+
+    def reject_full(self):
+        with self._lock:
+            self.quota_rejected += 1
+
+    def check(self, title: str, target: Optional[str], retry: bool = False) -> bool:
+        """생성된 제목이 목표 패턴인지 검증하고 통계를 기록합니다.
+
+        목표가 없거나 어미로 판별하지 못한 제목은 True (다르다는 근거가 없으므로 다시 요청하지 않음)
+        """
+        if target is None:
+            return True
+        pattern = classify_title_pattern(title)
+        ok = pattern is None or pattern == target
+        with self._lock:
+            if retry:
+                self.rematched += ok
+            elif ok:
+                self.matched += 1
+            else:
+                self.mismatched += 1
+        return ok
+
+    def log_stats(self):
+        with self._lock:
+            checked = self.matched + self.mismatched
+            accepted = {p: self.accepted[p] for p in self.patterns}
+            unclassified = self.unclassified
+        if not checked and not sum(accepted.values()):
+            return
+        distribution = ', '.join(f"{p} {accepted[p]}/{self.quotas[p]}" for p in self.patterns)
+        unclassified_note = f", 판별 못 한 제목 {unclassified}건 포함" if unclassified else ""
+        logger.info(f"🎯 제목 패턴 계획: {distribution} (확정/할당량{unclassified_note})")
+        if checked:
+            logger.info(f"🎯 패턴 검증: {checked}건 중 첫 응답 일치 {self.matched}건, "
+                        f"재요청 {self.mismatched}건 (재요청 후 일치 {self.rematched}건), "
+                        f"할당량 초과로 제외 {self.quota_rejected}건")
@@ -0,0 +1,136 @@
+"""도메인별 기사 추출 규칙(선택자 메모) 저장소.
+
+같은 사이트의 기사는 항상 같은 선택자에서 제목/본문이 나오므로, 호스트마다
+마지막으로 유효한 본문을 찾은 선택자를 JSON 파일에 기록해 두고 다음 기사부터
+그 선택자를 먼저 시도합니다. 대부분의 페이지가 선택자 조회 한 번으로 끝납니다.
+
+알려진 사이트는 BUILTIN_RULES에 직접 적은 규칙(fast path)을 처음부터 시도하고,
+학습한 규칙이 생기면 그 선택자를 가장 먼저 시도합니다.
+규칙으로 찾은 본문이 부실하면 추출기가 기본 선택자 순서로 다시 찾고, 그 결과를 다시 학습합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 직접 적은 사이트별 규칙 (호스트: {'title': [...], 'content': [...]})
+BUILTIN_RULES: Dict[str, Dict[str, List[str]]] = {
+    'yna.co.kr': {
+        'title': ['h1.tit01', 'h1.tit'],
+        'content': ['div.story-news'],
+    },
+}
+
+
+def rule_host(url: str) -> str:
+    """규칙을 찾을 때 쓰는 호스트 이름 (소문자, www./m. 제거)"""
+    host = urlsplit(url).netloc.lower().split(':')[0]
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+class ExtractionRuleRegistry:
+    """호스트별 선택자 메모 + 직접 적은 규칙"""
+
+    def __init__(self, path: Union[str, Path], builtin: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.path = Path(path)
+        self.builtin = BUILTIN_RULES if builtin is None else builtin
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+        # 이번 실행 통계
+        self.pages = 0
+        self.rule_hits = 0       # 규칙 선택자로 본문을 찾은 페이지
+        self.probes = 0          # 선택자 조회 횟수 합계
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            self._hosts = json.loads(self.path.read_text(encoding='utf-8')).get('hosts', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"추출 규칙 파일을 읽을 수 없어 새로 시작합니다: {self.path}, {e}")
+            self._hosts = {}
+
+    def save(self):
+        """학습한 규칙을 파일에 저장합니다. (임시 파일에 쓴 뒤 교체, 바뀐 것이 없으면 생략)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({'hosts': self._hosts}, ensure_ascii=False, indent=1)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(payload, encoding='utf-8')
+        tmp_path.replace(self.path)
+
+    def rules_for(self, url: str) -> Dict[str, List[str]]:
+        """먼저 시도할 선택자 목록 (학습한 규칙 → 직접 적은 규칙 순, 중복 제거)"""
+        host = rule_host(url)
+        builtin = self.builtin.get(host, {})
+        with self._lock:
+            learned = self._hosts.get(host, {})
+            rules = {}
+            for field in ('title', 'content'):
+                selectors = [learned[field]] if learned.get(field) else []
+                selectors += [sel for sel in builtin.get(field, []) if sel not in selectors]
+                rules[field] = selectors
+        return rules
+
+    def body_selector(self, url: str) -> Optional[str]:
+        """본문 컨테이너 선택자 하나 (학습한 규칙, 없으면 직접 적은 규칙의 첫 번째). 없으면 None
+
+        스트리밍 다운로드가 이 요소가 닫히는 시점에 읽기를 멈추는 데 씁니다.
+        """
+        host = rule_host(url)
+        with self._lock:
+            learned = self._hosts.get(host, {}).get('content')
+        if learned:
+            return learned
+        builtin = self.builtin.get(host, {}).get('content')
+        return builtin[0] if builtin else None
+
+    def record(self, url: str, rules: Dict[str, List[str]], result: Dict[str, Any], valid: bool):
+        """추출 결과를 반영합니다. 유효한 본문을 찾은 선택자를 호스트 규칙으로 기억합니다."""
+        host = rule_host(url)
+        content_selector = result.get('content_selector')
+        with self._lock:
+            self.pages += 1
+            self.probes += result.get('probes', 0)
+            if valid and content_selector and content_selector in rules.get('content', []):
+                self.rule_hits += 1
+            if not (valid and content_selector and host):
+                return
+            state = self._hosts.setdefault(host, {})
+            changed = (state.get('content') != content_selector
+                       or (result.get('title_selector') and state.get('title') != result['title_selector']))
+            state['content'] = content_selector
+            if result.get('title_selector'):
+                state['title'] = result['title_selector']
+            state['pages'] = state.get('pages', 0) + 1
+            if changed:
+                state['learned_at'] = time.time()
+                self._dirty = True
+                logger.debug(f"추출 규칙 학습: {host} → 제목 {state.get('title')}, 본문 {content_selector}")
+            elif state['pages'] % 50 == 0:
+                self._dirty = True  # 사용 횟수는 가끔만 저장
+
+    def log_stats(self):
+        if not self.pages:
+            return
+        logger.info(
+            f"추출 규칙 통계: {self.pages}페이지 중 도메인 규칙 적중 {self.rule_hits}건, "
+            f"페이지당 선택자 조회 평균 {self.probes / self.pages:.1f}회 (학습한 호스트 {len(self._hosts)}개)"
+        )
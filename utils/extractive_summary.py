@@ -0,0 +1,143 @@
+"""기사 본문에서 정보가 많은 문장만 골라 프롬프트용으로 줄이는 추출 요약기.
+
+본문 앞부분을 잘라 넣으면 기자 머리말과 리드만 남고 수치나 핵심 사실이 빠지기 쉬우므로,
+문장마다 점수를 매겨 글자 수 예산 안에서 가장 유익한 문장들을 원래 순서대로 고릅니다.
+
+- 문장 표현: 한글 단어 안의 문자 2-gram + 숫자 토큰 (형태소 분석기 없이 조사/어미 변화에 강함)
+- 점수: TF-IDF 코사인 유사도 그래프의 TextRank 중심성
+        + 수치 포함 가산, 제목과의 TF-IDF 유사도 가산, 앞쪽 문장 가산
+- 저작권 문구, 기자 이메일, 제보 안내 같은 잡음 문장은 제외
+
+    summary = summarize_article(text, title=title, budget_chars=600)
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import List, Sequence
+
+import numpy as np
+
+try:
+    from utils.rss_summary import clean_summary
+except ImportError:
+    from rss_summary import clean_summary
+
+DEFAULT_BUDGET_CHARS = 600
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+# 문장 점수 가중치: TextRank 중심성(0~1로 정규화)에 더하는 가산점
+NUMBER_BONUS = 0.25
+TITLE_BONUS = 0.6
+POSITION_BONUS = 0.15
+MIN_SENTENCE_CHARS = 15
+
+_SPACE_RE = re.compile(r'\s+')
+# 문장 끝: 마침표/물음표/느낌표 (+닫는 따옴표/괄호) 뒤 공백. 숫자 사이 마침표(3.5%)는 나누지 않음
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])(?<!\d\.)["\'”’)]*\s+|(?<=다\.)\s*|\n+')
+_TOKEN_RE = re.compile(r'[가-힣]+|[A-Za-z]+|\d+(?:[.,]\d+)*')
+_NUMBER_RE = re.compile(r'\d')
+_NOISE_RE = re.compile(
+    r'저작권자|무단\s*전재|재배포\s*금지|제보는\s*카카오톡|[\w.-]+@[\w-]+\.[\w.]+|^\s*\[?사진|^\s*\(끝\)'
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """기사 본문을 문장 단위로 나눕니다. 너무 짧은 조각은 앞 문장에 붙입니다."""
+    sentences: List[str] = []
+    for piece in _SENTENCE_SPLIT_RE.split(text or ''):
+        piece = _SPACE_RE.sub(' ', piece or '').strip()
+        if not piece:
+            continue
+        if sentences and len(piece) < MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def sentence_terms(sentence: str) -> List[str]:
+    """문장의 색인어: 한글 단어는 문자 2-gram, 영문은 소문자 단어, 숫자는 그대로"""
+    terms = []
+    for token in _TOKEN_RE.findall(sentence):
+        if token[0] >= '가':
+            if len(token) == 1:
+                terms.append(token)
+            else:
+                terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            terms.append(token.lower())
+    return terms
+
+
+def _tfidf_matrix(term_lists: Sequence[List[str]]) -> np.ndarray:
+    vocabulary = {}
+    for terms in term_lists:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    matrix = np.zeros((len(term_lists), max(1, len(vocabulary))), dtype=np.float64)
+    for row, terms in enumerate(term_lists):
+        for term, count in Counter(terms).items():
+            matrix[row, vocabulary[term]] = 1.0 + math.log(count)
+    document_freq = (matrix > 0).sum(axis=0)
+    matrix *= np.log((1 + len(term_lists)) / (1 + document_freq)) + 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def textrank_scores(vectors: np.ndarray) -> np.ndarray:
+    """정규화된 TF-IDF 행렬의 코사인 유사도 그래프에서 TextRank 점수(최댓값 1)를 계산합니다."""
+    count = vectors.shape[0]
+    if count == 1:
+        return np.ones(1)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / count),
+                           where=out_weight > 0)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    return scores / scores.max()
+
+
+def summarize_article(text: str, title: str = '', budget_chars: int = DEFAULT_BUDGET_CHARS) -> str:
+    """본문에서 점수가 높은 문장을 budget_chars 안에서 골라 원래 순서대로 이어 붙입니다.
+
+    본문이 예산보다 짧으면 정리만 해서 그대로 반환합니다.
+    """
+    text = clean_summary(text)
+    if len(text) <= budget_chars:
+        return text
+    # 잡음 문장과 되풀이된 문장(사진 설명 반복 등)은 후보에서 제외
+    sentences = list(dict.fromkeys(s for s in split_sentences(text) if not _NOISE_RE.search(s)))
+    if not sentences:
+        return text[:budget_chars]
+
+    # 제목도 같은 색인어 공간에 넣어 문장과 제목의 유사도를 구함 (마지막 행)
+    vectors = _tfidf_matrix([sentence_terms(s) for s in sentences] + [sentence_terms(title)])
+    scores = textrank_scores(vectors[:-1])
+    scores += TITLE_BONUS * (vectors[:-1] @ vectors[-1])
+    for i, sentence in enumerate(sentences):
+        if _NUMBER_RE.search(sentence):
+            scores[i] += NUMBER_BONUS
+        scores[i] += POSITION_BONUS * (1 - i / len(sentences))
+
+    chosen: List[int] = []
+    used = 0
+    for i in sorted(range(len(sentences)), key=lambda k: -scores[k]):
+        length = len(sentences[i]) + (1 if chosen else 0)
+        if used + length > budget_chars:
+            continue
+        chosen.append(i)
+        used += length
+    if not chosen:
+        # 가장 좋은 문장 하나도 예산을 넘으면 그 문장을 잘라서 사용
+        return sentences[int(np.argmax(scores))][:budget_chars]
+    return ' '.join(sentences[i] for i in sorted(chosen))
@@ -0,0 +1,329 @@
+"""기사 HTML에서 제목과 본문을 뽑는 추출기 모음.
+
+newspaper3k를 쓰지 않을 때의 대체 추출 경로입니다. 모든 추출기는 같은 규칙
+(제목/본문 후보 선택자를 순서대로 시도하고, 없으면 긴 <p> 문단을 모음)을 따르며
+extract(html, rules) -> {'title', 'text', ...} 인터페이스를 구현합니다.
+rules에는 도메인별로 먼저 시도할 선택자를 넘깁니다. (utils.extract_rules 참고)
+
+- lxml: lxml.html + 미리 컴파일한 XPath (기본값, 가장 빠름)
+- soup: BeautifulSoup html.parser (기존 구현, lxml이 없거나 lxml 파싱이 실패하면 사용)
+
+    extractor = get_extractor('lxml')
+    result = extractor.extract(html)   # {'title': ..., 'text': ...}
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 제목/본문 후보 CSS 선택자 (앞에서부터 처음 찾은 요소 사용)
+TITLE_SELECTORS = ['h1', '.title', '.headline', 'title', '[class*="title"]', '[class*="headline"]']
+CONTENT_SELECTORS = [
+    '[class*="content"]', '[class*="article"]', '[class*="body"]',
+    '.article-body', '.content-body', '.post-content',
+    'article', 'main', '.main-content'
+]
+# 본문 요소 안에서 제거할 태그
+NOISE_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside']
+# 본문 선택자가 모두 실패했을 때 모을 문단의 최소 길이
+MIN_PARAGRAPH_LENGTH = 50
+# 도메인 규칙(선택자 메모)으로 찾은 본문을 받아들이는 최소 길이
+MIN_RULE_BODY_LENGTH = 100
+# 발행 시각을 읽을 <meta> 이름 (property 또는 name 속성, 앞에서부터 처음 읽히는 값 사용)
+DATE_META_KEYS = ['article:published_time', 'og:article:published_time', 'pubdate', 'publish-date']
+
+
+_INLINE_SPACE_RE = re.compile(r'[ \t\r\f\v]+')
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*)?((?:\.[\w-]+|\[class\*="[^"]+"\])*)$')
+_SELECTOR_PART_RE = re.compile(r'\.([\w-]+)|\[class\*="([^"]+)"\]')
+
+
+def clean_text(text: str) -> str:
+    """줄마다 연속 공백을 하나로 줄이고 앞뒤 공백과 빈 줄을 지웁니다.
+
+    파서마다 태그 사이의 공백 문자열을 다르게 남기므로(html.parser는 줄바꿈만 남김)
+    이렇게 정리해야 lxml/soup 추출 결과가 같아집니다.
+    """
+    lines = (_INLINE_SPACE_RE.sub(' ', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_meta_date(value: Optional[str]) -> Optional[datetime]:
+    """<meta>의 ISO 8601 날짜 문자열('2026-03-09T07:30:12+09:00', 끝의 'Z' 포함)을 datetime으로. 읽을 수 없으면 None"""
+    value = (value or '').strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def css_to_xpath(selector: str) -> str:
+    """단순 선택자(tag, .class, [class*="x"] 및 그 조합, 예: div.story-news)를 XPath로 바꿉니다."""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        raise ValueError(f"지원하지 않는 선택자: {selector}")
+    conditions = []
+    for class_name, contains in _SELECTOR_PART_RE.findall(match.group(2) or ''):
+        if class_name:
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')")
+        else:
+            conditions.append(f"contains(@class, '{contains}')")
+    predicate = f"[{' and '.join(conditions)}]" if conditions else ''
+    return f"//{match.group(1) or '*'}{predicate}"
+
+
+def selector_matcher(selector: str) -> Callable[[str, str], bool]:
+    """단순 선택자(css_to_xpath와 같은 형식)를 (태그 이름, class 속성) 판별 함수로 바꿉니다."""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        raise ValueError(f"지원하지 않는 선택자: {selector}")
+    tag = (match.group(1) or '').lower()
+    parts = _SELECTOR_PART_RE.findall(match.group(2) or '')
+
+    def matches(elem_tag: str, class_attr: str) -> bool:
+        if tag and str(elem_tag).lower() != tag:
+            return False
+        classes = class_attr.split()
+        return all((class_name in classes) if class_name else (contains in class_attr)
+                   for class_name, contains in parts)
+    return matches
+
+
+class ArticleExtractor:
+    """추출기 인터페이스
+
+    하위 클래스는 파서별 기본 연산(_parse, _select_one, _text, _drop_noise, _paragraphs, _meta)만
+    구현하고, 선택자를 시도하는 순서와 규칙은 이 클래스가 공통으로 처리합니다.
+    """
+
+    name = 'base'
+
+    def _parse(self, html: str) -> Any:
+        raise NotImplementedError
+
+    def _select_one(self, root: Any, selector: str) -> Any:
+        """selector에 맞는 첫 요소. 없거나 자식(텍스트 포함)이 하나도 없는 빈 요소면 None"""
+        raise NotImplementedError
+
+    def _text(self, elem: Any) -> str:
+        raise NotImplementedError
+
+    def _drop_noise(self, elem: Any):
+        raise NotImplementedError
+
+    def _paragraphs(self, root: Any) -> List[str]:
+        raise NotImplementedError
+
+    def _meta(self, root: Any, key: str) -> Optional[str]:
+        """property 또는 name 속성이 key인 첫 <meta>의 content. 없으면 None"""
+        raise NotImplementedError
+
+    def _publish_date(self, root: Any) -> Optional[datetime]:
+        for key in DATE_META_KEYS:
+            published = parse_meta_date(self._meta(root, key))
+            if published is not None:
+                return published
+        return None
+
+    def extract(self, html: str, rules: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """HTML에서 {'title', 'text', 'publish_date'}를 추출합니다. 제목이 없으면 '제목 없음'
+
+        publish_date는 <meta>(DATE_META_KEYS)에 적힌 발행 시각이며, 없으면 None입니다.
+
+        rules({'title': [...], 'content': [...]})를 주면 해당 선택자를 먼저 시도하고,
+        결과가 부실하면(본문 MIN_RULE_BODY_LENGTH자 미만) 기본 선택자 순서대로 다시 찾습니다.
+        결과에는 실제로 쓴 선택자(title_selector, content_selector)와 선택자 조회 횟수(probes)가 들어갑니다.
+        """
+        rules = rules or {}
+        root = self._parse(html)
+        probes = 0
+
+        title, title_selector = "", None
+        for selector in rules.get('title', []):
+            probes += 1
+            title_elem = self._select_one(root, selector)
+            if title_elem is not None:
+                title = clean_text(self._text(title_elem))
+                if title:
+                    title_selector = selector
+                    break
+        if not title:
+            for selector in TITLE_SELECTORS:
+                probes += 1
+                title_elem = self._select_one(root, selector)
+                if title_elem is not None:
+                    title, title_selector = clean_text(self._text(title_elem)), selector
+                    break
+        if not title:
+            title_elem = self._select_one(root, 'title')
+            title = clean_text(self._text(title_elem)) if title_elem is not None else "제목 없음"
+
+        text, content_selector = "", None
+        for selector in rules.get('content', []):
+            probes += 1
+            content_elem = self._select_one(root, selector)
+            if content_elem is not None:
+                self._drop_noise(content_elem)
+                candidate = clean_text(self._text(content_elem))
+                if len(candidate) >= MIN_RULE_BODY_LENGTH:
+                    text, content_selector = candidate, selector
+                    break
+        if not text:
+            for selector in CONTENT_SELECTORS:
+                probes += 1
+                content_elem = self._select_one(root, selector)
+                if content_elem is not None:
+                    self._drop_noise(content_elem)
+                    text, content_selector = clean_text(self._text(content_elem)), selector
+                    break
+        if not text:
+            content_selector = None
+            text = ' '.join([t for t in self._paragraphs(root) if len(t) > MIN_PARAGRAPH_LENGTH])
+        return {'title': title, 'text': text, 'publish_date': self._publish_date(root),
+                'title_selector': title_selector, 'content_selector': content_selector, 'probes': probes}
+
+
+class SoupExtractor(ArticleExtractor):
+    """BeautifulSoup(html.parser) 기반 추출기 (기존 구현)"""
+
+    name = 'soup'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup_cls = BeautifulSoup
+
+    def _parse(self, html: str) -> Any:
+        return self._soup_cls(html, 'html.parser')
+
+    def _select_one(self, root: Any, selector: str) -> Any:
+        found = root.select_one(selector)
+        if found is None or not found.contents:
+            return None  # 자식(텍스트 포함)이 없는 빈 요소는 없는 것으로 취급 (Tag는 비어 있어도 참이므로 직접 확인)
+        return found
+
+    def _text(self, elem: Any) -> str:
+        return elem.get_text()
+
+    def _drop_noise(self, elem: Any):
+        for noise in elem(NOISE_TAGS):
+            noise.decompose()
+
+    def _paragraphs(self, root: Any) -> List[str]:
+        return [clean_text(p.get_text()) for p in root.find_all('p')]
+
+    def _meta(self, root: Any, key: str) -> Optional[str]:
+        for meta in root.find_all('meta'):
+            if key in (meta.get('property'), meta.get('name')):
+                return meta.get('content')
+        return None
+
+
+class LxmlExtractor(ArticleExtractor):
+    """lxml.html 기반 추출기. 선택자는 처음 쓸 때 한 번만 XPath로 컴파일합니다."""
+
+    name = 'lxml'
+
+    def __init__(self):
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml이 설치되지 않았습니다.")
+        self._compiled: Dict[str, Any] = {}
+        self._compile_lock = threading.Lock()
+        for selector in TITLE_SELECTORS + CONTENT_SELECTORS:
+            self._xpath(selector)
+        self._paragraph_path = etree.XPath("//p")
+        self._noise = etree.XPath(' | '.join(f"descendant::{tag}" for tag in NOISE_TAGS))
+        self._meta_path = etree.XPath("(//meta[@property=$key or @name=$key])[1]/@content")
+
+    def _xpath(self, selector: str):
+        compiled = self._compiled.get(selector)
+        if compiled is None:
+            with self._compile_lock:
+                compiled = self._compiled[selector] = etree.XPath(f"({css_to_xpath(selector)})[1]")
+        return compiled
+
+    def _parse(self, html: str) -> Any:
+        # 인코딩 선언이 들어 있는 str은 lxml이 거부하므로 바이트로 넘김
+        return lxml_html.document_fromstring(html.encode('utf-8'),
+                                             parser=lxml_html.HTMLParser(encoding='utf-8'))
+
+    def _select_one(self, root: Any, selector: str) -> Any:
+        found = self._xpath(selector)(root)
+        if not found or not (len(found[0]) or found[0].text):
+            return None  # 자식이 없는 빈 요소는 없는 것으로 취급 (soup과 동일)
+        return found[0]
+
+    def _text(self, elem: Any) -> str:
+        return elem.text_content()
+
+    def _drop_noise(self, elem: Any):
+        for noise in self._noise(elem):
+            noise.drop_tree()  # 뒤따르는 텍스트(tail)는 남김
+
+    def _paragraphs(self, root: Any) -> List[str]:
+        return [clean_text(p.text_content()) for p in self._paragraph_path(root)]
+
+    def _meta(self, root: Any, key: str) -> Optional[str]:
+        found = self._meta_path(root, key=key)
+        return str(found[0]) if found else None
+
+
+class FallbackExtractor(ArticleExtractor):
+    """주 추출기가 실패(예외)하면 다음 추출기로 다시 시도합니다."""
+
+    def __init__(self, extractors: List[ArticleExtractor]):
+        self.extractors = extractors
+        self.name = extractors[0].name
+
+    def extract(self, html: str, rules: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        for i, extractor in enumerate(self.extractors):
+            try:
+                return extractor.extract(html, rules)
+            except Exception as e:
+                if i == len(self.extractors) - 1:
+                    raise
+                logger.debug(f"{extractor.name} 추출 실패, {self.extractors[i + 1].name}(으)로 재시도: {e}")
+        raise RuntimeError("unreachable")
+
+
+EXTRACTORS = {
+    'lxml': LxmlExtractor,
+    'soup': SoupExtractor,
+}
+DEFAULT_EXTRACTOR = 'lxml'
+
+
+def get_extractor(name: Optional[str] = None) -> ArticleExtractor:
+    """이름으로 추출기를 만듭니다. lxml을 쓸 수 없으면 soup 추출기를 반환합니다.
+
+    soup 이외의 추출기는 실패하면 soup 추출기로 다시 시도하도록 감쌉니다.
+    """
+    name = (name or DEFAULT_EXTRACTOR).strip().lower()
+    if name not in EXTRACTORS:
+        logger.warning(f"알 수 없는 본문 추출기 '{name}', {DEFAULT_EXTRACTOR} 사용")
+        name = DEFAULT_EXTRACTOR
+    if name == 'soup':
+        return SoupExtractor()
+    try:
+        primary = EXTRACTORS[name]()
+    except ImportError as e:
+        logger.warning(f"{name} 추출기를 사용할 수 없어 soup 추출기를 사용합니다: {e}")
+        return SoupExtractor()
+    try:
+        return FallbackExtractor([primary, SoupExtractor()])
+    except ImportError:
+        return primary
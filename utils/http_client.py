@@ -0,0 +1,327 @@
+"""RSS/기사 다운로드가 함께 쓰는 공용 HTTP 클라이언트 계층.
+
+RSS 피드와 기사 HTML은 대부분 같은 호스트(yna.co.kr)에서 오므로, 한 곳에서 만든
+httpx 클라이언트로 연결을 재사용합니다.
+
+- HTTP/2 (h2 패키지가 있으면): 같은 호스트 요청을 연결 하나에 다중화
+- gzip/brotli 전송 압축 (brotli 패키지가 있으면 br도 요청), keep-alive
+- 작은 DNS 캐시 (이 모듈의 클라이언트 전송 계층에서만 조회 결과를 TTL 동안 재사용)
+- 호스트별 연결 통계: 요청 수, 새로 연 연결 수, HTTP 버전
+
+동기 클라이언트(get)는 RSS 피드가, async_client()로 만든 비동기 클라이언트는
+기사 다운로드 엔진(utils.async_fetch)이 씁니다. 두 클라이언트는 설정, DNS 캐시와 통계를 공유하지만
+httpx의 동기/비동기 연결 풀은 서로 공유할 수 없으므로 연결 풀은 각자 가집니다.
+(RSS는 실행 초반에 몇 건뿐이라 기사 다운로드 쪽 풀이 연결 재사용의 대부분을 차지)
+
+    http = SharedHttpClient(user_agent=...)
+    response = http.get(url, headers={'If-None-Match': etag})
+    engine = AsyncArticleFetcher(parse_fn, client_factory=http.async_client)
+    http.log_stats()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi'))
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36')
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_DNS_TTL = 300           # 초, 0이면 DNS 캐시 사용 안 함
+DNS_CACHE_MAX_ENTRIES = 256
+
+
+class DnsCache:
+    """호스트 이름 → IP 주소 조회 결과를 TTL 동안 재사용하는 작은 캐시 (스레드 안전)
+
+    프로세스 전역 socket.getaddrinfo를 바꾸지 않고, 이 모듈이 만든 httpx 클라이언트의 전송 계층
+    (_CachingBackend/_AsyncCachingBackend)에서만 씁니다. Anthropic/gspread 등 다른 라이브러리의
+    이름 조회에는 영향이 없습니다. 실패한 조회는 캐시하지 않습니다.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, max_entries: int = DNS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, host: str, port: int) -> Optional[str]:
+        """캐시된 주소. 없거나 만료되었으면 None (IP 주소는 그대로 돌려줌)"""
+        if _is_ip_address(host):
+            return host
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end((host, port))
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def store(self, host: str, port: int, infos: List[tuple]) -> str:
+        """getaddrinfo 결과의 첫 주소를 기록하고 반환합니다."""
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, address)
+            self._entries.move_to_end((host, port))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return address
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def resolve(self, host: str, port: int) -> str:
+        address = self.lookup(host, port)
+        if address is None:
+            address = self.store(host, port, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        return address
+
+    async def resolve_async(self, host: str, port: int) -> str:
+        address = self.lookup(host, port)
+        if address is None:
+            loop = asyncio.get_running_loop()
+            address = self.store(host, port, await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        return address
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class _CachingBackend(httpcore.NetworkBackend):
+    """DnsCache로 푼 주소로 TCP 연결을 맺는 동기 네트워크 계층 (TLS SNI/Host 헤더는 원래 호스트 이름)
+
+    캐시된 주소로 연결하지 못하면 캐시를 지우고 호스트 이름으로 한 번 더 연결합니다.
+    """
+
+    def __init__(self, backend: httpcore.NetworkBackend, cache: DnsCache):
+        self._backend = backend
+        self._cache = cache
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            address = self._cache.resolve(host, port)
+        except OSError:
+            address = host  # 조회 실패는 원래 경로(연결 오류)로 드러나게 함
+        try:
+            return self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+        except httpcore.ConnectError:
+            if address == host:
+                raise
+            self._cache.forget(host, port)
+            return self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds):
+        self._backend.sleep(seconds)
+
+
+class _AsyncCachingBackend(httpcore.AsyncNetworkBackend):
+    """_CachingBackend의 비동기 버전 (조회는 이벤트 루프의 getaddrinfo 사용)"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, cache: DnsCache):
+        self._backend = backend
+        self._cache = cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            address = await self._cache.resolve_async(host, port)
+        except OSError:
+            address = host
+        try:
+            return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+        except httpcore.ConnectError:
+            if address == host:
+                raise
+            self._cache.forget(host, port)
+            return await self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+class HttpMetrics:
+    """호스트별 요청/연결 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.connections: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.versions: Dict[str, Counter] = {}
+
+    def on_trace(self, host: str, event: str):
+        # httpcore trace 이벤트: 새 TCP 연결을 맺을 때만 connect_tcp 이벤트가 옴
+        if event == 'connection.connect_tcp.complete':
+            with self._lock:
+                self.connections[host] += 1
+
+    def on_request(self, host: str):
+        with self._lock:
+            self.requests[host] += 1
+
+    def on_response(self, host: str, http_version: str, status_code: int):
+        with self._lock:
+            self.versions.setdefault(host, Counter())[http_version] += 1
+            if status_code >= 400:
+                self.errors[host] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                host: {
+                    'requests': self.requests[host],
+                    'connections': self.connections[host],
+                    'errors': self.errors[host],
+                    'versions': dict(self.versions.get(host, {})),
+                }
+                for host in self.requests
+            }
+
+
+class SharedHttpClient:
+    """연결 풀을 공유하는 동기 httpx 클라이언트 + 같은 설정의 비동기 클라이언트 생성기"""
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 http2: bool = True,
+                 dns_ttl: float = DEFAULT_DNS_TTL):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 패키지가 없어 HTTP/1.1로 연결합니다. (pip install h2)")
+        self.metrics = HttpMetrics()
+        self.dns_cache: Optional[DnsCache] = DnsCache(ttl=dns_ttl) if dns_ttl > 0 else None
+        transport = httpx.HTTPTransport(**self._transport_options())
+        self._use_dns_cache(transport, _CachingBackend)
+        self.client = httpx.Client(
+            **self._options(),
+            transport=transport,
+            event_hooks={'request': [self._on_request], 'response': [self._on_response]},
+        )
+
+    def _options(self) -> Dict[str, Any]:
+        # Accept-Encoding은 httpx가 설치된 디코더(gzip, deflate, br, zstd)에 맞춰 붙임
+        return {
+            'headers': {'User-Agent': self.user_agent},
+            'timeout': self.timeout,
+            'follow_redirects': True,
+        }
+
+    def _transport_options(self) -> Dict[str, Any]:
+        # transport를 직접 넘기면 클라이언트의 http2/limits 인자는 쓰이지 않으므로 전송 계층에 줌
+        return {
+            'http2': self.http2,
+            'limits': httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections,
+                                   keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY),
+        }
+
+    def _use_dns_cache(self, transport: Any, backend_cls: type):
+        """전송 계층의 연결 풀이 DNS 캐시를 거쳐 연결하도록 네트워크 계층을 감쌉니다."""
+        if self.dns_cache is None:
+            return
+        pool = getattr(transport, '_pool', None)
+        if pool is None or not hasattr(pool, '_network_backend'):
+            logger.info("이 httpx 버전에서는 DNS 캐시를 쓸 수 없어 건너뜁니다.")
+            return
+        pool._network_backend = backend_cls(pool._network_backend, self.dns_cache)
+
+    def _on_request(self, request: httpx.Request):
+        host = request.url.host
+        self.metrics.on_request(host)
+        request.extensions['trace'] = lambda event, info: self.metrics.on_trace(host, event)
+
+    def _on_response(self, response: httpx.Response):
+        self.metrics.on_response(response.request.url.host, response.http_version, response.status_code)
+
+    async def _on_request_async(self, request: httpx.Request):
+        host = request.url.host
+        self.metrics.on_request(host)
+
+        async def trace(event: str, info: Dict[str, Any]):
+            self.metrics.on_trace(host, event)
+        request.extensions['trace'] = trace
+
+    async def _on_response_async(self, response: httpx.Response):
+        self._on_response(response)
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """공유 연결 풀로 GET 요청을 보냅니다. (스레드 안전)"""
+        return self.client.get(url, **kwargs)
+
+    def async_client(self, **overrides: Any) -> httpx.AsyncClient:
+        """같은 설정/통계를 쓰는 비동기 클라이언트를 만듭니다. (사용하는 이벤트 루프 안에서 호출)"""
+        options = self._options()
+        options.update(overrides)
+        if 'transport' not in options:
+            transport = httpx.AsyncHTTPTransport(**self._transport_options())
+            self._use_dns_cache(transport, _AsyncCachingBackend)
+            options['transport'] = transport
+        return httpx.AsyncClient(
+            **options,
+            event_hooks={'request': [self._on_request_async], 'response': [self._on_response_async]},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        hosts = self.metrics.snapshot()
+        return {
+            'http2': self.http2,
+            'brotli': BROTLI_AVAILABLE,
+            'requests': sum(h['requests'] for h in hosts.values()),
+            'connections': sum(h['connections'] for h in hosts.values()),
+            'dns_hits': self.dns_cache.hits if self.dns_cache else 0,
+            'dns_misses': self.dns_cache.misses if self.dns_cache else 0,
+            'hosts': hosts,
+        }
+
+    def log_stats(self):
+        st = self.stats()
+        if not st['requests']:
+            return
+        logger.info(
+            f"HTTP 연결 통계: 요청 {st['requests']}건, 새 연결 {st['connections']}개 "
+            f"(HTTP/2 {'사용' if st['http2'] else '미사용'}, brotli {'사용' if st['brotli'] else '미사용'}), "
+            f"DNS 캐시 적중 {st['dns_hits']}회 / 조회 {st['dns_misses']}회"
+        )
+        for host, h in sorted(st['hosts'].items(), key=lambda item: -item[1]['requests']):
+            versions = ', '.join(f"{v} {n}" for v, n in sorted(h['versions'].items()))
+            logger.info(f"  {host}: 요청 {h['requests']}건, 연결 {h['connections']}개, "
+                        f"오류 {h['errors']}건 ({versions})")
+
+    def close(self):
+        self.client.close()
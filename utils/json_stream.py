@@ -0,0 +1,98 @@
+"""스트리밍 응답에서 완성된 JSON 객체를 점진적으로 찾아내는 스캐너.
+
+응답 텍스트 조각을 feed()로 넣으면 괄호 깊이와 문자열/이스케이프 상태를 이어서 추적하고,
+최상위 객체({...}) 또는 최상위 배열의 원소 객체([{...}, {...}])가 닫히는 순간 파싱해 둡니다.
+앞뒤의 코드 펜스(```json)나 설명 문장은 건너뜁니다. 설명 속 괄호('[참고]' 등)를 최상위 값으로
+잘못 잡지 않도록, '['는 바로 뒤(공백 제외)가 '{'일 때만 배열로 보고, 객체를 하나도 얻지 못한
+최상위 값은 끝난 것으로 치지 않습니다. (closed는 객체를 얻은 최상위 값이 닫혔을 때만 True)
+
+    scanner = JsonStreamScanner()
+    for delta in stream.text_stream:
+        scanner.feed(delta)
+        if scanner.objects:          # 첫 객체가 완성되면 스트림을 닫아도 됨
+            break
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_NON_SPACE_RE = re.compile(r'\S')
+
+
+class JsonStreamScanner:
+    """텍스트 조각을 받아 완성된 JSON 객체 목록(objects)을 채웁니다."""
+
+    def __init__(self):
+        self.text = ''
+        self.objects: List[Dict[str, Any]] = []
+        self.closed = False        # 최상위 값(객체 또는 배열)이 끝났는지
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._object_start: Optional[int] = None
+        self._value_objects = 0    # 지금 스캔 중인 최상위 값에서 얻은 객체 수
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """조각을 이어 붙여 스캔하고 이번에 새로 완성된 객체들을 반환합니다."""
+        self.text += chunk
+        found: List[Dict[str, Any]] = []
+        text = self.text
+        i = self._pos
+        while i < len(text) and not self.closed:
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                i += 1
+                continue
+            if not self._stack:
+                if ch not in '{[':
+                    i += 1
+                    continue  # 최상위 값 앞의 펜스/설명
+                if ch == '[':
+                    # 설명 속 '[참고]' 같은 괄호는 배열이 아님: 다음 글자가 '{'일 때만 최상위 배열로 봄
+                    nxt = _NON_SPACE_RE.search(text, i + 1)
+                    if nxt is None:
+                        break  # 다음 글자가 아직 오지 않음 (이 위치부터 다시 스캔)
+                    if nxt.group() != '{':
+                        i += 1
+                        continue
+                self._value_objects = 0
+            if ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._stack.append(ch)
+                # 최상위 객체 또는 최상위 배열의 원소 객체가 시작됨
+                if ch == '{' and (len(self._stack) == 1 or self._stack[:-1] == ['[']):
+                    self._object_start = i
+            elif ch in '}]':
+                self._stack.pop()
+                if ch == '}' and self._object_start is not None and (not self._stack or self._stack == ['[']):
+                    obj = self._parse(text[self._object_start:i + 1])
+                    if obj is not None:
+                        found.append(obj)
+                        self._value_objects += 1
+                    self._object_start = None
+                if not self._stack:
+                    # 객체를 하나도 얻지 못한 최상위 값(설명 속 '{...}' 등)은 버리고 계속 찾음
+                    self.closed = self._value_objects > 0
+            i += 1
+        self._pos = i
+        self.objects.extend(found)
+        return found
+
+    @staticmethod
+    def _parse(fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(fragment, strict=False)  # 문자열 안의 줄바꿈 허용
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
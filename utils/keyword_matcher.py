@@ -0,0 +1,214 @@
+"""가중치 키워드 사전을 한 번에 검사하는 Aho-Corasick 매처.
+
+rank_and_select_news의 키워드 점수(제목에 포함된 키워드 가중치의 합)를
+키워드 수와 무관하게 제목 길이에 비례하는 한 번의 순회로 계산합니다.
+가중치 표마다 한 번만 오토마톤을 만들고 재사용합니다.
+
+벤치마크:
+    python -m utils.keyword_matcher --titles 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# 한 글자 키워드 뒤에 붙어도 같은 단어로 보는 조사
+KOREAN_PARTICLES = set('이가은는을를의에도만과와로')
+
+
+def _is_hangul(ch: str) -> bool:
+    return '가' <= ch <= '힣'
+
+
+def _is_ascii_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class KeywordMatcher:
+    """키워드 → 가중치 사전으로 만든 Aho-Corasick 오토마톤.
+
+    score(text)는 text에 한 번 이상 등장하는 키워드들의 가중치 합을 반환하며
+    `sum(w for k, w in weights.items() if k in text)`와 같은 결과를 냅니다.
+
+    korean_boundaries=True이면 짧은 키워드에 경계 규칙을 적용합니다.
+    - 한 글자 한글 키워드('암' 등)는 뒤에 한글이 이어지면 조사일 때만 인정
+      ('폐암', '암이' 는 인정, '암호화폐', '암살' 은 제외)
+    - 영문/숫자 키워드('AI' 등)는 앞뒤에 영문/숫자가 붙어 있으면 제외
+    """
+
+    def __init__(self, weights: Dict[str, float], korean_boundaries: bool = False,
+                 short_keyword_len: int = 1):
+        self.keywords: List[str] = [k for k in weights if k]
+        self.weights: List[float] = [weights[k] for k in self.keywords]
+        self.korean_boundaries = korean_boundaries
+        # 경계 규칙을 적용할 키워드 인덱스
+        self._boundary_ids = set()
+        if korean_boundaries:
+            for i, kw in enumerate(self.keywords):
+                if kw.isascii() or (len(kw) <= short_keyword_len and _is_hangul(kw[-1])):
+                    self._boundary_ids.add(i)
+        self._build()
+        self._score_memo: Dict[int, float] = {0: 0}
+
+    def _build(self):
+        # 1. 트라이 구성
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[int] = [0]  # 상태별 키워드 비트마스크
+        for idx, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(0)
+                state = nxt
+            outputs[state] |= 1 << idx
+
+        # 2. 실패 링크를 BFS로 계산하면서 전이표를 완전한 DFA로 확장
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            # 실패 상태의 전이를 상속하고 자신의 전이로 덮어씀
+            trans = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                trans[ch] = nxt
+                queue.append(nxt)
+            delta[state] = trans
+
+        self._delta = delta
+        self._outputs = outputs
+        self._boundary_mask = sum(1 << i for i in self._boundary_ids)
+
+    def match_mask(self, text: str) -> int:
+        """text에 등장하는 키워드들의 비트마스크를 반환합니다."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        mask = 0
+        if not self._boundary_mask:
+            for ch in text:
+                state = delta[state].get(ch, 0)
+                mask |= outputs[state]
+            return mask
+
+        for pos, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            out = outputs[state]
+            if not out:
+                continue
+            checked = out & self._boundary_mask
+            mask |= out & ~self._boundary_mask
+            while checked:
+                bit = checked & -checked
+                checked ^= bit
+                kw = self.keywords[bit.bit_length() - 1]
+                if self._boundary_ok(text, pos - len(kw) + 1, pos + 1, kw):
+                    mask |= bit
+        return mask
+
+    @staticmethod
+    def _boundary_ok(text: str, start: int, end: int, kw: str) -> bool:
+        before = text[start - 1] if start > 0 else ''
+        after = text[end] if end < len(text) else ''
+        if kw.isascii():
+            return not (before and _is_ascii_alnum(before)) and not (after and _is_ascii_alnum(after))
+        if after and _is_hangul(after):
+            return after in KOREAN_PARTICLES
+        return True
+
+    def matches(self, text: str) -> List[str]:
+        """text에 등장하는 키워드 목록"""
+        mask = self.match_mask(text)
+        return [kw for i, kw in enumerate(self.keywords) if mask >> i & 1]
+
+    def score(self, text: str) -> float:
+        """text에 등장하는 키워드 가중치 합"""
+        mask = self.match_mask(text)
+        memo = self._score_memo
+        cached = memo.get(mask)
+        if cached is None:
+            # 낮은 비트(= 키워드 사전 순서)부터 더해 기존 루프와 같은 결과를 보장
+            weights = self.weights
+            cached = 0
+            rest = mask
+            while rest:
+                bit = rest & -rest
+                rest ^= bit
+                cached += weights[bit.bit_length() - 1]
+            if len(memo) < 65536:
+                memo[mask] = cached
+        return cached
+
+
+def naive_score(weights: Dict[str, float], text: str) -> float:
+    """기존 방식(키워드마다 부분 문자열 검사)의 점수 계산"""
+    return sum(w for k, w in weights.items() if k in text)
+
+
+def _synthetic_titles(keywords: List[str], count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    filler = ['정부', '발표', '오늘', '내일', '시장', '서울', '전국', '관련', '확대', '논란',
+              '검토', '추진', '우려', '전망', '강화', '지원', '대책', '현장', '속보', '단독']
+    titles = []
+    for _ in range(count):
+        words = rng.sample(filler, rng.randint(3, 6))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        titles.append(' '.join(words))
+    return titles
+
+
+def benchmark(weights: Dict[str, float], count: int = 100_000) -> Tuple[float, float, Optional[str]]:
+    """합성 제목 count개로 기존 방식과 매처의 처리 시간을 비교합니다.
+
+    Returns:
+        (기존 방식 초, 매처 초, 점수가 다른 첫 제목 또는 None)
+    """
+    titles = _synthetic_titles(list(weights), count)
+    matcher = KeywordMatcher(weights)
+
+    started = time.perf_counter()
+    expected = [naive_score(weights, t) for t in titles]
+    naive_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [matcher.score(t) for t in titles]
+    matcher_elapsed = time.perf_counter() - started
+
+    mismatch = next((t for t, a, b in zip(titles, expected, actual) if a != b), None)
+    return naive_elapsed, matcher_elapsed, mismatch
+
+
+def main():
+    parser = argparse.ArgumentParser(description='키워드 매처 벤치마크')
+    parser.add_argument('--titles', type=int, default=100_000, help='합성 제목 개수')
+    parser.add_argument('--scale', type=int, default=1,
+                        help='키워드 사전을 몇 배로 늘려 측정할지 (키워드 수 증가 시 비교용)')
+    args = parser.parse_args()
+
+    # 실제 뉴스 선정에 사용하는 가중치 표
+    from utils.news_ranking import KEYWORD_WEIGHTS
+    weights = dict(KEYWORD_WEIGHTS)
+    for n in range(1, args.scale):
+        weights.update({f'{k}{n}': w for k, w in KEYWORD_WEIGHTS.items()})
+
+    naive_elapsed, matcher_elapsed, mismatch = benchmark(weights, args.titles)
+    print(f"키워드 {len(weights)}개, 제목 {args.titles:,}개")
+    print(f"  기존 방식 : {naive_elapsed:.3f}초 ({args.titles / naive_elapsed:,.0f} 제목/초)")
+    print(f"  Aho-Corasick: {matcher_elapsed:.3f}초 ({args.titles / matcher_elapsed:,.0f} 제목/초)")
+    print("  점수 일치: " + ("예" if mismatch is None else f"아니오 (예: {mismatch})"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""모든 단계가 함께 쓰는 Claude 호출 게이트웨이.
+
+- 연결을 재사용하는 Anthropic 클라이언트 하나를 프로세스 전체에서 공유합니다.
+  (호출마다 클라이언트를 만들며 생기는 TLS 핸드셰이크 제거)
+- 분당 요청 수(RPM)와 분당 입력 토큰 수(TPM)를 토큰 버킷으로 지켜
+  속도 제한에 걸리기 직전까지 요청을 흘려보냅니다.
+- 429/529/5xx/연결 오류는 서버의 Retry-After 값(없으면 지수 백오프)만큼
+  기다렸다가 재시도하며, 429가 오면 다른 스레드의 요청도 함께 멈춥니다.
+- create(stop_when=...)를 주면 스트리밍으로 받다가 stop_when(지금까지의 텍스트 조각)이
+  True를 반환하는 즉시 스트림을 닫습니다. (필요한 JSON이 완성된 뒤의 출력 생략)
+
+    from utils.llm_gateway import generate
+    text = generate(prompt, max_tokens=1200, temperature=0.7)
+
+설정(환경 변수): CLAUDE_API_KEY, CLAUDE_BASE_URL, CLAUDE_RPM, CLAUDE_TPM
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import httpx
+from anthropic import Anthropic, APIConnectionError, APIStatusError, RateLimitError
+
+try:
+    from utils.llm_usage import UsageTracker
+except ImportError:  # utils 폴더를 경로에 두고 실행하는 스크립트(step5)용
+    from llm_usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "claude-sonnet-4-6"
+DEFAULT_MAX_TOKENS = 1200
+DEFAULT_RPM = 50
+DEFAULT_TPM = 30000
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_TIMEOUT = 120.0
+
+# Retry-After가 없을 때의 재시도 대기(초): 2, 4, 8, ... 최대 60
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+def is_retryable(error: Exception) -> bool:
+    """연결/타임아웃 오류, 또는 상태 코드가 429/529(overloaded)/5xx인 API 오류면 True
+
+    SDK는 529를 InternalServerError의 하위 클래스가 아닌 OverloadedError로 올리므로
+    예외 종류 대신 상태 코드로 판별합니다.
+    """
+    if isinstance(error, APIConnectionError):  # APITimeoutError 포함
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def estimate_tokens(text: str) -> int:
+    """입력 토큰 수 대략 추정 (한글은 글자당 약 1토큰, 영문/숫자는 3~4글자당 1토큰)"""
+    return max(1, len(text.encode('utf-8')) // 3)
+
+
+def _request_text(params: Dict[str, Any]) -> str:
+    parts: List[str] = []
+    system = params.get('system')
+    if isinstance(system, str):
+        parts.append(system)
+    elif system:
+        parts.extend(b.get('text', '') for b in system)
+    for message in params.get('messages', []):
+        content = message.get('content')
+        if isinstance(content, str):
+            parts.append(content)
+        elif content:
+            parts.extend(b.get('text', '') for b in content if isinstance(b, dict))
+    return ''.join(parts)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """오류 응답의 retry-after-ms / retry-after 헤더 값(초). 없으면 None"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """분당 한도를 초당 균일하게 채우는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """amount만큼 토큰을 꺼냅니다. 부족하면 채워질 때까지 기다리고 기다린 시간(초)을 반환합니다."""
+        amount = min(amount, self.capacity)  # 한도보다 큰 요청도 언젠가는 통과하도록
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float):
+        """실제 사용량이 추정과 달랐을 때 차이를 반영합니다. (양수면 더 차감)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class LLMGateway:
+    """공유 Anthropic 클라이언트 + 속도 제한 + 재시도"""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM,
+                 max_retries: int = DEFAULT_MAX_RETRIES, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: float = DEFAULT_TIMEOUT, default_model: str = DEFAULT_MODEL,
+                 usage: Optional[UsageTracker] = None):
+        self.default_model = default_model
+        self.max_retries = max_retries
+        self.requests_bucket = TokenBucket(rpm)
+        self.tokens_bucket = TokenBucket(tpm)
+        self.usage = usage or UsageTracker('Claude')
+        self._pause_lock = threading.Lock()
+        self._paused_until = 0.0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self.streamed = 0
+        self.early_stops = 0
+
+        http_client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        # 재시도는 게이트웨이가 직접 처리 (SDK 내부 재시도는 끔)
+        self.client = Anthropic(api_key=api_key, base_url=base_url, max_retries=0, http_client=http_client)
+
+    def _pause(self, seconds: float):
+        """모든 스레드의 다음 요청을 seconds초 뒤로 미룹니다."""
+        with self._pause_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_turn(self, estimated_tokens: int):
+        while True:
+            with self._pause_lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(remaining)
+            self.throttled_seconds += remaining
+        self.throttled_seconds += self.requests_bucket.acquire(1)
+        self.throttled_seconds += self.tokens_bucket.acquire(estimated_tokens)
+
+    def _stream(self, params: Dict[str, Any], stop_when: Callable[[str], bool]):
+        """스트리밍으로 받다가 stop_when이 True가 되면 닫고, 지금까지의 Message 스냅샷을 반환합니다."""
+        with self.client.messages.stream(**params) as stream:
+            received = []
+            for delta in stream.text_stream:
+                received.append(delta)
+                if stop_when(delta):
+                    # 중단한 메시지는 message_delta(usage)를 받지 못했으므로 출력 토큰은 추정치로 채움
+                    message = stream.current_message_snapshot
+                    message.usage.output_tokens = max(message.usage.output_tokens or 0,
+                                                      estimate_tokens(''.join(received)))
+                    self.early_stops += 1
+                    return message
+            return stream.get_final_message()
+
+    def create(self, label: str = '', stop_when: Optional[Callable[[str], bool]] = None, **params):
+        """messages.create를 속도 제한/재시도와 함께 호출하고 Message 객체를 반환합니다.
+
+        stop_when(텍스트 조각)을 주면 스트리밍으로 받고, True를 반환하는 즉시 스트림을 닫은 뒤
+        그때까지 받은 내용의 Message를 반환합니다. (stop_reason은 None)
+        재시도할 수 없는 오류이거나 재시도 횟수를 넘기면 마지막 예외를 그대로 발생시킵니다.
+        """
+        params.setdefault('model', self.default_model)
+        params.setdefault('max_tokens', DEFAULT_MAX_TOKENS)
+        estimated = estimate_tokens(_request_text(params))
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_turn(estimated)
+            started = time.perf_counter()
+            try:
+                if stop_when is None:
+                    response = self.client.messages.create(**params)
+                else:
+                    self.streamed += 1
+                    response = self._stream(params, stop_when)
+            except (APIStatusError, APIConnectionError) as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.8, 1.2)
+                if isinstance(e, RateLimitError):
+                    self._pause(delay)
+                status = e.status_code if isinstance(e, APIStatusError) else type(e).__name__
+                logger.warning(f"Claude 요청 재시도 ({status}): {delay:.1f}초 후 ({attempt + 1}/{self.max_retries})")
+                self.retries += 1
+                time.sleep(delay)
+                continue
+
+            record = self.usage.record(label, response.usage, time.perf_counter() - started)
+            # 캐시 읽기 토큰은 입력 한도에 포함되지 않으므로 나머지만 반영
+            actual = record.input_tokens + record.cache_creation_input_tokens
+            self.tokens_bucket.adjust(actual - estimated)
+            return response
+        raise RuntimeError("unreachable")
+
+    def generate(self, prompt: Union[str, List[Dict[str, Any]]], label: str = '', **opts) -> str:
+        """프롬프트 하나로 응답 텍스트를 받습니다.
+
+        prompt는 user 메시지 문자열 또는 messages 목록이며, 나머지 인자(model, max_tokens,
+        temperature, system 등)는 messages.create에 그대로 전달합니다.
+        """
+        messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+        return response_text(self.create(label=label, messages=messages, **opts))
+
+    def log_stats(self):
+        self.usage.log_summary()
+        if self.retries or self.throttled_seconds >= 1:
+            logger.info(f"📊 Claude 게이트웨이: 재시도 {self.retries}회, 속도 제한 대기 {self.throttled_seconds:.1f}초")
+        if self.streamed:
+            logger.info(f"📊 Claude 스트리밍: {self.streamed}건 중 {self.early_stops}건은 JSON 완성 후 조기 종료")
+
+
+def response_text(response) -> str:
+    """Message 객체에서 첫 번째 텍스트 블록을 꺼냅니다."""
+    for block in response.content or []:
+        if getattr(block, 'type', None) == 'text':
+            return block.text
+        if isinstance(block, dict) and 'text' in block:
+            return block['text']
+    return ""
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway(**kwargs) -> LLMGateway:
+    """프로세스 공용 게이트웨이. 처음 호출할 때의 인자(없으면 환경 변수)로 만들어집니다."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            kwargs.setdefault('api_key', os.getenv('CLAUDE_API_KEY'))
+            kwargs.setdefault('base_url', os.getenv('CLAUDE_BASE_URL') or None)
+            kwargs.setdefault('rpm', int(os.getenv('CLAUDE_RPM') or DEFAULT_RPM))
+            kwargs.setdefault('tpm', int(os.getenv('CLAUDE_TPM') or DEFAULT_TPM))
+            _gateway = LLMGateway(**kwargs)
+        return _gateway
+
+
+def generate(prompt: Union[str, List[Dict[str, Any]]], **opts) -> str:
+    """공용 게이트웨이로 응답 텍스트를 받습니다. (LLMGateway.generate 참고)"""
+    return get_gateway().generate(prompt, **opts)
@@ -0,0 +1,123 @@
+"""Claude 호출별 토큰 사용량과 프롬프트 캐시 적중 여부 기록.
+
+응답의 usage(input_tokens, cache_creation_input_tokens, cache_read_input_tokens,
+output_tokens)를 호출마다 기록하고, 실행이 끝나면 캐시 적중률과
+입력 토큰 환산 비용(캐시 읽기 0.1배, 캐시 쓰기 1.25배)을 요약합니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 입력 토큰 단가 대비 배율
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+
+@dataclass
+class UsageRecord:
+    label: str
+    input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    output_tokens: int = 0
+    elapsed: Optional[float] = None  # 요청 시작부터 응답 완료까지(초)
+
+    @property
+    def cache_hit(self) -> bool:
+        return self.cache_read_input_tokens > 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        """캐시 여부와 무관한 전체 입력 토큰 수"""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+
+    @property
+    def billed_input_tokens(self) -> float:
+        """기본 입력 단가로 환산한 입력 토큰 수"""
+        return (self.input_tokens
+                + self.cache_creation_input_tokens * CACHE_WRITE_MULTIPLIER
+                + self.cache_read_input_tokens * CACHE_READ_MULTIPLIER)
+
+
+def _usage_value(usage: Any, name: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return int(value or 0)
+
+
+class UsageTracker:
+    """여러 스레드에서 호출해도 안전한 사용량 기록기"""
+
+    def __init__(self, name: str = 'Claude'):
+        self.name = name
+        self._lock = threading.Lock()
+        self.records: List[UsageRecord] = []
+
+    def record(self, label: str, usage: Any, elapsed: Optional[float] = None) -> UsageRecord:
+        """응답 usage 객체(또는 딕셔너리)를 기록하고 호출 1건의 요약을 debug 로그로 남깁니다."""
+        rec = UsageRecord(
+            label=label,
+            input_tokens=_usage_value(usage, 'input_tokens'),
+            cache_creation_input_tokens=_usage_value(usage, 'cache_creation_input_tokens'),
+            cache_read_input_tokens=_usage_value(usage, 'cache_read_input_tokens'),
+            output_tokens=_usage_value(usage, 'output_tokens'),
+            elapsed=elapsed,
+        )
+        with self._lock:
+            self.records.append(rec)
+        cache_state = ('적중' if rec.cache_hit
+                       else '생성' if rec.cache_creation_input_tokens else '미사용')
+        elapsed_str = f", {elapsed:.2f}초" if elapsed is not None else ''
+        logger.debug(
+            f"[{self.name}] {label}: 캐시 {cache_state}, 입력 {rec.input_tokens} "
+            f"(캐시 쓰기 {rec.cache_creation_input_tokens}, 읽기 {rec.cache_read_input_tokens}), "
+            f"출력 {rec.output_tokens}{elapsed_str}"
+        )
+        return rec
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            records = list(self.records)
+        prompt_tokens = sum(r.prompt_tokens for r in records)
+        billed = sum(r.billed_input_tokens for r in records)
+        elapsed = [r.elapsed for r in records if r.elapsed is not None]
+        hit_elapsed = [r.elapsed for r in records if r.elapsed is not None and r.cache_hit]
+        miss_elapsed = [r.elapsed for r in records if r.elapsed is not None and not r.cache_hit]
+        return {
+            'calls': len(records),
+            'cache_hits': sum(1 for r in records if r.cache_hit),
+            'prompt_tokens': prompt_tokens,
+            'cache_read_tokens': sum(r.cache_read_input_tokens for r in records),
+            'cache_write_tokens': sum(r.cache_creation_input_tokens for r in records),
+            'output_tokens': sum(r.output_tokens for r in records),
+            'billed_input_tokens': billed,
+            'input_saving_ratio': 1 - billed / prompt_tokens if prompt_tokens else 0.0,
+            'avg_elapsed': sum(elapsed) / len(elapsed) if elapsed else 0.0,
+            'avg_elapsed_hit': sum(hit_elapsed) / len(hit_elapsed) if hit_elapsed else 0.0,
+            'avg_elapsed_miss': sum(miss_elapsed) / len(miss_elapsed) if miss_elapsed else 0.0,
+        }
+
+    def log_summary(self):
+        s = self.summary()
+        if not s['calls']:
+            return
+        logger.info(
+            f"📊 {self.name} 사용량: 호출 {s['calls']}건 (캐시 적중 {s['cache_hits']}건), "
+            f"입력 {s['prompt_tokens']:,} 토큰 (캐시 읽기 {s['cache_read_tokens']:,}, 쓰기 {s['cache_write_tokens']:,}), "
+            f"출력 {s['output_tokens']:,} 토큰"
+        )
+        timing = ''
+        if s['avg_elapsed']:
+            timing = (f", 평균 응답 {s['avg_elapsed']:.2f}초 (캐시 적중 {s['avg_elapsed_hit']:.2f}초 / "
+                      f"미적중 {s['avg_elapsed_miss']:.2f}초)")
+        logger.info(
+            f"📊 입력 환산 비용 {s['billed_input_tokens']:,.0f} 토큰 "
+            f"(절감 {s['input_saving_ratio']:.1%}){timing}"
+        )
@@ -0,0 +1,409 @@
+"""오프라인 테스트용 Messages / Message Batches API 대역(stand-in) 서버.
+
+Claude API 대신 이 서버로 실시간/배치 생성 경로를 시험할 수 있습니다.
+요청마다 프롬프트의 '제목:' 줄을 이용해 형식에 맞는 패러디 JSON을 돌려줍니다.
+
+    python -m utils.local_batch_server --port 8765 --delay 3
+    CLAUDE_API_KEY=test CLAUDE_BASE_URL=http://127.0.0.1:8765 python step1_senior_ou_news_parody_collection.py
+
+--rate-limit-every N 을 주면 N번째 실시간 요청마다 429(Retry-After: 1)를 돌려줍니다.
+"stream": true 요청에는 SSE 이벤트로 응답을 조금씩(--token-delay 간격) 보냅니다.
+--chatty를 주면 JSON 뒤에 설명 문장을 덧붙여 (실제 모델처럼) 스트리밍 조기 종료를 시험할 수 있습니다.
+tool_choice로 도구 호출을 강제한 요청에는 같은 패러디를 tool_use 블록의 인자({'parodies': [...]})로 돌려줍니다.
+--overlong-every N 은 N번째 패러디마다 글자 수 제한을 넘는 필드를, --malformed-every N 은
+N번째 텍스트 응답마다 깨진 JSON을 만들어 검증/보정 경로를 시험합니다. (도구 인자는 항상 올바른 JSON)
+프롬프트에 배정된 어미 패턴(예: '(question)')이 있으면 그 패턴으로 제목을 끝내고,
+--pattern-miss-every N 을 주면 N번째 패러디마다 패턴을 무시해 재요청 경로를 시험합니다.
+
+지원 경로:
+    POST /v1/messages
+    POST /v1/messages/batches
+    GET  /v1/messages/batches/{id}
+    GET  /v1/messages/batches/{id}/results   (JSONL)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_BATCH_PATH_RE = re.compile(r'^/v1/messages/batches/([A-Za-z0-9_\-]+)(/results)?/?$')
+_TITLE_LINE_RE = re.compile(r'^제목:\s*(.+)$', re.MULTILINE)
+_GROUP_ARTICLE_RE = re.compile(r'^\[기사 \d+\]', re.MULTILINE)
+_TARGET_PATTERN_RE = re.compile(r'\((exclamation|question|statement|concern)\)')
+
+# --chatty일 때 JSON 뒤에 붙이는 설명
+_CHATTY_NOTE = ("\n\n위 패러디는 기사 내용을 바탕으로 시니어 독자의 눈높이에 맞춰 작성했습니다. "
+                "제목은 30자 이내로 줄였고, 라떼와 오유생각은 각각 100자, 80자 이내로 맞췄습니다. "
+                "다른 어미 패턴이 필요하면 말씀해 주세요.")
+# 스트리밍 응답에서 한 번에 보내는 글자 수
+_STREAM_CHUNK_CHARS = 8
+# --overlong-every일 때 필드 뒤에 덧붙여 글자 수 제한을 넘기는 문장
+_OVERLONG_TAIL = " 정말 세상이 이렇게까지 달라질 줄은 그때는 꿈에도 몰랐는데 말이야, 허허."
+
+# 제목 어미를 돌아가며 사용해 패턴 분포가 한쪽으로 쏠리지 않게 함
+_TITLE_ENDINGS = ['일까요?', '이네요!', '입니다', '걱정되네요']
+# 배정된 어미 패턴별 제목 어미
+_PATTERN_ENDINGS = {'question': '일까요?', 'exclamation': '이네요!', 'statement': '입니다', 'concern': '걱정되네요'}
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _canned_item(source: str, index: int, pattern: Optional[str] = None) -> Dict[str, str]:
+    ending = _PATTERN_ENDINGS.get(pattern) or _TITLE_ENDINGS[index % len(_TITLE_ENDINGS)]
+    return {
+        'ou_title': f"[{index}] {source[:18]} {ending}",
+        'latte': f"라떼는 말이야, {source[:20]} 같은 일은 상상도 못 했지.",
+        'ou_think': "요즘 세상 참 빠르네요. 그래도 건강이 최고입니다.",
+    }
+
+
+def _overlong_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(item, ou_title=item['ou_title'] + ' 요즘 젊은이들 정말 대단하구나',
+                latte=item['latte'] + _OVERLONG_TAIL * 2, ou_think=item['ou_think'] + _OVERLONG_TAIL)
+
+
+def canned_items(prompt: str, index: int, overlong_every: int = 0,
+                 pattern_miss_every: int = 0) -> List[Dict[str, Any]]:
+    """프롬프트의 원본 제목마다 기사 번호(id)를 붙인 패러디를 만듭니다. (단건 프롬프트는 1건)"""
+    titles = _TITLE_LINE_RE.findall(prompt)
+    patterns = _TARGET_PATTERN_RE.findall(prompt)
+
+    def pattern_for(n: int, item_index: int) -> Optional[str]:
+        if n >= len(patterns) or (pattern_miss_every and item_index % pattern_miss_every == 0):
+            return None
+        return patterns[n]
+
+    if _GROUP_ARTICLE_RE.search(prompt):
+        items = [dict(id=i, **_canned_item(t.strip(), index * 100 + i, pattern_for(i - 1, index + i - 1)))
+                 for i, t in enumerate(titles, start=1)]
+    else:
+        source = titles[-1].strip() if titles else f'테스트 기사 {index}'
+        items = [dict(id=1, **_canned_item(source, index, pattern_for(0, index)))]
+    if overlong_every:
+        items = [_overlong_item(item) if (index + n) % overlong_every == 0 else item
+                 for n, item in enumerate(items)]
+    return items
+
+
+def canned_parody(prompt: str, index: int, overlong_every: int = 0, pattern_miss_every: int = 0) -> str:
+    """프롬프트의 원본 제목으로 패러디 JSON 문자열을 만듭니다.
+
+    '[기사 N]' 묶음 프롬프트이면 기사 번호(id)를 붙인 JSON 배열을 만듭니다.
+    """
+    items = canned_items(prompt, index, overlong_every, pattern_miss_every)
+    if _GROUP_ARTICLE_RE.search(prompt):
+        return json.dumps(items, ensure_ascii=False)
+    item = items[0]
+    item.pop('id')
+    return json.dumps(item, ensure_ascii=False)
+
+
+def _malformed(text: str) -> str:
+    """따옴표를 이스케이프하지 않은 모델 출력처럼 JSON을 깨뜨립니다."""
+    return text.replace('라떼는 말이야,', '라떼는 "말이야",', 1)
+
+
+class BatchStore:
+    """제출된 배치와 결과를 메모리에 보관합니다."""
+
+    def __init__(self, delay: float = 2.0, error_every: int = 0, rate_limit_every: int = 0,
+                 token_delay: float = 0.02, chatty: bool = False, overlong_every: int = 0,
+                 malformed_every: int = 0, pattern_miss_every: int = 0):
+        self.delay = delay
+        self.token_delay = token_delay
+        self.chatty = chatty
+        self.overlong_every = overlong_every
+        self.malformed_every = malformed_every
+        self.pattern_miss_every = pattern_miss_every
+        self.error_every = error_every
+        self.rate_limit_every = rate_limit_every
+        self.message_requests = 0
+        self.streams_completed = 0
+        self.streams_cancelled = 0
+        self._lock = threading.Lock()
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._cached_prefixes = set()  # 프롬프트 캐시 흉내 (cache_control이 붙은 system 블록)
+
+    def create(self, requests: List[Dict[str, Any]], base_url: str) -> Dict[str, Any]:
+        batch_id = f"msgbatch_local_{uuid.uuid4().hex[:16]}"
+        now = time.time()
+        results = []
+        for i, request in enumerate(requests, start=1):
+            custom_id = request.get('custom_id', f'req-{i}')
+            params = request.get('params', {})
+            if self.error_every and i % self.error_every == 0:
+                results.append({'custom_id': custom_id, 'result': {
+                    'type': 'errored',
+                    'error': {'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'Overloaded'}},
+                }})
+                continue
+            results.append({'custom_id': custom_id, 'result': {
+                'type': 'succeeded',
+                'message': self.message(params, i),
+            }})
+        with self._lock:
+            self._batches[batch_id] = {
+                'id': batch_id,
+                'created_at': now,
+                'ends_at': now + self.delay,
+                'results': results,
+                'results_url': f"{base_url}/v1/messages/batches/{batch_id}/results",
+            }
+        return self.describe(batch_id)
+
+    def message(self, params: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """messages.create 인자 하나에 대한 Message 응답"""
+        prompt = ''.join(
+            m['content'] if isinstance(m.get('content'), str)
+            else ''.join(b.get('text', '') for b in m.get('content', []))
+            for m in params.get('messages', [])
+        )
+        tool_choice = params.get('tool_choice') or {}
+        if tool_choice.get('type') == 'tool':
+            arguments = {'parodies': canned_items(prompt, index, self.overlong_every, self.pattern_miss_every)}
+            text = json.dumps(arguments, ensure_ascii=False)
+            content = [{'type': 'tool_use', 'id': f"toolu_local_{uuid.uuid4().hex[:16]}",
+                        'name': tool_choice.get('name'), 'input': arguments}]
+            stop_reason = 'tool_use'
+        else:
+            text = canned_parody(prompt, index, self.overlong_every, self.pattern_miss_every)
+            if self.malformed_every and index % self.malformed_every == 0:
+                text = _malformed(text)
+            text += _CHATTY_NOTE if self.chatty else ''
+            content = [{'type': 'text', 'text': text}]
+            stop_reason = 'end_turn'
+        return {
+            'id': f"msg_local_{uuid.uuid4().hex[:16]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': params.get('model', 'local'),
+            'content': content,
+            'stop_reason': stop_reason,
+            'stop_sequence': None,
+            'usage': self._usage(params, prompt, text),
+        }
+
+    def count_stream(self, completed: bool):
+        with self._lock:
+            if completed:
+                self.streams_completed += 1
+            else:
+                self.streams_cancelled += 1
+
+    def next_message_index(self) -> int:
+        with self._lock:
+            self.message_requests += 1
+            return self.message_requests
+
+    def _usage(self, params: Dict[str, Any], prompt: str, text: str) -> Dict[str, int]:
+        """대략적인 토큰 수(2글자당 1토큰)로 usage를 만들고, 캐시 대상 system 블록은 두 번째 요청부터 캐시 읽기로 셉니다."""
+        system = params.get('system') or []
+        if isinstance(system, str):
+            system = [{'type': 'text', 'text': system}]
+        cached_text = ''.join(b.get('text', '') for b in system if b.get('cache_control'))
+        plain_text = ''.join(b.get('text', '') for b in system if not b.get('cache_control'))
+        usage = {'input_tokens': (len(prompt) + len(plain_text)) // 2, 'output_tokens': len(text) // 2,
+                 'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 0}
+        if cached_text:
+            with self._lock:
+                hit = cached_text in self._cached_prefixes
+                self._cached_prefixes.add(cached_text)
+            usage['cache_read_input_tokens' if hit else 'cache_creation_input_tokens'] = len(cached_text) // 2
+        return usage
+
+    def describe(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+        if batch is None:
+            return None
+        ended = time.time() >= batch['ends_at']
+        results = batch['results']
+        succeeded = sum(1 for r in results if r['result']['type'] == 'succeeded')
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {
+                'processing': 0 if ended else len(results),
+                'succeeded': succeeded if ended else 0,
+                'errored': len(results) - succeeded if ended else 0,
+                'canceled': 0,
+                'expired': 0,
+            },
+            'created_at': _iso(batch['created_at']),
+            'expires_at': _iso(batch['created_at'] + timedelta(days=1).total_seconds()),
+            'ended_at': _iso(batch['ends_at']) if ended else None,
+            'archived_at': None,
+            'cancel_initiated_at': None,
+            'results_url': batch['results_url'] if ended else None,
+        }
+
+    def results(self, batch_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+        if batch is None or time.time() < batch['ends_at']:
+            return None
+        return batch['results']
+
+
+def make_handler(store: BatchStore):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Any):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _not_found(self):
+            self._send_json(404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': 'Not found'}})
+
+        def do_POST(self):
+            path = self.path.split('?')[0].rstrip('/')
+            if path not in ('/v1/messages', '/v1/messages/batches'):
+                return self._not_found()
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                return self._send_json(400, {'type': 'error', 'error': {
+                    'type': 'invalid_request_error', 'message': 'Invalid JSON'}})
+            if path == '/v1/messages':
+                return self._create_message(body)
+            base_url = f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+            self._send_json(200, store.create(body.get('requests', []), base_url))
+
+        def _create_message(self, params: Dict[str, Any]):
+            index = store.next_message_index()
+            if store.rate_limit_every and index % store.rate_limit_every == 0:
+                body = json.dumps({'type': 'error', 'error': {
+                    'type': 'rate_limit_error', 'message': 'Rate limited'}}).encode('utf-8')
+                self.send_response(429)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Retry-After', '1')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            message = store.message(params, index)
+            if params.get('stream'):
+                return self._stream_message(message)
+            self._send_json(200, message)
+
+        def _stream_message(self, message: Dict[str, Any]):
+            """Message를 SSE 이벤트(message_start → content_block_delta... → message_stop)로 보냅니다."""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            block = message['content'][0]
+            if block['type'] == 'tool_use':
+                # 도구 인자는 input_json_delta로 나눠 보냄
+                text = json.dumps(block['input'], ensure_ascii=False)
+                block_start, delta_type, delta_key = dict(block, input={}), 'input_json_delta', 'partial_json'
+            else:
+                text = block['text']
+                block_start, delta_type, delta_key = {'type': 'text', 'text': ''}, 'text_delta', 'text'
+            usage = message['usage']
+            start = dict(message, content=[], stop_reason=None, usage=dict(usage, output_tokens=1))
+
+            def send(event: str, data: Dict[str, Any]):
+                payload = json.dumps(dict(data, type=event), ensure_ascii=False)
+                self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode('utf-8'))
+                self.wfile.flush()
+
+            try:
+                send('message_start', {'message': start})
+                send('content_block_start', {'index': 0, 'content_block': block_start})
+                for i in range(0, len(text), _STREAM_CHUNK_CHARS):
+                    time.sleep(store.token_delay)
+                    send('content_block_delta', {'index': 0, 'delta': {
+                        'type': delta_type, delta_key: text[i:i + _STREAM_CHUNK_CHARS]}})
+                send('content_block_stop', {'index': 0})
+                send('message_delta', {'delta': {'stop_reason': message['stop_reason'], 'stop_sequence': None},
+                                       'usage': {'output_tokens': usage['output_tokens']}})
+                send('message_stop', {})
+                store.count_stream(completed=True)
+            except (BrokenPipeError, ConnectionResetError):
+                store.count_stream(completed=False)  # 클라이언트가 중간에 끊음
+            self.close_connection = True
+
+        def do_GET(self):
+            match = _BATCH_PATH_RE.match(self.path.split('?')[0])
+            if not match:
+                return self._not_found()
+            batch_id, is_results = match.group(1), bool(match.group(2))
+            if not is_results:
+                batch = store.describe(batch_id)
+                return self._send_json(200, batch) if batch else self._not_found()
+
+            results = store.results(batch_id)
+            if results is None:
+                return self._not_found()
+            body = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in results).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/binary')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, delay: float = 2.0, error_every: int = 0,
+          rate_limit_every: int = 0, token_delay: float = 0.02, chatty: bool = False,
+          overlong_every: int = 0, malformed_every: int = 0, pattern_miss_every: int = 0) -> ThreadingHTTPServer:
+    """서버를 만들어 반환합니다. (serve_forever()는 호출하는 쪽에서 실행)"""
+    store = BatchStore(delay, error_every, rate_limit_every, token_delay, chatty, overlong_every, malformed_every,
+                       pattern_miss_every)
+    return ThreadingHTTPServer((host, port), make_handler(store))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Message Batches API 로컬 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=2.0, help='배치가 완료되기까지 걸리는 시간(초)')
+    parser.add_argument('--error-every', type=int, default=0, help='N번째 요청마다 오류 결과 반환 (0이면 사용 안 함)')
+    parser.add_argument('--rate-limit-every', type=int, default=0,
+                        help='N번째 실시간 요청마다 429 응답 (0이면 사용 안 함)')
+    parser.add_argument('--token-delay', type=float, default=0.02,
+                        help='스트리밍 응답 조각 사이 대기 시간(초)')
+    parser.add_argument('--chatty', action='store_true', help='JSON 뒤에 설명 문장을 덧붙임')
+    parser.add_argument('--overlong-every', type=int, default=0,
+                        help='N번째 패러디마다 글자 수 제한을 넘는 필드 생성 (0이면 사용 안 함)')
+    parser.add_argument('--malformed-every', type=int, default=0,
+                        help='N번째 텍스트 응답마다 깨진 JSON 반환 (0이면 사용 안 함)')
+    parser.add_argument('--pattern-miss-every', type=int, default=0,
+                        help='N번째 패러디마다 배정된 어미 패턴 무시 (0이면 사용 안 함)')
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.delay, args.error_every, args.rate_limit_every,
+                   args.token_delay, args.chatty, args.overlong_every, args.malformed_every,
+                   args.pattern_miss_every)
+    print(f"로컬 배치 서버 실행 중: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
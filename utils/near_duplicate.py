@@ -0,0 +1,107 @@
+"""문자 n-gram MinHash/LSH 기반 유사 문장(제목) 색인.
+
+모든 기존 항목과 SequenceMatcher로 비교하는 대신, LSH 버킷이 겹치는
+후보에 대해서만 SequenceMatcher 유사도를 정확히 다시 계산합니다.
+항목이 수천 개로 늘어나도 add()/query() 비용이 거의 일정하게 유지됩니다.
+
+    index = NearDuplicateIndex()
+    if not index.has_similar(title, 0.85):
+        index.add(title)
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', str(text)).strip()
+
+
+class NearDuplicateIndex:
+    """MinHash(문자 n-gram) + LSH 밴드 색인.
+
+    기본값(64개 해시 중 21밴드 x 3행)은 n-gram 자카드 유사도 0.5 이상인 쌍을
+    약 94%, 0.6 이상은 99% 이상 후보로 잡고, 0.1 수준의 무관한 문장은
+    2% 정도만 후보로 남깁니다. 후보는 SequenceMatcher로 다시 검사합니다.
+    """
+
+    def __init__(self, ngram: int = 2, num_perm: int = 64, bands: int = 21, seed: int = 1):
+        if bands < 1 or num_perm // bands < 1:
+            raise ValueError("bands는 num_perm 이하여야 합니다.")
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._items: List[Tuple[Hashable, str]] = []  # (key, 원래 문장)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _shingles(self, text: str) -> Set[str]:
+        n = self.ngram
+        if len(text) <= n:
+            return {text}
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _band_keys(self, text: str) -> List[bytes]:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) & _MERSENNE_PRIME for s in self._shingles(text)),
+            dtype=np.uint64,
+        )
+        # (a * x + b) mod p 를 모든 순열에 대해 한 번에 계산한 뒤 열별 최솟값
+        signature = ((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME).min(axis=0)
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def add(self, text: str, key: Optional[Hashable] = None) -> None:
+        """문장을 색인에 추가합니다. key를 생략하면 문장 자체를 key로 사용합니다."""
+        text = str(text)
+        item_id = len(self._items)
+        self._items.append((text if key is None else key, text))
+        for band, band_key in enumerate(self._band_keys(_normalize(text))):
+            self._buckets[band][band_key].append(item_id)
+
+    def candidates(self, text: str) -> Set[int]:
+        """LSH 버킷이 하나 이상 겹치는 항목 번호"""
+        found: Set[int] = set()
+        for band, band_key in enumerate(self._band_keys(_normalize(text))):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
+
+    def query(self, text: str, threshold: float = 0.0) -> List[Tuple[Any, float]]:
+        """후보 항목들의 SequenceMatcher 유사도를 계산해 threshold 이상만 높은 순으로 반환합니다.
+
+        입력 문장과 원래 문장을 그대로 비교하므로 기존 SequenceMatcher 검사와 같은 값입니다.
+        """
+        results = []
+        for item_id in self.candidates(text):
+            key, original = self._items[item_id]
+            matcher = SequenceMatcher(None, str(text), original)
+            # 상한값으로 먼저 걸러낸 뒤 정확한 유사도 계산
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                results.append((key, ratio))
+        results.sort(key=lambda r: r[1], reverse=True)
+        return results
+
+    def has_similar(self, text: str, threshold: float = 0.85, inclusive: bool = False) -> bool:
+        """유사도가 threshold를 넘는(inclusive=True면 이상인) 항목이 있는지 확인합니다."""
+        for _, ratio in self.query(text, threshold):
+            if ratio > threshold or (inclusive and ratio == threshold):
+                return True
+        return False
@@ -0,0 +1,228 @@
+"""시니어층(50-70대) 관심도 기반 뉴스 선정에 쓰는 가중치 표와 점수 계산 도우미.
+
+score_news_batch()는 카테고리/키워드/최신성/시간대 점수를 열(column) 배열로 만든 뒤
+NumPy 벡터 연산으로 한 번에 계산하고, select_top_k()는 전체 정렬 대신
+argpartition으로 상위 k개만 골라 정렬합니다.
+제목과 RSS 주소는 pandas.factorize로 서로 다른 값만 한 번씩 점수를 매긴 뒤 배열 인덱싱으로 펼칩니다.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# 50/60/70대 타겟으로 가중치 재조정
+SENIOR_CATEGORY_WEIGHTS = {
+    'health': 2.5, 'welfare': 2.3, 'economy': 2.0, 'politics': 1.8,
+    'opinion': 1.6, 'local': 1.5, 'market': 1.4, 'society': 1.3,
+}
+
+# 50/60/70대 핵심 관심사로 키워드 가중치 강화
+SENIOR_KEYWORD_WEIGHTS = {
+    # 연금/복지 관련 (최고 우선순위)
+    '연금': 15, '국민연금': 14, '기초연금': 13, '노령연금': 12,
+    '의료비': 12, '건강보험': 12, '요양보험': 11, '장기요양': 10,
+
+    # 건강 관련 (50/60/70대 핵심 관심사)
+    '치매': 12, '건강검진': 10, '고혈압': 9, '당뇨': 9, '암': 9,
+    '관절': 8, '무릎': 8, '허리': 8, '백내장': 7, '골다공증': 7,
+
+    # 경제/생활 관련
+    '물가': 11, '전기료': 10, '가스요금': 10, '수도요금': 9,
+    '부동산': 8, '집값': 8, '아파트': 7, '전세': 7, '임대료': 7,
+    '금리': 8, '예금': 7, '적금': 6, '펀드': 5, '주식': 6,
+
+    # 정치/사회 관련
+    '대통령': 9, '정부': 8, '국정감사': 7, '특검': 7, '국회': 6,
+    '세금': 9, '소득세': 8, '재산세': 8, '상속세': 7,
+
+    # 노인복지 관련
+    '노인복지': 12, '독거노인': 10, '경로당': 8, '실버': 8,
+    '요양원': 9, '요양시설': 8, '재가요양': 7,
+
+    # 자녀/가족 관련
+    '교육': 6, '대학': 6, '취업': 7, '결혼': 6, '육아': 5,
+    '손자': 6, '손녀': 6, '며느리': 5, '사위': 5,
+
+    # 기타
+    'AI': 4, '스포츠': 4, '문화': 4, '여행': 5, '종교': 5
+}
+
+# 50/60/70대 특화 보너스 키워드
+SENIOR_BONUS_KEYWORDS = {
+    '노인': 5, '시니어': 5, '50대': 4, '60대': 5, '70대': 6,
+    '은퇴': 5, '정년': 5, '퇴직': 5, '중년': 4, '노년': 5,
+    '베이비부머': 4, '실버': 4, '고령': 4, '장년': 3,
+    '어르신': 4, '노인장': 3, '할머니': 3, '할아버지': 3
+}
+
+# MZ세대/젊은층 관련 제외 키워드 강화
+EXCLUDE_KEYWORDS = {
+    'K-POP': -5, '아이돌': -5, '방탄소년단': -4, 'BTS': -4,
+    '게임': -4, '온라인게임': -4, 'e스포츠': -4,
+    '유튜버': -4, '인플루언서': -4, '크리에이터': -3,
+    'SNS': -3, '틱톡': -4, '인스타그램': -3, '페이스북': -2,
+    'MZ세대': -4, 'Z세대': -4, '밀레니얼': -3,
+    '힙합': -3, '래퍼': -3, 'EDM': -3,
+    '웹툰': -2, '만화': -2, '애니메이션': -2
+}
+
+# 키워드 가중치 통합 (중복 키워드는 뒤의 표 값이 우선)
+KEYWORD_WEIGHTS = {**SENIOR_KEYWORD_WEIGHTS, **SENIOR_BONUS_KEYWORDS, **EXCLUDE_KEYWORDS}
+
+# 가중치 표마다 한 번만 만드는 키워드 매처 / 피드별 카테고리 가중치 메모
+_keyword_matchers: Dict[bool, KeywordMatcher] = {}
+_category_memo: Dict[str, float] = {}
+
+
+def get_keyword_matcher(korean_boundaries: bool = False) -> KeywordMatcher:
+    """KEYWORD_WEIGHTS로 만든 키워드 매처를 반환합니다. (처음 호출 시 한 번 생성)"""
+    matcher = _keyword_matchers.get(korean_boundaries)
+    if matcher is None:
+        matcher = KeywordMatcher(KEYWORD_WEIGHTS, korean_boundaries=korean_boundaries)
+        _keyword_matchers[korean_boundaries] = matcher
+    return matcher
+
+
+def category_weight(source_rss: str) -> float:
+    """RSS 주소에 포함된 첫 번째 카테고리의 가중치 (피드 주소별로 메모)"""
+    weight = _category_memo.get(source_rss)
+    if weight is None:
+        weight = 0
+        for cat, cat_weight in SENIOR_CATEGORY_WEIGHTS.items():
+            if cat in source_rss:
+                weight = cat_weight
+                break
+        _category_memo[source_rss] = weight
+    return weight
+
+
+# 최신성(1일 이내) 가중치와 시간대별 가중치 (50/60/70대 생활패턴 반영)
+RECENCY_BONUS = 3
+RECENCY_WINDOW_SECONDS = 24 * 3600
+HOUR_BONUS = np.zeros(24)
+HOUR_BONUS[6:10] = 2      # 아침 뉴스 시간
+HOUR_BONUS[12:15] = 1     # 점심시간
+HOUR_BONUS[18:22] = 1.5   # 저녁 뉴스 시간
+
+
+def _civil_to_epoch(year: np.ndarray, month: np.ndarray, day: np.ndarray, hour: np.ndarray,
+                    minute: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """연월일시분초 배열을 (시간대 없는) epoch 초 배열로 변환합니다. (days-from-civil)"""
+    y = year - (month <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    mp = (month + 9) % 12
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    return days * 86400 + hour * 3600 + minute * 60 + second
+
+
+# 게시 시각이 없는 항목의 자리값 (feedparser의 published_parsed는 9개 필드의 struct_time)
+_NO_DATE = (-1,) * 9
+# 연월일시분초 필드별 허용 범위
+_FIELD_LOW = np.array([1, 1, 1, 0, 0, 0])
+_FIELD_HIGH = np.array([9999, 12, 31, 23, 59, 61])
+
+
+def _published_row(parsed: Any) -> Tuple[int, ...]:
+    """published_parsed 하나를 9개 정수로 맞춥니다. 짧거나 숫자가 아니면 _NO_DATE"""
+    try:
+        fields = tuple(int(v) for v in tuple(parsed)[:9])
+    except (TypeError, ValueError):
+        return _NO_DATE
+    if len(fields) < 6 or any(abs(v) > 1_000_000 for v in fields):
+        return _NO_DATE
+    return fields + (0,) * (9 - len(fields))
+
+
+def _published_fields(news_list: List[Dict[str, Any]]) -> np.ndarray:
+    """(n, 6) 배열: 항목별 게시 시각의 (연, 월, 일, 시, 분, 초). 없거나 읽을 수 없으면 -1
+
+    모두 struct_time(또는 같은 길이의 숫자 묶음)이면 NumPy가 한 번에 변환하고,
+    짧거나 숫자가 아닌 값이 섞여 있을 때만 항목별로 확인합니다.
+    범위를 벗어난 값(13월, 25시 등)은 기존 계산의 날짜 오류처럼 게시 시각 없음으로 봅니다.
+    """
+    raw = [news.get('published_parsed') or _NO_DATE for news in news_list]
+    try:
+        published = np.array(raw, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError):
+        published = np.array([_published_row(parsed) for parsed in raw], dtype=np.int64)
+    if published.ndim != 2 or published.shape[1] < 6:
+        published = np.array([_published_row(parsed) for parsed in raw], dtype=np.int64)
+    published = published[:, :6]
+    valid = ((published >= _FIELD_LOW) & (published <= _FIELD_HIGH)).all(axis=1)
+    published[~valid] = -1
+    return published
+
+
+def _unique_scores(values: List[str], score) -> np.ndarray:
+    """서로 다른 값마다 score를 한 번만 호출하고 원래 순서의 점수 배열로 펼칩니다."""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), sort=False)
+    per_value = np.fromiter((score(v) for v in uniques), dtype=float, count=len(uniques))
+    return per_value[codes]
+
+
+def score_news_batch(news_list: List[Dict[str, Any]], keyword_matcher: KeywordMatcher,
+                     now: Optional[datetime] = None) -> np.ndarray:
+    """뉴스 목록 전체의 점수를 벡터 연산으로 계산합니다.
+
+    기존 항목별 계산과 같은 규칙을 따릅니다.
+    - 카테고리 가중치 + 제목 키워드 가중치
+    - 게시 시각이 현재(로컬) 기준 1일 이내면 +3
+    - 게시 시각의 시(hour)에 따라 아침 +2, 점심 +1, 저녁 +1.5
+    게시 시각을 읽을 수 없는 항목은 기존처럼 최신성/시간대 가중치 없이 계산합니다.
+    """
+    n = len(news_list)
+    if n == 0:
+        return np.zeros(0)
+    titles = [news.get('title') or '' for news in news_list]
+    sources = [news.get('source_rss') or '' for news in news_list]
+    published = _published_fields(news_list)
+
+    scores = _unique_scores(sources, category_weight) + _unique_scores(titles, keyword_matcher.score)
+
+    has_date = published[:, 0] > 0
+    unreadable = sum(1 for news in news_list if news.get('published_parsed')) - int(has_date.sum())
+    if unreadable:
+        logger.debug(f"게시 시각을 읽을 수 없는 항목 {unreadable}개는 최신성/시간대 가중치 없이 계산")
+    if has_date.any():
+        dated = published[has_date]
+        # 게시 시각 구조체를 로컬 시각으로 보는 기존 계산(time.mktime → fromtimestamp)과 동일한 기준
+        published_epoch = _civil_to_epoch(*(dated[:, k] for k in range(6)))
+        now = now or datetime.now()
+        now_epoch = _civil_to_epoch(*(np.array([v]) for v in
+                                      (now.year, now.month, now.day, now.hour, now.minute, now.second)))
+        now_epoch = now_epoch + now.microsecond / 1e6
+        recent = (now_epoch - published_epoch) < RECENCY_WINDOW_SECONDS
+        scores[has_date] += recent * RECENCY_BONUS + HOUR_BONUS[dated[:, 3]]
+
+    return scores
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개의 인덱스를 점수 내림차순으로 반환합니다.
+
+    동점이면 원래 순서를 유지합니다. (sorted(..., reverse=True)와 같은 결과)
+    """
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return np.array([], dtype=np.int64)
+    if k >= n:
+        candidates = np.arange(n)
+    else:
+        part = np.argpartition(-scores, k - 1)[:k]
+        threshold = scores[part].min()
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
@@ -0,0 +1,183 @@
+"""패러디 구조화 출력: 도구(tool) 스키마, 응답 검증, 길이 초과 필드의 로컬 보정.
+
+응답 텍스트에서 JSON을 찾아 읽는 대신, 요청에 record_parodies 도구를 선언하고
+tool_choice로 호출을 강제해 모델이 스키마에 맞는 인자(dict)를 돌려주게 합니다.
+받은 인자는 ParodyValidator로 필드 존재와 글자 수 제한(제목 30자, 라떼 100자, 오유생각 80자)을
+확인합니다. 길이가 넘친 본문형 필드(latte, ou_think)는 끝에서부터 문장/어절 경계로만 잘라 쓰고,
+제목은 어절을 빼거나 잘라 붙이면 문장이 어색해지므로 고치지 않고 버립니다. (다음 후보 기사로 채움)
+
+    request.update(tools=[PARODY_TOOL], tool_choice=PARODY_TOOL_CHOICE)
+    message = client.messages.create(**request)
+    items = tool_parodies(tool_input(message))
+    parody = validator.check(items[0])   # 필드 누락이나 제목 길이 초과면 None
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 필드별 최대 글자 수 (PARODY_SYSTEM_PROMPT의 작성 지침과 같음)
+FIELD_LIMITS: Dict[str, int] = {'ou_title': 30, 'latte': 100, 'ou_think': 80}
+
+PARODY_TOOL_NAME = 'record_parodies'
+
+# 단건/묶음 요청이 같은 도구 정의를 써야 프롬프트 캐시(도구 → system 순서)가 함께 적중함
+PARODY_TOOL: Dict[str, Any] = {
+    'name': PARODY_TOOL_NAME,
+    'description': '기사별로 만든 시니어 뉴스 패러디를 기록합니다. 기사마다 객체 하나씩 넣으세요.',
+    'input_schema': {
+        'type': 'object',
+        'properties': {
+            'parodies': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'id': {'type': 'integer', 'description': '기사 번호 (단건 요청은 1)'},
+                        'ou_title': {'type': 'string', 'maxLength': FIELD_LIMITS['ou_title'],
+                                     'description': '다양한 어미의 매력적인 제목(30자 이내)'},
+                        'latte': {'type': 'string', 'maxLength': FIELD_LIMITS['latte'],
+                                  'description': '우리 때는... 형식의 과거 회상 + 현재 상황 비교(100자 이내)'},
+                        'ou_think': {'type': 'string', 'maxLength': FIELD_LIMITS['ou_think'],
+                                     'description': '시니어 관점의 현실적 걱정과 공감 + 약간의 위트(80자 이내)'},
+                    },
+                    'required': ['id', 'ou_title', 'latte', 'ou_think'],
+                },
+            },
+        },
+        'required': ['parodies'],
+    },
+}
+PARODY_TOOL_CHOICE: Dict[str, Any] = {'type': 'tool', 'name': PARODY_TOOL_NAME}
+
+_SPACE_RE = re.compile(r'\s+')
+# 문장 끝 (마침표/물음표/느낌표/물결/말줄임 뒤)
+_SENTENCE_END_RE = re.compile(r'[.!?~…](?=\s|$)')
+# 줄여 쓰지 않고 버리는 필드 (제목은 끝 어미가 패턴이므로 뒤를 자를 수도, 가운데 어절을 뺄 수도 없음)
+STRICT_FIELDS = ('ou_title',)
+
+
+def tool_input(message: Any, name: str = PARODY_TOOL_NAME) -> Optional[Dict[str, Any]]:
+    """Message(또는 배치 결과의 message)에서 도구 name 호출 인자를 꺼냅니다. 없으면 None"""
+    for block in getattr(message, 'content', None) or []:
+        if isinstance(block, dict):
+            block_type, block_name, block_input = block.get('type'), block.get('name'), block.get('input')
+        else:
+            block_type, block_name, block_input = (getattr(block, 'type', None), getattr(block, 'name', None),
+                                                   getattr(block, 'input', None))
+        if block_type == 'tool_use' and block_name == name and isinstance(block_input, dict):
+            return block_input
+    return None
+
+
+def tool_parodies(arguments: Dict[str, Any]) -> List[Any]:
+    """도구 인자에서 패러디 원소 목록을 꺼냅니다. (배열 없이 필드를 바로 넣은 응답도 허용)"""
+    parodies = arguments.get('parodies')
+    if isinstance(parodies, list):
+        return parodies
+    if isinstance(parodies, dict):
+        return [parodies]
+    return [arguments] if 'ou_title' in arguments else []
+
+
+def _cut_at_sentence(text: str, limit: int) -> Optional[str]:
+    """limit 안에서 마지막 문장 끝까지 자릅니다. 남는 길이가 절반도 안 되면 None"""
+    ends = [m.end() for m in _SENTENCE_END_RE.finditer(text[:limit + 1]) if m.end() <= limit]
+    if ends and ends[-1] >= limit // 2:
+        return text[:ends[-1]].rstrip()
+    return None
+
+
+def _cut_at_space(text: str, limit: int) -> Optional[str]:
+    """limit 안의 마지막 띄어쓰기에서 자르고 끝의 쉼표 등을 지웁니다. 남는 길이가 절반도 안 되면 None"""
+    space = text[:limit + 1].rfind(' ')
+    if space < limit // 2:
+        return None
+    return text[:space].rstrip(' ,·-')
+
+
+def shorten_text(text: str, limit: int) -> Optional[str]:
+    """본문형 필드(latte, ou_think)를 끝에서부터 limit 글자 안으로 줄입니다. (문장 경계 → 어절 경계)
+
+    가운데 어절을 빼거나 어절 중간을 자르지 않습니다. 그렇게 줄일 수 없으면 None
+    """
+    if len(text) <= limit:
+        return text
+    return _cut_at_sentence(text, limit) or _cut_at_space(text, limit)
+
+
+class ParodyValidator:
+    """패러디 원소의 필드 존재/길이를 검사하고 길이 초과 필드를 보정합니다. (스레드 안전)
+
+    필수 필드가 없거나 빈 원소, 제목이 길이를 넘은 원소는 버리고(None),
+    길이만 넘은 본문형 필드는 끝에서부터 문장/어절 경계로 줄여서 통과시킵니다.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(FIELD_LIMITS if limits is None else limits)
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.passed = 0
+        self.repaired: Counter = Counter()   # 필드 -> 줄인 횟수
+        self.rejected: Counter = Counter()   # 사유 -> 버린 횟수
+
+    def check(self, item: Any) -> Optional[Dict[str, Any]]:
+        """검증을 통과한 패러디 dict(필드 값 정리/보정, 그 밖의 키는 유지)를 반환합니다."""
+        reason = None
+        parody: Dict[str, Any] = {}
+        repaired = []
+        if not isinstance(item, dict):
+            reason = 'not_object'
+        else:
+            parody = dict(item)
+            for field, limit in self.limits.items():
+                value = parody.get(field)
+                if not isinstance(value, str) or not value.strip():
+                    reason = f'missing_{field}'
+                    break
+                value = _SPACE_RE.sub(' ', value).strip()
+                if len(value) > limit:
+                    value = None if field in STRICT_FIELDS else shorten_text(value, limit)
+                    if value is None:
+                        reason = f'too_long_{field}'
+                        break
+                    repaired.append(field)
+                parody[field] = value
+        with self._lock:
+            self.checked += 1
+            if reason:
+                self.rejected[reason] += 1
+            else:
+                self.passed += 1
+                self.repaired.update(repaired)
+        if reason:
+            logger.warning(f"패러디 검증 실패({reason})로 건너뜁니다: {str(item)[:80]}")
+            return None
+        if repaired:
+            logger.debug(f"길이 초과 필드 보정({', '.join(repaired)}): {parody['ou_title']}")
+        return parody
+
+    def reject(self, reason: str):
+        """원소를 꺼내기도 전에 버린 응답(파싱 실패 등)을 기록합니다."""
+        with self._lock:
+            self.checked += 1
+            self.rejected[reason] += 1
+
+    def log_stats(self, calls: int = 0, accepted: int = 0):
+        with self._lock:
+            checked, passed = self.checked, self.passed
+            repaired, rejected = dict(self.repaired), dict(self.rejected)
+        if not checked:
+            return
+        repaired_note = ', '.join(f"{field} {count}" for field, count in repaired.items()) or '없음'
+        rejected_note = ', '.join(f"{reason} {count}" for reason, count in rejected.items()) or '없음'
+        logger.info(f"🧾 패러디 검증: {checked}건 중 통과 {passed}건 "
+                    f"(길이 보정: {repaired_note}), 버림 {checked - passed}건 ({rejected_note})")
+        if calls and accepted:
+            logger.info(f"🧾 Claude 호출 {calls}건으로 패러디 {accepted}건 채택 (채택 1건당 호출 {calls / accepted:.2f}건)")
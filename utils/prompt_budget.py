@@ -0,0 +1,246 @@
+"""프롬프트 구역별 입력 토큰 추정, 예산 맞추기, 실행별 사용량 보고.
+
+프롬프트를 구역(PromptSection: 지침, 최근 제목, 패턴 현황, 기사 본문 등)으로 나눠 만들고,
+요청을 보내기 전에 구역마다 입력 토큰을 로컬에서 추정합니다.
+
+- PromptBudget: 추정 합계가 예산을 넘으면 줄일 수 있는 구역을 우선순위(trim_priority가
+  작은 것부터) 순서로 줄입니다. 같은 우선순위의 구역(묶음 요청의 기사 본문들)은 크기에 비례해 줄입니다.
+- PromptProfiler: 구역별 추정 토큰을 실행 내내 모아 구역별 비중을 보고하고,
+  응답의 실제 입력 토큰과 추정치를 비교해 추정 오차를 함께 기록합니다.
+- OutputTokenBudget: 실제 출력 토큰 수를 관측해 다음 요청의 max_tokens를 줄여 잡습니다.
+  출력이 max_tokens에서 잘리면 관측치를 비우고 상한으로 되돌립니다.
+
+    sections = [PromptSection('system', SYSTEM),
+                PromptSection('recent_titles', titles, trim_priority=1, shrink=drop_oldest_lines(3)),
+                PromptSection('article_body', body, trim_priority=2, shrink=truncate_text)]
+    texts = budget.fit(sections)            # {'system': ..., 'recent_titles': ..., ...}
+    params = {...}                          # texts로 만든 요청 파라미터
+    profiler.record(label, sections, params)
+    ...
+    profiler.record_actual(params, response.usage)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from utils.llm_gateway import estimate_tokens
+except ImportError:
+    from llm_gateway import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+Estimator = Callable[[str], int]
+# (현재 텍스트, 목표 토큰 수) -> 줄인 텍스트 (목표까지 못 줄이면 줄일 수 있는 만큼만)
+ShrinkFn = Callable[[str, int], str]
+
+
+@dataclass
+class PromptSection:
+    """프롬프트의 한 구역. trim_priority가 None이면 예산을 넘어도 줄이지 않습니다."""
+    name: str
+    text: str
+    trim_priority: Optional[int] = None
+    shrink: Optional[ShrinkFn] = None
+    tokens: int = 0          # fit() 이후 추정 토큰 수
+    trimmed_tokens: int = 0  # fit()이 줄인 토큰 수
+
+
+def truncate_text(text: str, target_tokens: int, estimator: Estimator = estimate_tokens) -> str:
+    """추정 토큰이 target_tokens 이하가 되도록 뒤에서부터 자릅니다. (문장 경계 우선)"""
+    if estimator(text) <= target_tokens:
+        return text
+    ratio = max(0.0, target_tokens / max(1, estimator(text)))
+    cut = text[:int(len(text) * ratio)]
+    boundary = max(cut.rfind('. '), cut.rfind('다.'))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 2]
+    return cut.rstrip()
+
+
+def drop_oldest_lines(keep: int, estimator: Estimator = estimate_tokens) -> ShrinkFn:
+    """여러 줄 목록(최근 제목 등)에서 앞쪽(오래된) 줄부터 지우는 shrink 함수. 최소 keep줄은 남깁니다."""
+    def shrink(text: str, target_tokens: int) -> str:
+        lines = text.split('\n')
+        while len(lines) > keep and estimator('\n'.join(lines)) > target_tokens:
+            lines.pop(0)
+        return '\n'.join(lines)
+    return shrink
+
+
+class PromptBudget:
+    """요청 하나의 입력 토큰 예산. max_input_tokens가 0 이하이면 줄이지 않고 추정만 합니다."""
+
+    def __init__(self, max_input_tokens: int, estimator: Estimator = estimate_tokens):
+        self.max_input_tokens = max_input_tokens
+        self.estimator = estimator
+
+    def fit(self, sections: List[PromptSection], max_input_tokens: Optional[int] = None) -> Dict[str, str]:
+        """구역을 예산 안으로 줄이고 구역 이름 -> 텍스트를 반환합니다. (같은 이름은 마지막 구역)
+
+        sections의 text/tokens/trimmed_tokens가 갱신됩니다.
+        """
+        limit = self.max_input_tokens if max_input_tokens is None else max_input_tokens
+        for section in sections:
+            section.tokens = self.estimator(section.text)
+        total = sum(s.tokens for s in sections)
+
+        if limit > 0 and total > limit:
+            by_priority: Dict[int, List[PromptSection]] = defaultdict(list)
+            for section in sections:
+                if section.trim_priority is not None and section.shrink is not None:
+                    by_priority[section.trim_priority].append(section)
+            for priority in sorted(by_priority):
+                over = total - limit
+                if over <= 0:
+                    break
+                group = by_priority[priority]
+                group_tokens = sum(s.tokens for s in group) or 1
+                for section in group:
+                    share = -(-over * section.tokens // group_tokens)  # 올림
+                    shrunk = section.shrink(section.text, max(0, section.tokens - share))
+                    shrunk_tokens = self.estimator(shrunk)
+                    if shrunk_tokens < section.tokens:
+                        section.trimmed_tokens += section.tokens - shrunk_tokens
+                        total -= section.tokens - shrunk_tokens
+                        section.text, section.tokens = shrunk, shrunk_tokens
+            if total > limit:
+                logger.debug(f"프롬프트를 예산({limit} 토큰) 안으로 줄이지 못했습니다: 추정 {total} 토큰")
+        return {section.name: section.text for section in sections}
+
+
+class PromptProfiler:
+    """실행 중 보낸 프롬프트의 구역별 추정 토큰과 실제 입력 토큰을 모읍니다. (스레드 안전)"""
+
+    def __init__(self, name: str = 'Claude'):
+        self.name = name
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.trimmed_requests = 0
+        self.section_tokens: Counter = Counter()
+        self.section_trimmed: Counter = Counter()
+        self.estimated_total = 0
+        # 실제 usage를 받은 요청의 (추정, 실제) 합계
+        self.matched_estimated = 0
+        self.matched_actual = 0
+        self._pending: Dict[int, tuple] = {}  # id(요청 파라미터) -> (label, 추정 토큰)
+
+    def record(self, label: str, sections: List[PromptSection], request: Optional[Dict[str, Any]] = None) -> int:
+        """fit()을 거친 구역 목록을 기록하고 추정 입력 토큰 합계를 반환합니다.
+
+        request(보낼 요청 파라미터)를 주면 record_actual(request, usage)로 실제 사용량과 비교합니다.
+        """
+        total = sum(s.tokens for s in sections)
+        trimmed = sum(s.trimmed_tokens for s in sections)
+        with self._lock:
+            if request is not None:
+                self._pending[id(request)] = (label, total)
+            self.requests += 1
+            self.estimated_total += total
+            if trimmed:
+                self.trimmed_requests += 1
+            for section in sections:
+                self.section_tokens[section.name] += section.tokens
+                if section.trimmed_tokens:
+                    self.section_trimmed[section.name] += section.trimmed_tokens
+        breakdown = ', '.join(f"{s.name} {s.tokens}" for s in sections)
+        trim_note = f", 예산 맞추려고 {trimmed} 토큰 줄임" if trimmed else ''
+        logger.debug(f"[{self.name}] {label}: 추정 입력 {total} 토큰 ({breakdown}){trim_note}")
+        return total
+
+    def record_actual(self, request: Dict[str, Any], usage: Any):
+        """응답 usage의 실제 입력 토큰(캐시 읽기/쓰기 포함)을 record()의 추정치와 비교해 기록합니다.
+
+        요청이 실패했으면 usage=None으로 불러 대기 항목만 지웁니다.
+        """
+        with self._lock:
+            pending = self._pending.pop(id(request), None)
+        if pending is None or usage is None:
+            return
+        label, estimated = pending
+        actual = sum(int((usage.get(name) if isinstance(usage, dict) else getattr(usage, name, 0)) or 0)
+                     for name in ('input_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens'))
+        if not actual:
+            return
+        with self._lock:
+            self.matched_estimated += estimated
+            self.matched_actual += actual
+        logger.debug(f"[{self.name}] {label}: 입력 토큰 추정 {estimated} / 실제 {actual}")
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.section_tokens.values())
+            return {
+                'requests': self.requests,
+                'trimmed_requests': self.trimmed_requests,
+                'estimated_total': self.estimated_total,
+                'avg_per_request': self.estimated_total / self.requests if self.requests else 0.0,
+                'sections': {name: {'tokens': tokens, 'share': tokens / total if total else 0.0,
+                                    'trimmed': self.section_trimmed.get(name, 0)}
+                             for name, tokens in self.section_tokens.most_common()},
+                'actual_ratio': (self.matched_actual / self.matched_estimated
+                                 if self.matched_estimated else None),
+            }
+
+    def log_report(self):
+        r = self.report()
+        if not r['requests']:
+            return
+        logger.info(
+            f"📐 {self.name} 프롬프트 크기: 요청 {r['requests']}건, 추정 입력 {r['estimated_total']:,} 토큰 "
+            f"(요청당 {r['avg_per_request']:,.0f}), 예산 초과로 줄인 요청 {r['trimmed_requests']}건"
+        )
+        for name, s in r['sections'].items():
+            trimmed = f", 줄임 {s['trimmed']:,}" if s['trimmed'] else ''
+            logger.info(f"  {name}: {s['tokens']:,} 토큰 ({s['share']:.1%}){trimmed}")
+        if r['actual_ratio'] is not None:
+            logger.info(f"  실제 입력 토큰 / 추정: {r['actual_ratio']:.2f}배")
+
+
+class OutputTokenBudget:
+    """관측한 출력 토큰(기사 1건당)의 상위 백분위수로 max_tokens를 정합니다. (스레드 안전)
+
+    관측치가 min_samples개 미만이면 호출하는 쪽이 준 상한(ceiling)을 그대로 씁니다.
+    """
+
+    def __init__(self, floor: int = 256, headroom: float = 1.5, margin: int = 64,
+                 percentile: float = 0.95, window: int = 50, min_samples: int = 5):
+        self.floor = floor
+        self.headroom = headroom
+        self.margin = margin
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.truncations = 0
+
+    def max_tokens(self, ceiling: int, items: int = 1) -> int:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return ceiling
+        per_item = samples[min(len(samples) - 1, math.ceil(self.percentile * len(samples)) - 1)]
+        return max(self.floor, min(ceiling, int(per_item * items * self.headroom) + self.margin))
+
+    def observe(self, output_tokens: int, items: int = 1, truncated: bool = False):
+        """응답 하나의 출력 토큰 수를 기록합니다. truncated(max_tokens에서 잘림)이면 관측치를 비웁니다."""
+        with self._lock:
+            if truncated:
+                self.truncations += 1
+                self._samples.clear()
+            elif output_tokens > 0 and items > 0:
+                self._samples.append(output_tokens / items)
+
+    def log_stats(self, ceiling: int):
+        with self._lock:
+            observed = len(self._samples)
+        if not observed and not self.truncations:
+            return
+        logger.info(f"📐 출력 토큰 예산: 기사 1건 요청 max_tokens {self.max_tokens(ceiling)} (상한 {ceiling}, "
+                    f"관측 {observed}건, 잘림 {self.truncations}건)")
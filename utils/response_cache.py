@@ -0,0 +1,154 @@
+"""기사 내용 기준으로 주소를 매기는 Claude 패러디 응답 캐시 (SQLite).
+
+키는 기사 제목/본문 해시와 프롬프트 버전, 모델 파라미터를 합친 해시라서
+같은 기사를 같은 조건으로 다시 요청할 때만 적중합니다. (URL이 달라도 내용이 같으면 적중)
+같은 날 재실행하거나 중간에 멈춘 실행을 다시 돌릴 때 검증을 통과한 패러디를
+API 호출 없이 그대로 다시 사용합니다.
+
+- TTL이 지난 항목은 무시하고, 항목 수가 max_entries를 넘으면
+  가장 오래 사용되지 않은 항목부터 삭제합니다. (LRU)
+- 항목마다 생성에 든 토큰 수(묶음 요청이면 기사 수로 나눈 값)를 함께 저장해
+  캐시된 응답을 실제로 사용할 때(record_saving) 절감한 호출 수와 토큰 수를 집계합니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(title: str, text: str, **params: Any) -> str:
+    """기사 제목/본문과 프롬프트·모델 파라미터로 만든 캐시 키"""
+    payload = {
+        'title': (title or '').strip(),
+        'text': hashlib.sha256((text or '').encode('utf-8')).hexdigest(),
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """캐시 키 → 패러디 딕셔너리(ou_title, latte, ou_think) 캐시
+
+    get()은 {'parody', 'request_share', 'input_tokens', 'output_tokens'} 항목을 반환합니다.
+    """
+
+    def __init__(self, db_path: Union[str, Path], ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 3000):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.used = 0
+        self.saved_requests = 0.0
+        self.saved_input_tokens = 0
+        self.saved_output_tokens = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY,'
+                ' payload BLOB NOT NULL,'       # 압축된 JSON
+                ' request_share REAL NOT NULL,'  # 요청 1건 중 이 기사가 차지한 비율 (1 / 묶음 크기)
+                ' input_tokens INTEGER NOT NULL,'
+                ' output_tokens INTEGER NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' last_access REAL NOT NULL,'
+                ' hit_count INTEGER NOT NULL DEFAULT 0)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 항목을 반환합니다. 없거나 만료되었으면 None"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT payload, request_share, input_tokens, output_tokens, created_at FROM responses WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None or now - row[4] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            payload, share, input_tokens, output_tokens, _ = row
+            conn.execute('UPDATE responses SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?', (now, key))
+            conn.commit()
+            self.hits += 1
+        return {
+            'parody': json.loads(zlib.decompress(payload).decode('utf-8')),
+            'request_share': share,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+        }
+
+    def record_saving(self, entry: Dict[str, Any]):
+        """get()으로 받은 항목을 실제로 사용했을 때 절감량을 집계합니다."""
+        with self._lock:
+            self.used += 1
+            self.saved_requests += entry.get('request_share', 0)
+            self.saved_input_tokens += entry.get('input_tokens', 0)
+            self.saved_output_tokens += entry.get('output_tokens', 0)
+
+    def put(self, key: str, parody: Dict[str, Any], request_share: float = 1.0,
+            input_tokens: int = 0, output_tokens: int = 0):
+        """검증을 통과한 패러디를 저장합니다."""
+        now = time.time()
+        payload = zlib.compress(json.dumps(parody, ensure_ascii=False).encode('utf-8'))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, payload, request_share, input_tokens, output_tokens, created_at, last_access, hit_count) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, 0)',
+                (key, payload, request_share, int(input_tokens), int(output_tokens), now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        conn.execute('DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+        (count,) = conn.execute('SELECT COUNT(*) FROM responses').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)',
+                (overflow,),
+            )
+
+    def log_stats(self):
+        if not (self.hits or self.misses):
+            return
+        logger.info(
+            f"💾 응답 캐시: 적중 {self.hits}건 (사용 {self.used}건), 미스 {self.misses}건 → "
+            f"Claude 호출 약 {self.saved_requests:.1f}건, 입력 {self.saved_input_tokens:,} 토큰, "
+            f"출력 {self.saved_output_tokens:,} 토큰 절감"
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,154 @@
+"""RSS 피드 조건부 요청(ETag/Last-Modified) 상태와 로컬 스냅샷 저장소.
+
+피드별로 마지막 응답의 ETag/Last-Modified 값, 최신 게시 시각(high-water mark),
+최근 항목 스냅샷을 JSON 파일에 보관합니다. 피드가 변경되지 않았으면(304)
+스냅샷을 그대로 사용하고, 변경되었으면 새 항목만 스냅샷에 병합합니다.
+"""
+
+from __future__ import annotations
+
+import calendar
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷에 보관할 항목 필드 (게시 시각은 struct_time → 리스트로 변환)
+SNAPSHOT_FIELDS = ('id', 'title', 'link', 'summary', 'published', 'published_parsed',
+                   'updated', 'updated_parsed', 'author')
+TIME_FIELDS = ('published_parsed', 'updated_parsed')
+
+
+def entry_guid(entry: Dict[str, Any]) -> str:
+    """피드 항목의 고유 ID (GUID가 없으면 링크)"""
+    return entry.get('id') or entry.get('link') or ''
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> Optional[float]:
+    """피드 항목의 게시 시각(epoch 초). 없으면 None
+
+    feedparser의 *_parsed 값은 UTC 기준 struct_time이므로 calendar.timegm으로 변환합니다.
+    """
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(tuple(parsed)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _serialize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    data = {}
+    for key in SNAPSHOT_FIELDS:
+        # FeedParserDict.get은 없는 updated*를 published*로 대신 돌려주며 경고를 내므로 저장된 값만 읽음
+        value = dict.get(entry, key)
+        if value is None:
+            continue
+        if key in TIME_FIELDS:
+            value = list(value)[:9]
+        data[key] = value
+    return data
+
+
+def _deserialize_entry(data: Dict[str, Any]) -> feedparser.FeedParserDict:
+    entry = dict(data)
+    for key in TIME_FIELDS:
+        if entry.get(key):
+            entry[key] = time.struct_time(tuple(entry[key]))
+    return feedparser.FeedParserDict(entry)
+
+
+class FeedStateStore:
+    """피드별 조건부 요청 값과 항목 스냅샷을 관리합니다."""
+
+    def __init__(self, path: Union[str, Path], retention_hours: int = 48, max_entries_per_feed: int = 300):
+        self.path = Path(path)
+        self.retention_seconds = retention_hours * 3600
+        self.max_entries_per_feed = max_entries_per_feed
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            self._feeds = json.loads(self.path.read_text(encoding='utf-8')).get('feeds', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"RSS 상태 파일을 읽을 수 없어 새로 시작합니다: {self.path}, {e}")
+            self._feeds = {}
+
+    def save(self):
+        """상태를 파일에 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            payload = json.dumps({'feeds': self._feeds}, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(payload, encoding='utf-8')
+        tmp_path.replace(self.path)
+
+    def validators(self, url: str) -> Dict[str, Optional[str]]:
+        """조건부 요청에 사용할 ETag/Last-Modified 값"""
+        with self._lock:
+            state = self._feeds.get(url, {})
+            return {'etag': state.get('etag'), 'modified': state.get('modified')}
+
+    def snapshot(self, url: str) -> List[feedparser.FeedParserDict]:
+        """마지막으로 저장된 피드 항목 목록"""
+        with self._lock:
+            entries = list(self._feeds.get(url, {}).get('entries', []))
+        return [_deserialize_entry(e) for e in entries]
+
+    def merge_snapshot(self, url: str, entries: List[Dict[str, Any]], etag: Optional[str] = None,
+                       modified: Optional[str] = None) -> Tuple[List[feedparser.FeedParserDict], int]:
+        """새로 받은 항목을 스냅샷에 병합하고, 병합된 스냅샷 전체를 반환합니다.
+
+        새 항목만 돌려주는 것이 아니라 보관 기간 안의 기존 항목까지 포함합니다.
+        (304일 때의 snapshot()과 같은 범위를 쓰기 위함)
+
+        Returns:
+            (병합된 스냅샷 전체 항목 목록, 그중 새 항목 수)
+        """
+        now = time.time()
+        with self._lock:
+            state = self._feeds.setdefault(url, {})
+            high_water = state.get('high_water')
+            snapshot = {entry_guid(e): e for e in state.get('entries', [])}
+
+            new_count = 0
+            for entry in entries:
+                guid = entry_guid(entry)
+                if not guid:
+                    continue
+                ts = entry_timestamp(entry)
+                if guid not in snapshot or (ts is not None and high_water is not None and ts > high_water):
+                    if guid not in snapshot:
+                        new_count += 1
+                    snapshot[guid] = _serialize_entry(entry)
+                if ts is not None and (high_water is None or ts > high_water):
+                    high_water = ts
+
+            # 보관 기간이 지난 항목 정리 후 최신순으로 개수 제한
+            kept = []
+            for data in snapshot.values():
+                ts = entry_timestamp(data)
+                if ts is None or now - ts <= self.retention_seconds:
+                    kept.append(data)
+            kept.sort(key=lambda d: entry_timestamp(d) or 0, reverse=True)
+            kept = kept[:self.max_entries_per_feed]
+
+            state.update({
+                'etag': etag,
+                'modified': modified,
+                'high_water': high_water,
+                'checked_at': now,
+                'entries': kept,
+            })
+        return [_deserialize_entry(e) for e in kept], new_count
@@ -0,0 +1,103 @@
+"""RSS 항목의 요약(description)으로 기사 본문 스크래핑을 대신하는 정책.
+
+프롬프트에는 본문을 추출 요약한 600자 정도만 들어가고 시트에도 1000자까지만 저장되므로,
+피드 요약이 충분히 길고 내용이 온전하면 기사 페이지를 내려받지 않고 요약으로 패러디를 만듭니다.
+요약이 짧거나(제목 반복, 한두 문장짜리 리드 등) 품질 점수가 낮으면 기존처럼 본문을 스크래핑합니다.
+
+품질 점수(0~1)는 길이(목표 길이 대비), 문장 수, 한글 비율, 제목과의 중복 정도로 계산합니다.
+"""
+
+from __future__ import annotations
+
+import html
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_CHARS = 250
+DEFAULT_MIN_SCORE = 0.7
+# 리드 한 문장짜리 요약은 점수와 무관하게 스크래핑
+MIN_SENTENCES = 2
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+# (서울=연합뉴스) 홍길동 기자 = / (서울=연합뉴스) 홍길동 김철수 기자 =
+_BYLINE_RE = re.compile(r'^\s*\([^)]{1,20}=[^)]{1,20}\)\s*(?:[^=]{0,40}?(?:기자|특파원|통신원)\s*=\s*)?')
+_SENTENCE_END_RE = re.compile(r'(?:[.!?]|다\.|요\.)(?:["\'”’)]*)(?:\s|$)')
+_HANGUL_RE = re.compile(r'[가-힣]')
+_WORD_RE = re.compile(r'[가-힣A-Za-z0-9]+')
+
+
+def clean_summary(raw: str) -> str:
+    """요약 HTML에서 태그/엔티티/기자 머리말을 제거하고 공백을 정리합니다."""
+    text = html.unescape(_TAG_RE.sub(' ', raw or ''))
+    text = _SPACE_RE.sub(' ', text).strip()
+    return _BYLINE_RE.sub('', text, count=1).strip()
+
+
+def count_sentences(text: str) -> int:
+    return len(_SENTENCE_END_RE.findall(text))
+
+
+def summary_quality(title: str, summary: str, target_chars: int = DEFAULT_MIN_CHARS) -> float:
+    """요약 품질 점수 (0~1)"""
+    if not summary:
+        return 0.0
+    length_score = min(1.0, len(summary) / max(1, target_chars))
+    sentences = count_sentences(summary)
+    sentence_score = min(1.0, sentences / 3)
+    letters = [c for c in summary if not c.isspace()]
+    hangul_score = min(1.0, len(_HANGUL_RE.findall(summary)) / max(1, len(letters)) / 0.5)
+
+    # 요약이 제목을 거의 그대로 되풀이하면 감점
+    title_words = set(_WORD_RE.findall(title or ''))
+    summary_words = _WORD_RE.findall(summary)
+    novelty = 1.0
+    if summary_words and title_words:
+        novelty = sum(1 for w in summary_words if w not in title_words) / len(summary_words)
+
+    return round(0.4 * length_score + 0.25 * sentence_score + 0.1 * hangul_score + 0.25 * novelty, 3)
+
+
+class SummaryPolicy:
+    """요약을 본문 대신 쓸지 결정하고, 생략한 스크래핑 수를 집계합니다. (스레드 안전)"""
+
+    def __init__(self, min_chars: int = DEFAULT_MIN_CHARS, min_score: float = DEFAULT_MIN_SCORE):
+        self.min_chars = min_chars
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self.used = 0   # 요약으로 대신한 기사 (생략한 스크래핑)
+        self.thin = 0   # 요약이 부족해 스크래핑한 기사
+
+    def article_from_entry(self, news: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """요약이 충분하면 스크래핑 결과와 같은 형식의 기사 딕셔너리를, 아니면 None을 반환합니다."""
+        title = news.get('title', '')
+        summary = clean_summary(news.get('summary') or news.get('description') or '')
+        score = summary_quality(title, summary, self.min_chars)
+        usable = (len(summary) >= self.min_chars and score >= self.min_score
+                  and count_sentences(summary) >= MIN_SENTENCES)
+        with self._lock:
+            if usable:
+                self.used += 1
+            else:
+                self.thin += 1
+        if not usable:
+            return None
+        logger.debug(f"RSS 요약 사용 ({len(summary)}자, 점수 {score}): {news.get('link', '')}")
+        return {
+            'url': news.get('link', ''),
+            'title': title,
+            'text': summary,
+            'publish_date': None,
+            'from_summary': True,
+        }
+
+    def log_stats(self):
+        total = self.used + self.thin
+        if not total:
+            return
+        logger.info(f"RSS 요약 사용: {total}건 중 {self.used}건은 요약으로 생성해 스크래핑 생략, "
+                    f"{self.thin}건은 요약이 부족해 본문 스크래핑 (기준 {self.min_chars}자, 점수 {self.min_score})")
@@ -0,0 +1,145 @@
+"""step1 실행 중간 결과를 남기는 추가 전용(append-only) 저널 (JSONL).
+
+패러디를 확정하거나 버릴 때마다, 기사 스크래핑이 끝날 때마다 한 줄씩 기록하고
+바로 디스크에 씁니다. 실행이 중간에 죽어도(step4의 300초 제한 등) 같은 날 다시 실행하면
+저널에서 확정된 패러디와 이미 처리한 기사를 복원해 이어서 진행합니다.
+메시지 배치는 제출하자마자 배치 ID를 기록하므로, 결과를 기다리다 죽어도 다음 실행이
+새로 제출하지 않고 같은 배치의 결과를 받아 씁니다.
+결과 저장까지 끝나면 'completed'를 기록하고, 그 뒤의 실행은 처음부터 시작합니다.
+
+기록 형식 (한 줄에 JSON 하나):
+    {"type": "run_start", "time": ...}
+    {"type": "scrape", "url": ..., "ok": true, "chars": 1234}
+    {"type": "accepted", "url": ..., "rank": 3, "parody": {...}}
+    {"type": "rejected", "url": ..., "rank": 4, "reason": "similar"}
+    {"type": "batch_submitted", "batch_id": ..., "requests": {"rank-0001": ["<응답 캐시 키>", ...]}}
+    {"type": "batch_collected", "batch_id": ...}
+    {"type": "completed", "time": ..., "count": 30}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'journal'
+
+# 이어서 실행할 때 다시 시도하지 않는 제외 사유 (API 실패, JSON 오류 등은 다시 요청)
+FINAL_REJECT_REASONS = {'similar', 'no_article'}
+
+
+class RunJournal:
+    """하루 단위 실행 저널. 생성 시 기존 기록을 읽어 이어서 진행할 상태를 복원합니다."""
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_JOURNAL_DIR, day: Optional[date] = None,
+                 resume: bool = True, retention_days: int = 7):
+        self.directory = Path(directory)
+        self.day = day or date.today()
+        self.path = self.directory / f"{self.day.isoformat()}.jsonl"
+        self._lock = threading.Lock()
+
+        # 복원된 상태 (마지막 'completed' 이후의 기록만 사용)
+        self.accepted: List[Dict[str, Any]] = []
+        self.rejected_urls: Set[str] = set()
+        self.failed_scrapes: Set[str] = set()
+        # 제출했지만 결과를 아직 받지 못한 배치: 배치 ID -> custom_id -> 기사별 응답 캐시 키
+        self.pending_batches: Dict[str, Dict[str, List[str]]] = {}
+
+        self._cleanup(retention_days)
+        if resume:
+            self._load()
+        elif self.path.exists():
+            # 처음부터 다시 시작: 이전 기록은 완료된 것으로 간주
+            self._append({'type': 'completed', 'time': time.time(), 'count': None, 'reason': 'restart'})
+        self._append({'type': 'run_start', 'time': time.time(), 'resumed': len(self.accepted)})
+
+    def _cleanup(self, retention_days: int):
+        if not self.directory.exists():
+            return
+        oldest = self.day - timedelta(days=retention_days)
+        for path in self.directory.glob('*.jsonl'):
+            try:
+                if date.fromisoformat(path.stem) < oldest:
+                    path.unlink(missing_ok=True)
+            except ValueError:
+                continue
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # 기록 도중 죽어서 잘린 마지막 줄 등은 건너뜀
+                    logger.warning(f"저널 {self.path.name} {line_num}번째 줄을 읽을 수 없어 건너뜁니다.")
+                    continue
+                kind = event.get('type')
+                if kind == 'completed':
+                    self.accepted, self.rejected_urls, self.failed_scrapes = [], set(), set()
+                    self.pending_batches = {}
+                elif kind == 'accepted' and event.get('parody'):
+                    self.accepted.append(event['parody'])
+                elif kind == 'rejected' and event.get('url') and event.get('reason') in FINAL_REJECT_REASONS:
+                    self.rejected_urls.add(event['url'])
+                elif kind == 'scrape' and event.get('url') and not event.get('ok'):
+                    self.failed_scrapes.add(event['url'])
+                elif kind == 'batch_submitted' and event.get('batch_id'):
+                    self.pending_batches[event['batch_id']] = event.get('requests') or {}
+                elif kind == 'batch_collected':
+                    self.pending_batches.pop(event.get('batch_id'), None)
+        if self.pending_batches:
+            logger.info(f"📒 결과를 받지 못한 메시지 배치 {len(self.pending_batches)}건을 이어서 확인합니다: "
+                        f"{', '.join(self.pending_batches)}")
+        if self.accepted or self.rejected_urls:
+            logger.info(f"📒 중단된 실행을 이어갑니다: 확정 {len(self.accepted)}건, "
+                        f"제외 {len(self.rejected_urls)}건, 스크래핑 실패 {len(self.failed_scrapes)}건 ({self.path.name})")
+
+    def _append(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @property
+    def processed_urls(self) -> Set[str]:
+        """이미 확정/제외했거나 스크래핑에 실패한 기사 URL"""
+        accepted_urls = {p.get('original_link', '') for p in self.accepted}
+        return (accepted_urls | self.rejected_urls | self.failed_scrapes) - {''}
+
+    def record_scrape(self, url: str, article: Optional[Dict[str, Any]]):
+        text = (article or {}).get('text') or ''
+        self._append({'type': 'scrape', 'url': url, 'ok': bool(text), 'chars': len(text)})
+
+    def record_accepted(self, url: str, rank: int, parody: Dict[str, Any]):
+        self._append({'type': 'accepted', 'url': url, 'rank': rank, 'parody': parody})
+
+    def record_rejected(self, url: str, rank: int, reason: str):
+        self._append({'type': 'rejected', 'url': url, 'rank': rank, 'reason': reason})
+
+    def record_batch_submitted(self, batch_id: str, requests: Dict[str, List[str]]):
+        """배치 제출 직후 배치 ID와 요청별 기사 응답 캐시 키를 기록합니다."""
+        with self._lock:
+            self.pending_batches[batch_id] = requests
+        self._append({'type': 'batch_submitted', 'batch_id': batch_id, 'requests': requests})
+
+    def record_batch_collected(self, batch_id: str):
+        with self._lock:
+            self.pending_batches.pop(batch_id, None)
+        self._append({'type': 'batch_collected', 'batch_id': batch_id})
+
+    def complete(self, count: int):
+        """결과 저장까지 끝났음을 기록합니다. 이후 실행은 처음부터 시작합니다."""
+        self._append({'type': 'completed', 'time': time.time(), 'count': count})
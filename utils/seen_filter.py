@@ -0,0 +1,227 @@
+"""이전 실행에서 이미 패러디한 기사를 걸러내는 날짜별 블룸 필터.
+
+패러디에 사용한 기사의 정규화 URL과 제목 지문(fingerprint)을
+- cache/seen/history.jsonl 에 기록(원본)하고
+- cache/seen/YYYY-MM-DD.bloom 날짜별 블룸 필터에 추가합니다.
+
+조회는 보관 기간(retention_days) 안의 '오늘 이전' 필터만 사용하므로
+같은 날 재실행할 때는 그날 고른 기사를 다시 쓸 수 있습니다.
+보관 기간이 지난 필터 파일은 자동으로 삭제됩니다.
+
+재구성 / 상태 확인:
+    python -m utils.seen_filter rebuild --retention-days 7
+    python -m utils.seen_filter stats
+    python -m utils.seen_filter check <URL 또는 제목>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.article_cache import canonical_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEN_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'seen'
+HISTORY_FILE_NAME = 'history.jsonl'
+
+_TITLE_PREFIX_RE = re.compile(r'^\s*(\[[^\]]*\]|\([^)]*\)|【[^】]*】)\s*')
+_TITLE_STRIP_RE = re.compile(r'[\s\W_]+')
+
+
+def title_fingerprint(title: str) -> str:
+    """제목 지문: [속보] 같은 머리말, ' | 연합뉴스' 같은 꼬리말, 공백/기호를 제거한 문자열의 해시"""
+    text = str(title or '')
+    while True:
+        stripped = _TITLE_PREFIX_RE.sub('', text, count=1)
+        if stripped == text:
+            break
+        text = stripped
+    text = text.split(' | ')[0]
+    text = _TITLE_STRIP_RE.sub('', text).lower()
+    if not text:
+        return ''
+    return 't:' + hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def url_key(url: str) -> str:
+    key = canonical_url(url)
+    return 'u:' + key if key else ''
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 블룸 필터 (blake2b 이중 해싱)"""
+
+    def __init__(self, capacity: int = 2000, error_rate: float = 0.001):
+        # 최적 비트 수 m = -n ln p / (ln 2)^2, 해시 수 k = m/n ln 2 (8의 배수로 올림)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)) + 7) // 8 * 8
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(self.num_bits // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.num_hashes]) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        bloom = cls.__new__(cls)
+        bloom.num_hashes = data[0]
+        bloom.bits = bytearray(data[1:])
+        bloom.num_bits = len(bloom.bits) * 8
+        return bloom
+
+
+class SeenFilter:
+    """날짜별 블룸 필터 묶음. 보관 기간 안의 이전 날짜 필터로 '이미 사용한 기사'를 판별합니다."""
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_SEEN_DIR, retention_days: int = 7,
+                 capacity_per_day: int = 2000, today: Optional[date] = None):
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self.capacity_per_day = capacity_per_day
+        self.today = today or date.today()
+        self._filters: Dict[date, BloomFilter] = {}
+        self._load()
+
+    @property
+    def history_path(self) -> Path:
+        return self.directory / HISTORY_FILE_NAME
+
+    def _filter_path(self, day: date) -> Path:
+        return self.directory / f"{day.isoformat()}.bloom"
+
+    def _oldest_day(self) -> date:
+        return self.today - timedelta(days=self.retention_days)
+
+    def _load(self):
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob('*.bloom'):
+            try:
+                day = date.fromisoformat(path.stem)
+            except ValueError:
+                continue
+            if day < self._oldest_day():
+                path.unlink(missing_ok=True)
+                continue
+            self._filters[day] = BloomFilter.from_bytes(path.read_bytes())
+
+    def _keys(self, url: str = '', title: str = '') -> List[str]:
+        return [k for k in (url_key(url), title_fingerprint(title)) if k]
+
+    def is_seen(self, url: str = '', title: str = '') -> bool:
+        """보관 기간 안의 이전 날짜에 사용한 URL 또는 같은 제목이면 True"""
+        keys = self._keys(url, title)
+        for day, bloom in self._filters.items():
+            if day >= self.today:
+                continue
+            if any(k in bloom for k in keys):
+                return True
+        return False
+
+    def filter_entries(self, entries: List[Dict]) -> List[Dict]:
+        """RSS 항목 중 이미 사용한 기사를 제외한 목록"""
+        if not self._filters:
+            return entries
+        return [e for e in entries if not self.is_seen(e.get('link', ''), e.get('title', ''))]
+
+    def record(self, url: str = '', title: str = '', day: Optional[date] = None):
+        """사용한 기사를 기록합니다. (원본 기록 + 해당 날짜 필터)"""
+        day = day or self.today
+        keys = self._keys(url, title)
+        if not keys:
+            return
+        bloom = self._filters.setdefault(day, BloomFilter(self.capacity_per_day))
+        for key in keys:
+            bloom.add(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'date': day.isoformat(), 'url': url, 'title': title}, ensure_ascii=False) + '\n')
+
+    def save(self):
+        """날짜별 필터 파일을 저장합니다."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for day, bloom in self._filters.items():
+            self._filter_path(day).write_bytes(bloom.to_bytes())
+
+    def rebuild(self) -> int:
+        """원본 기록(history.jsonl)에서 보관 기간 안의 필터를 다시 만들고 오래된 기록을 정리합니다.
+
+        Returns:
+            필터에 다시 반영한 기록 수
+        """
+        for path in self.directory.glob('*.bloom'):
+            path.unlink(missing_ok=True)
+        self._filters = {}
+        if not self.history_path.exists():
+            return 0
+
+        kept_lines = []
+        count = 0
+        oldest = self._oldest_day()
+        with open(self.history_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    day = date.fromisoformat(row['date'])
+                except (ValueError, KeyError):
+                    continue
+                if day < oldest:
+                    continue
+                bloom = self._filters.setdefault(day, BloomFilter(self.capacity_per_day))
+                for key in self._keys(row.get('url', ''), row.get('title', '')):
+                    bloom.add(key)
+                kept_lines.append(line if line.endswith('\n') else line + '\n')
+                count += 1
+        self.history_path.write_text(''.join(kept_lines), encoding='utf-8')
+        self.save()
+        return count
+
+    def stats(self) -> Dict[str, int]:
+        return {day.isoformat(): len(bloom.bits) for day, bloom in sorted(self._filters.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이미 패러디한 기사 필터 관리')
+    parser.add_argument('command', choices=['rebuild', 'stats', 'check'])
+    parser.add_argument('value', nargs='?', help='check: 확인할 URL 또는 제목')
+    parser.add_argument('--retention-days', type=int, default=7, help='보관 기간(일)')
+    parser.add_argument('--dir', default=str(DEFAULT_SEEN_DIR), help='필터 저장 폴더')
+    args = parser.parse_args()
+
+    seen = SeenFilter(args.dir, retention_days=args.retention_days)
+    if args.command == 'rebuild':
+        count = seen.rebuild()
+        print(f"필터 재구성 완료: 기록 {count}건, 날짜 {len(seen.stats())}일")
+    elif args.command == 'stats':
+        for day, size in seen.stats().items():
+            print(f"{day}: {size:,} bytes")
+    else:
+        value = args.value or ''
+        found = seen.is_seen(url=value) or seen.is_seen(title=value)
+        print("이미 사용한 기사입니다." if found else "사용 기록이 없습니다.")
+
+
+if __name__ == '__main__':
+    main()